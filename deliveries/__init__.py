@@ -1,14 +1,21 @@
 from .deliveries_problem_input import DeliveriesProblemInput
-from .map_heuristics import AirDistHeuristic
+from .map_heuristics import AirDistHeuristic, LandmarkHeuristic, LandmarkHeuristicWithTables, \
+    TimeDependentAirDistHeuristic
+from .landmarks import LandmarkTables, FARTHEST_LANDMARKS, AVOID_LANDMARKS
+from .distance_matrix import compute_distance_matrix, roads_to_csr_matrix, SCIPY_BACKEND, FLAT_BACKEND
 from .map_problem import MapState, MapProblem
+from .contraction_hierarchy_solver import ContractionHierarchySolver
+from .time_dependent_map_problem import TimeDependentMapState, TimeDependentMapProblem
 from .relaxed_deliveries_problem import RelaxedDeliveriesState, RelaxedDeliveriesProblem
 from .strict_deliveries_problem import StrictDeliveriesState, StrictDeliveriesProblem
 from .deliveries_heuristics import MaxAirDistHeuristic, MSTAirDistHeuristic, RelaxedDeliveriesHeuristic
 
 __all__ = [
     'DeliveriesProblemInput',
-    'AirDistHeuristic',
-    'MapState', 'MapProblem',
+    'AirDistHeuristic', 'LandmarkHeuristic', 'LandmarkHeuristicWithTables', 'TimeDependentAirDistHeuristic',
+    'LandmarkTables', 'FARTHEST_LANDMARKS', 'AVOID_LANDMARKS',
+    'compute_distance_matrix', 'roads_to_csr_matrix', 'SCIPY_BACKEND', 'FLAT_BACKEND',
+    'MapState', 'MapProblem', 'ContractionHierarchySolver', 'TimeDependentMapState', 'TimeDependentMapProblem',
     'RelaxedDeliveriesState', 'RelaxedDeliveriesProblem', 'StrictDeliveriesState', 'StrictDeliveriesProblem',
     'MaxAirDistHeuristic', 'MSTAirDistHeuristic', 'RelaxedDeliveriesHeuristic'
 ]
@@ -0,0 +1,64 @@
+from framework.graph_search import *
+from framework.graph_search.utils.timer import Timer
+from .map_problem import MapProblem, MapState
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # for the annotations only (the hierarchies are imported on first use)
+    from framework.ways import ContractionHierarchy
+
+
+class ContractionHierarchySolver(GraphProblemSolver):
+    """
+    Solves `MapProblem`s by querying a precomputed `ContractionHierarchy` of their map
+     (see `framework/ways/contraction_hierarchy.py`), rather than by searching the map.
+    The hierarchy must be of the same map and cost model as the problems. It can be used
+     as the `inner_problem_solver` of `StrictDeliveriesProblem`:
+    >>> hierarchy = ContractionHierarchy.load(Consts.get_data_file_path("tlv.ch.npz"), roads)
+    >>> problem = StrictDeliveriesProblem(problem_input, roads, ContractionHierarchySolver(hierarchy))
+    The cost found is the same as of `UniformCost` (the path itself might differ when there are
+     several shortest paths). `nr_expanded_states` is the number of junctions settled by the query.
+    """
+
+    solver_name = 'ContractionHierarchy'
+
+    def __init__(self, hierarchy: 'ContractionHierarchy'):
+        self.hierarchy = hierarchy
+
+    def solve_problem(self, problem: GraphProblem) -> SearchResult:
+        assert isinstance(problem, MapProblem)
+        hierarchy = self.hierarchy
+        arrays = problem.roads.arrays
+        if problem.cost_model != hierarchy.cost_model:
+            raise ValueError('The contraction hierarchy was built for the `{}` cost model, not for `{}`.'.format(
+                hierarchy.cost_model, problem.cost_model))
+        if not hierarchy.was_built_for(arrays):
+            raise ValueError('The contraction hierarchy was built for another map.')
+
+        with Timer(print_title=False) as timer:
+            final_search_node = None
+            nr_expanded_states = 0
+            if arrays.has_junction(problem.target_junction_id):
+                source_position = arrays.position_of(problem.initial_state.junction_id)
+                target_position = arrays.position_of(problem.target_junction_id)
+                if not problem.reverse_links:
+                    path = hierarchy.query(source_position, target_position)
+                else:
+                    # The path of a reversed problem is a path of the map from its target to its source.
+                    path = hierarchy.query(target_position, source_position)
+                    if path is not None:
+                        path = path._replace(positions=path.positions[::-1], link_costs=path.link_costs[::-1])
+                if path is not None:
+                    nr_expanded_states = path.nr_settled
+                    junction_ids = arrays.indices[path.positions].tolist()
+                    final_search_node = SearchNode(MapState(junction_ids[0]))
+                    for junction_id, link_cost in zip(junction_ids[1:], path.link_costs):
+                        final_search_node = SearchNode(MapState(junction_id), final_search_node, link_cost)
+
+        return SearchResult(
+            solver=self,
+            problem=problem,
+            final_search_node=final_search_node,
+            nr_expanded_states=nr_expanded_states,
+            solving_time=timer.elapsed
+        )
@@ -5,13 +5,37 @@ from .deliveries_problem_input import DeliveriesProblemInput
 from framework.ways import *
 
 import numpy as np
-from scipy.sparse.csgraph import minimum_spanning_tree as mst
-from typing import Set, Dict, FrozenSet
+from typing import Set, Dict, Iterable, List
+
+
+class _AirDistancesTable:
+    """
+    The air distances between every pair of the possible locations of a deliveries problem
+    (its start point and its stop points). Computed once, in a single vectorized call.
+    """
+
+    def __init__(self, problem: RelaxedDeliveriesProblem):
+        junctions = list(problem.possible_stop_points | {problem.start_point})
+        self.junction_to_row: Dict[Junction, int] = {junction: row for row, junction in enumerate(junctions)}
+        lats = np.array([junction.lat for junction in junctions])
+        lons = np.array([junction.lon for junction in junctions])
+        self.distances = compute_distances(lats[:, np.newaxis], lons[:, np.newaxis],
+                                           lats[np.newaxis, :], lons[np.newaxis, :])
+        # Plain lists are faster than numpy for the few scalar lookups done per estimation.
+        self.distances_rows: List[List[float]] = self.distances.tolist()
+
+    def rows_of(self, junctions: Iterable[Junction]) -> List[int]:
+        return [self.junction_to_row[junction] for junction in junctions]
 
 
 class MaxAirDistHeuristic(HeuristicFunction):
     heuristic_name = 'MaxAirDist'
 
+    def __init__(self, problem: GraphProblem):
+        super(MaxAirDistHeuristic, self).__init__(problem)
+        assert isinstance(self.problem, RelaxedDeliveriesProblem)
+        self._air_distances = _AirDistancesTable(self.problem)
+
     def estimate(self, state: GraphProblemState) -> float:
         """
         Calculates the maximum among air distances between the location
@@ -21,12 +45,12 @@ class MaxAirDistHeuristic(HeuristicFunction):
         assert isinstance(self.problem, RelaxedDeliveriesProblem)
         assert isinstance(state, RelaxedDeliveriesState)
 
-        max_dist = 0
-        for target_junction in self.problem.drop_points - frozenset(state.dropped_so_far):
-            dist = state.current_location.calc_air_distance_from(target_junction)
-            if max_dist < dist:
-                max_dist = dist
-        return max_dist
+        waiting_drop_points = self.problem.drop_points - frozenset(state.dropped_so_far)
+        if not waiting_drop_points:
+            return 0
+        distances_from_current = self._air_distances.distances_rows[
+            self._air_distances.junction_to_row[state.current_location]]
+        return max(distances_from_current[row] for row in self._air_distances.rows_of(waiting_drop_points))
 
 
 class MSTAirDistHeuristic(HeuristicFunction):
@@ -35,7 +59,10 @@ class MSTAirDistHeuristic(HeuristicFunction):
     def __init__(self, problem: GraphProblem):
         super(MSTAirDistHeuristic, self).__init__(problem)
         assert isinstance(self.problem, RelaxedDeliveriesProblem)
-        self._junctions_distances_cache: Dict[FrozenSet[Junction], float] = dict()
+        self._air_distances = _AirDistancesTable(self.problem)
+        # scipy is slow to import, so it is imported only once this heuristic is used.
+        from scipy.sparse.csgraph import minimum_spanning_tree
+        self._mst = minimum_spanning_tree
 
     def estimate(self, state: GraphProblemState) -> float:
         assert isinstance(self.problem, RelaxedDeliveriesProblem)
@@ -45,26 +72,10 @@ class MSTAirDistHeuristic(HeuristicFunction):
         remained_drop_points.add(state.current_location)
         return self._calculate_junctions_air_dist_mst_weight(remained_drop_points)
 
-    def _get_distance_between_junctions(self, junction1: Junction, junction2: Junction):
-        junctions_pair = frozenset({junction1, junction2})
-        if junctions_pair in self._junctions_distances_cache:
-            return self._junctions_distances_cache[junctions_pair]
-        dist = junction1.calc_air_distance_from(junction2)
-        self._junctions_distances_cache[junctions_pair] = dist
-        return dist
-
     def _calculate_junctions_air_dist_mst_weight(self, junctions: Set[Junction]) -> float:
-        nr_junctions = len(junctions)
-        idx_to_junction = {idx: junction for idx, junction in enumerate(junctions)}
-        distances_matrix = np.zeros((nr_junctions, nr_junctions), dtype=np.float)
-        for j1_idx in range(nr_junctions):
-            for j2_idx in range(nr_junctions):
-                if j1_idx == j2_idx:
-                    continue
-                dist = self._get_distance_between_junctions(idx_to_junction[j1_idx], idx_to_junction[j2_idx])
-                distances_matrix[j1_idx, j2_idx] = dist
-                distances_matrix[j2_idx, j1_idx] = dist
-        return mst(distances_matrix).sum()
+        rows = self._air_distances.rows_of(junctions)
+        distances_matrix = self._air_distances.distances[np.ix_(rows, rows)]
+        return self._mst(distances_matrix).sum()
 
 
 class RelaxedDeliveriesHeuristic(HeuristicFunction):
@@ -0,0 +1,146 @@
+"""
+ Many-to-many shortest distances between junctions of a map (e.g. between the stop points of a
+ deliveries problem), by one one-to-many Dijkstra sweep per source rather than one point-to-point
+ search per pair.
+ The map is exported once to a CSR graph, and the sweeps are computed either by
+ `scipy.sparse.csgraph.dijkstra` ('scipy') or by `flat_dijkstra` ('flat'), optionally split
+ across a pool of worker processes.
+ Usage:
+ >>> distances = compute_distance_matrix(roads, source_ids, target_ids, processes=4)
+ >>> distances[i, j]  # the distance from source_ids[i] to target_ids[j] (inf if unreachable)
+"""
+
+from framework.graph_search import *
+from framework.ways import Roads, AIR_DISTANCE_COST
+
+import importlib.util
+import os
+import numpy as np
+from math import inf
+from typing import List, Optional, Sequence
+
+__all__ = ['compute_distance_matrix', 'roads_to_csr_matrix', 'SCIPY_BACKEND', 'FLAT_BACKEND']
+
+"""The backends of `compute_distance_matrix()`."""
+SCIPY_BACKEND = 'scipy'
+FLAT_BACKEND = 'flat'
+DISTANCE_MATRIX_BACKENDS = (SCIPY_BACKEND, FLAT_BACKEND)
+
+
+def _csr_arrays(roads: Roads, cost_model: str):
+    """
+    This function is for local use only.
+    The (offsets, target positions, costs) of the links of the map, indexed by the positions of
+     `roads.arrays`, without the dangling links. Of parallel links, only the cheapest one is kept.
+    """
+    arrays = roads.arrays
+    target_positions = arrays.target_positions
+    costs = roads.link_costs(cost_model)
+    source_positions = arrays.source_positions
+    kept = target_positions >= 0
+    source_positions, target_positions, costs = source_positions[kept], target_positions[kept], costs[kept]
+    order = np.lexsort((costs, target_positions, source_positions))
+    source_positions, target_positions, costs = source_positions[order], target_positions[order], costs[order]
+    first_of_pair = np.ones(len(order), dtype=bool)
+    first_of_pair[1:] = (source_positions[1:] != source_positions[:-1]) | (target_positions[1:] != target_positions[:-1])
+    source_positions, target_positions, costs = \
+        source_positions[first_of_pair], target_positions[first_of_pair], costs[first_of_pair]
+    offsets = np.zeros(arrays.nr_junctions + 1, dtype=np.int64)
+    np.cumsum(np.bincount(source_positions, minlength=arrays.nr_junctions), out=offsets[1:])
+    return offsets, target_positions.astype(np.int64), costs.astype(np.float64)
+
+
+def roads_to_csr_matrix(roads: Roads, cost_model: str = AIR_DISTANCE_COST):
+    """
+    The map as a `scipy.sparse.csr_matrix` of shape (nr_junctions, nr_junctions), indexed by the
+     positions of `roads.arrays`: entry [u, v] is the cost of the (cheapest) link from u to v.
+    Links of zero cost are kept as explicit zeros, which `scipy.sparse.csgraph` treats as links.
+    """
+    # scipy is slow to import, so it is imported only once a matrix is made.
+    from scipy.sparse import csr_matrix
+    offsets, target_positions, costs = _csr_arrays(roads, cost_model)
+    nr_junctions = roads.arrays.nr_junctions
+    return csr_matrix((costs, target_positions, offsets), shape=(nr_junctions, nr_junctions))
+
+
+"""The graph of the worker processes (set by `_init_worker()`)."""
+_worker_graph = None
+
+
+def _init_worker(backend: str, graph):
+    """This function is for local use only (runs in the worker processes)."""
+    global _worker_graph
+    if backend == FLAT_BACKEND:
+        offsets, target_positions, costs = graph
+        graph = FlatAdjacency(memoryview(offsets), memoryview(target_positions), memoryview(costs))
+    _worker_graph = (backend, graph)
+
+
+def _sweep(source_positions: Sequence[int], target_positions: np.ndarray, max_cost: float) -> np.ndarray:
+    """
+    This function is for local use only (runs in the worker processes, or in this process).
+    The distances from each of the sources to the targets, by one Dijkstra sweep per source.
+    """
+    backend, graph = _worker_graph
+    if backend == SCIPY_BACKEND:
+        from scipy.sparse.csgraph import dijkstra
+        distances = dijkstra(graph, directed=True, indices=list(source_positions), limit=max_cost)
+        return distances[:, target_positions]
+    nr_junctions = len(graph.offsets) - 1
+    rows = [np.asarray(flat_dijkstra(graph, nr_junctions, [source_position], max_cost))[target_positions]
+            for source_position in source_positions]
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(target_positions))
+
+
+def _default_backend() -> str:
+    """scipy if it is installed (it is found without importing it), otherwise the flat backend."""
+    return SCIPY_BACKEND if importlib.util.find_spec('scipy') is not None else FLAT_BACKEND
+
+
+def compute_distance_matrix(roads: Roads, source_ids: Sequence[int], target_ids: Optional[Sequence[int]] = None,
+                            cost_model: str = AIR_DISTANCE_COST, max_cost: float = inf,
+                            backend: Optional[str] = None, processes: int = 1) -> np.ndarray:
+    """
+    Returns the matrix of the shortest distances from each of `source_ids` (rows) to each of
+     `target_ids` (columns; the sources by default), under the given cost model. `inf` marks
+     an unreachable pair, or a pair farther than `max_cost`.
+    The costs are the same as of an optimal `MapProblem` solver (e.g. `UniformCost`), up to
+     floating point rounding.
+    :param backend: 'scipy' (the default, if scipy is installed) or 'flat'.
+    :param processes: The number of worker processes the sweeps are split across
+                      (`None` for one per CPU). With 1, all the sweeps run in this process.
+    """
+    if backend is None:
+        backend = _default_backend()
+    if backend not in DISTANCE_MATRIX_BACKENDS:
+        raise ValueError('Unknown distance matrix backend `{}`. Use one of: {}.'.format(
+            backend, ', '.join(DISTANCE_MATRIX_BACKENDS)))
+    if target_ids is None:
+        target_ids = source_ids
+    arrays = roads.arrays
+    source_positions = [int(position) for position in arrays.positions_of(source_ids)]
+    target_positions = np.asarray(arrays.positions_of(target_ids), dtype=np.int64)
+    if not source_positions or not len(target_positions):
+        return np.full((len(source_positions), len(target_positions)), inf)
+
+    graph = roads_to_csr_matrix(roads, cost_model) if backend == SCIPY_BACKEND else _csr_arrays(roads, cost_model)
+    processes = min(processes or os.cpu_count() or 1, len(source_positions))
+    if processes == 1:
+        global _worker_graph
+        previous_worker_graph = _worker_graph
+        try:
+            _init_worker(backend, graph)
+            return _sweep(source_positions, target_positions, max_cost)
+        finally:
+            _worker_graph = previous_worker_graph
+
+    from multiprocessing import Pool
+    nr_chunks = processes * 4
+    chunks: List[List[int]] = [source_positions[i::nr_chunks] for i in range(nr_chunks)]
+    chunks = [chunk for chunk in chunks if chunk]
+    with Pool(processes, initializer=_init_worker, initargs=(backend, graph)) as pool:
+        rows = pool.starmap(_sweep, [(chunk, target_positions, max_cost) for chunk in chunks])
+    distances = np.empty((len(source_positions), len(target_positions)))
+    for i, chunk_rows in enumerate(rows):
+        distances[i::nr_chunks] = chunk_rows
+    return distances
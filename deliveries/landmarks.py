@@ -0,0 +1,211 @@
+"""
+ Landmark distance tables, for the ALT lower bounds (A*, Landmarks and the Triangle inequality)
+ used by `LandmarkHeuristic`.
+ Usage:
+ >>> tables = LandmarkTables.build(roads, nr_landmarks=16, strategy=AVOID_LANDMARKS)
+ >>> tables.save(Consts.get_data_file_path("tlv.landmarks.npz"))
+ >>> tables = LandmarkTables.load(Consts.get_data_file_path("tlv.landmarks.npz"), roads)
+ >>> AStar(LandmarkHeuristic.with_tables(tables))
+"""
+
+from framework.graph_search import *
+from framework.ways import Roads, AIR_DISTANCE_COST
+from .map_problem import MapProblem
+
+import numpy as np
+import weakref
+from math import inf
+from typing import Dict, List
+
+__all__ = ['LandmarkTables', 'FARTHEST_LANDMARKS', 'AVOID_LANDMARKS']
+
+"""The landmarks selection strategies (see `LandmarkTables.build()`)."""
+FARTHEST_LANDMARKS = 'farthest'
+AVOID_LANDMARKS = 'avoid'
+LANDMARKS_STRATEGIES = (FARTHEST_LANDMARKS, AVOID_LANDMARKS)
+
+LANDMARKS_FORMAT_VERSION = 1
+
+"""The number of random roots tried by the 'avoid' strategy for each landmark, before giving up."""
+AVOID_ATTEMPTS = 20
+
+"""The tables built on demand by `LandmarkTables.of()`, per map (`roads.arrays`) and cost model."""
+_default_tables: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+class LandmarkTables:
+    """
+    The shortest distances between k landmark junctions and all the junctions of a map, for one cost model:
+        from_landmarks[p, i]  - the distance from the i-th landmark to the junction in position `p`.
+        to_landmarks[p, i]    - the distance from the junction in position `p` to the i-th landmark.
+    The tables are float32 arrays of shape (nr_junctions, k), so the k distances of a junction are
+     contiguous, and NaN marks an unreachable pair.
+    By the triangle inequality, for every landmark L and junctions v, t:
+        d(v, t) >= d(L, t) - d(L, v)    and    d(v, t) >= d(v, L) - d(t, L)
+    `tolerance` is subtracted from these bounds, to make up for the float32 rounding of the distances.
+    """
+
+    def __init__(self, roads: Roads, cost_model: str, landmark_positions: np.ndarray,
+                 from_landmarks: np.ndarray, to_landmarks: np.ndarray):
+        assert from_landmarks.shape == to_landmarks.shape == (roads.arrays.nr_junctions, len(landmark_positions))
+        # Only what `save()` needs of the map: keeping `roads` itself would keep alive the map, and
+        #  its cached tables (`_default_tables` is keyed weakly by the map).
+        self.junction_indices = roads.arrays.indices
+        self.nr_links = roads.arrays.nr_links
+        self.cost_model = cost_model
+        self.landmark_positions = landmark_positions
+        self.from_landmarks = from_landmarks
+        self.to_landmarks = to_landmarks
+        max_distance = max(np.nanmax(from_landmarks, initial=0.0), np.nanmax(to_landmarks, initial=0.0))
+        self.tolerance = 2 * float(np.spacing(np.float32(max_distance)))
+
+    @property
+    def nr_landmarks(self) -> int:
+        return len(self.landmark_positions)
+
+    @staticmethod
+    def of(roads: Roads, cost_model: str = AIR_DISTANCE_COST) -> 'LandmarkTables':
+        """The tables used by default for the given map and cost model. Built (with the defaults) on first use."""
+        tables_of_map: Dict[str, LandmarkTables] = _default_tables.setdefault(roads.arrays, {})
+        if cost_model not in tables_of_map:
+            tables_of_map[cost_model] = LandmarkTables.build(roads, cost_model=cost_model)
+        return tables_of_map[cost_model]
+
+    @staticmethod
+    def build(roads: Roads, nr_landmarks: int = 16, strategy: str = AVOID_LANDMARKS,
+              cost_model: str = AIR_DISTANCE_COST, seed: int = 0) -> 'LandmarkTables':
+        """
+        Selects the landmarks and runs a Dijkstra from each of them, and another one to each of
+         them (over the reversed links). The selection strategies are:
+        'farthest' - each landmark is the junction that is farthest from the landmarks selected so far
+                     (by the round trip distance), starting from the farthest junction from a random one.
+        'avoid'    - each landmark is a leaf of the shortest paths tree of a random junction, in a
+                     subtree whose distances are poorly bounded by the landmarks selected so far
+                     (the "avoid" heuristic of Goldberg & Werneck). Usually gives better bounds.
+        Fewer landmarks might be selected if the map is very small.
+        """
+        if strategy not in LANDMARKS_STRATEGIES:
+            raise ValueError('Unknown landmarks strategy `{}`. Use one of: {}.'.format(
+                strategy, ', '.join(LANDMARKS_STRATEGIES)))
+        arrays = roads.arrays
+        nr_junctions = arrays.nr_junctions
+        any_junction_id = int(arrays.indices[0])
+        forward_adjacency = MapProblem(roads, any_junction_id, any_junction_id, cost_model).flat_adjacency()
+        backward_adjacency = MapProblem(roads, any_junction_id, any_junction_id, cost_model,
+                                        reverse_links=True).flat_adjacency()
+        rng = np.random.RandomState(seed)
+
+        landmarks: List[int] = []
+        from_rows: List[np.ndarray] = []
+        to_rows: List[np.ndarray] = []
+        round_trip_distances = np.full(nr_junctions, inf)  # to the nearest landmark (for 'farthest')
+        while len(landmarks) < min(nr_landmarks, nr_junctions):
+            if not landmarks:
+                start_distances = np.asarray(flat_dijkstra(forward_adjacency, nr_junctions, [rng.randint(nr_junctions)]))
+                landmark = int(np.argmax(np.where(np.isfinite(start_distances), start_distances, -1)))
+            elif strategy == FARTHEST_LANDMARKS:
+                landmark = int(np.argmax(np.where(np.isfinite(round_trip_distances), round_trip_distances, -1)))
+                if round_trip_distances[landmark] <= 0:
+                    break  # every reachable junction is already a landmark
+            else:
+                landmark = None
+                for _ in range(AVOID_ATTEMPTS):  # a random root might have no subtree without landmarks
+                    landmark = LandmarkTables._avoid_landmark(forward_adjacency, nr_junctions, rng, landmarks,
+                                                              np.array(from_rows), np.array(to_rows))
+                    if landmark is not None:
+                        break
+                if landmark is None:
+                    break
+            landmarks.append(landmark)
+            from_rows.append(np.asarray(flat_dijkstra(forward_adjacency, nr_junctions, [landmark])))
+            to_rows.append(np.asarray(flat_dijkstra(backward_adjacency, nr_junctions, [landmark])))
+            round_trip_distances = np.minimum(round_trip_distances, from_rows[-1] + to_rows[-1])
+
+        def to_table(rows: List[np.ndarray]) -> np.ndarray:
+            table = np.array(rows, dtype=np.float32).T.copy()
+            table[np.isinf(table)] = np.nan
+            return table
+        return LandmarkTables(roads, cost_model, np.asarray(landmarks, dtype=np.int64),
+                              to_table(from_rows), to_table(to_rows))
+
+    @staticmethod
+    def _avoid_landmark(forward_adjacency: FlatAdjacency, nr_junctions: int, rng: np.random.RandomState,
+                        landmarks: List[int], from_rows: np.ndarray, to_rows: np.ndarray):
+        """
+        Builds the shortest paths tree of a random root, and weighs each junction by how much the
+         current landmarks underestimate its distance from the root. The subtrees that contain a
+         landmark get no weight. The next landmark is the leaf reached by walking down from the root,
+         each time to the child with the heaviest subtree. None if all the weights are zero.
+        """
+        root = rng.randint(nr_junctions)
+        distances, parents = flat_shortest_path_tree(forward_adjacency, nr_junctions, [root])
+        distances = np.asarray(distances)
+        with np.errstate(invalid='ignore'):  # inf - inf, for the unreachable pairs
+            lower_bounds = np.fmax(np.fmax.reduce(from_rows - from_rows[:, [root]], axis=0),
+                                   np.fmax.reduce(to_rows[:, [root]] - to_rows, axis=0))
+        lower_bounds = np.nan_to_num(lower_bounds, nan=0.0, posinf=0.0, neginf=0.0)
+        reached = np.isfinite(distances)
+        weights = np.where(reached, distances - np.maximum(lower_bounds, 0.0), 0.0)
+
+        # Accumulate the subtree weights from the leaves up (a parent is always closer to the root).
+        sizes = weights.tolist()
+        has_landmark = [False] * nr_junctions
+        for landmark in landmarks:
+            has_landmark[landmark] = True
+        reached_positions = np.flatnonzero(reached)
+        for position in reached_positions[np.argsort(-distances[reached_positions], kind='stable')].tolist():
+            parent = parents[position]
+            if parent >= 0:
+                sizes[parent] += sizes[position]
+                has_landmark[parent] = has_landmark[parent] or has_landmark[position]
+        sizes = [0.0 if landmark_in_subtree else size for size, landmark_in_subtree in zip(sizes, has_landmark)]
+
+        children: List[List[int]] = [[] for _ in range(nr_junctions)]
+        for position in reached_positions.tolist():
+            if parents[position] >= 0:
+                children[parents[position]].append(position)
+        position = root
+        while children[position]:
+            heaviest_child = max(children[position], key=sizes.__getitem__)
+            if sizes[heaviest_child] <= 0:
+                break
+            position = heaviest_child
+        if sizes[position] <= 0:
+            return None
+        return position
+
+    def save(self, filename: str):
+        """
+        Stores the tables in a `.npz` file (together with the junction indices, to validate them on loading).
+        The file is written to `filename` as is (`np.savez()` would add a `.npz` suffix to a name without one).
+        """
+        with open(filename, 'wb') as file:
+            np.savez(file, version=LANDMARKS_FORMAT_VERSION, cost_model=self.cost_model,
+                     indices=self.junction_indices, nr_links=self.nr_links, landmark_positions=self.landmark_positions,
+                     from_landmarks=self.from_landmarks, to_landmarks=self.to_landmarks)
+
+    @staticmethod
+    def load(filename: str, roads: Roads) -> 'LandmarkTables':
+        """Loads tables saved by `save()`. Raises `ValueError` if they were built for another map."""
+        arrays = roads.arrays
+        with np.load(filename) as stored:
+            if int(stored['version']) != LANDMARKS_FORMAT_VERSION:
+                raise ValueError('Unsupported landmark tables version {} in `{}`.'.format(
+                    int(stored['version']), filename))
+            if int(stored['nr_links']) != arrays.nr_links or not np.array_equal(stored['indices'], arrays.indices):
+                raise ValueError('The landmark tables in `{}` were built for another map.'.format(filename))
+            return LandmarkTables(roads, str(stored['cost_model']), stored['landmark_positions'],
+                                  stored['from_landmarks'], stored['to_landmarks'])
+
+    def were_built_for(self, roads: Roads) -> bool:
+        """Whether the tables were built for the given map (the same junctions, in the same positions)."""
+        arrays = roads.arrays
+        return self.nr_links == arrays.nr_links and \
+            (self.junction_indices is arrays.indices or np.array_equal(self.junction_indices, arrays.indices))
+
+    def lower_bound(self, source_position: int, target_position: int) -> float:
+        """A lower bound of the distance between the junctions in the given positions (0 if none is known)."""
+        bounds = np.fmax(self.from_landmarks[target_position].astype(np.float64) - self.from_landmarks[source_position],
+                         self.to_landmarks[source_position].astype(np.float64) - self.to_landmarks[target_position])
+        bound = float(np.fmax.reduce(bounds)) - self.tolerance
+        return bound if bound > 0 else 0.0
@@ -1,10 +1,19 @@
 from framework.graph_search import *
+from framework.ways import compute_distance, AIR_DISTANCE_COST
 from .map_problem import MapProblem, MapState
+from .landmarks import LandmarkTables
+from .time_dependent_map_problem import TimeDependentMapProblem, TimeDependentMapState
+
+import numpy as np
 
 
 class AirDistHeuristic(HeuristicFunction):
     heuristic_name = 'AirDist'
 
+    def __init__(self, problem: GraphProblem):
+        super(AirDistHeuristic, self).__init__(problem)
+        self._target_coordinates = None
+
     def estimate(self, state: GraphProblemState) -> float:
         """
         The air distance between the geographic location represented
@@ -25,3 +34,101 @@ class AirDistHeuristic(HeuristicFunction):
         target_junction = self.problem.roads[self.problem.target_junction_id]
 
         return junction.calc_air_distance_from(target_junction)
+
+    def estimate_position(self, position: int) -> float:
+        """Same as `estimate()`, for the junction in the given position of `roads.arrays` (used by `FlatAStar`)."""
+        if self._target_coordinates is None:
+            arrays = self.problem.roads.arrays
+            self._lats, self._lons = memoryview(arrays.lats), memoryview(arrays.lons)
+            target_position = arrays.position_of(self.problem.target_junction_id)
+            self._target_coordinates = (self._lats[target_position], self._lons[target_position])
+        return compute_distance((self._lats[position], self._lons[position]), self._target_coordinates)
+
+
+class LandmarkHeuristic(HeuristicFunction):
+    """
+    The ALT lower bound of the distance to the target: the highest of the triangle inequality
+     bounds of the landmarks (see `LandmarkTables`). With the air distance costs, it is combined
+     with `AirDistHeuristic` by taking the maximum (the air distance is not a lower bound of the
+     other cost models). Consistent, like both of them.
+    The tables are given by the `tables` argument, or by the heuristic type made by `with_tables()`
+     (e.g. `AStar(LandmarkHeuristic.with_tables(tables))`). Otherwise, they are built on first use
+     for the problem's map and cost model (see `LandmarkTables.of()`). Given tables must have been
+     built for the problem's map and cost model.
+    """
+
+    heuristic_name = 'Landmarks'
+
+    def __init__(self, problem: GraphProblem, tables: LandmarkTables = None):
+        super(LandmarkHeuristic, self).__init__(problem)
+        assert isinstance(self.problem, MapProblem)
+        if tables is None:
+            tables = LandmarkTables.of(self.problem.roads, self.problem.cost_model)
+        assert tables.cost_model == self.problem.cost_model
+        assert tables.were_built_for(self.problem.roads), 'The landmark tables were built for another map.'
+        self.tables = tables
+        from_landmarks, to_landmarks = tables.from_landmarks, tables.to_landmarks
+        if self.problem.reverse_links:
+            # The distance to the target in the reversed map is the distance from the target in the map.
+            from_landmarks, to_landmarks = to_landmarks, from_landmarks
+        self._from_landmarks, self._to_landmarks = from_landmarks, to_landmarks
+        self._target_position = self.problem.roads.arrays.position_of(self.problem.target_junction_id)
+        self._from_landmarks_to_target = from_landmarks[self._target_position].astype(np.float64)
+        self._to_landmarks_from_target = to_landmarks[self._target_position].astype(np.float64)
+        self._air_dist_heuristic = AirDistHeuristic(problem) if self.problem.cost_model == AIR_DISTANCE_COST else None
+
+    @classmethod
+    def with_tables(cls, tables: LandmarkTables) -> 'LandmarkHeuristicWithTables':
+        """A `LandmarkHeuristic` type (to be given to the solvers) that uses the given tables."""
+        return LandmarkHeuristicWithTables(tables, cls)
+
+    def estimate(self, state: GraphProblemState) -> float:
+        assert isinstance(state, MapState)
+        return self.estimate_position(self.problem.roads.arrays.position_of(state.junction_id))
+
+    def estimate_position(self, position: int) -> float:
+        """Same as `estimate()`, for the junction in the given position of `roads.arrays` (used by `FlatAStar`)."""
+        bounds = np.fmax(self._from_landmarks_to_target - self._from_landmarks[position],
+                         self._to_landmarks[position] - self._to_landmarks_from_target)
+        bound = float(np.fmax.reduce(bounds)) - self.tables.tolerance
+        if not bound > 0:  # also when there is no bound (NaN)
+            bound = 0.0
+        if self._air_dist_heuristic is not None:
+            return max(bound, self._air_dist_heuristic.estimate_position(position))
+        return bound
+
+
+class LandmarkHeuristicWithTables:
+    """
+    A heuristic function type (see `HeuristicFunctionType`) that creates the `LandmarkHeuristic`s
+     of the given tables (see `LandmarkHeuristic.with_tables()`). Unlike a class created on the fly,
+     it can be pickled (e.g. for the worker processes of `solve_matrix()`).
+    """
+
+    def __init__(self, tables: LandmarkTables, heuristic_function_type: type = LandmarkHeuristic):
+        self.tables = tables
+        self.heuristic_function_type = heuristic_function_type
+        self.heuristic_name = heuristic_function_type.heuristic_name
+
+    def __call__(self, problem: GraphProblem) -> LandmarkHeuristic:
+        return self.heuristic_function_type(problem, self.tables)
+
+
+class TimeDependentAirDistHeuristic(HeuristicFunction):
+    """
+    The air distance to the target, travelled at the maximal free-flow speed, in minutes.
+    The travel time of a link is never below its free-flow time, so this is admissible as long as
+    no link is shorter than its air distance (always true for the default air-distance cost model).
+    """
+
+    heuristic_name = 'TimeDependentAirDist'
+
+    def estimate(self, state: GraphProblemState) -> float:
+        assert isinstance(state, TimeDependentMapState)
+        assert isinstance(self.problem, TimeDependentMapProblem)
+
+        junction = self.problem.roads[state.junction_id]
+        target_junction = self.problem.roads[self.problem.target_junction_id]
+
+        meters_per_minute = self.problem.max_speed * 1000 / 60
+        return junction.calc_air_distance_from(target_junction) / meters_per_minute
@@ -1,7 +1,8 @@
 from framework.graph_search import *
 from framework.ways import *
 
-from typing import Iterator, Tuple
+from math import inf
+from typing import Collection, Iterator, Tuple
 
 
 class MapState(GraphProblemState):
@@ -24,20 +25,65 @@ class MapState(GraphProblemState):
         return str(self.junction_id).rjust(5, ' ')
 
 
-class MapProblem(GraphProblem):
+class MapProblem(GraphProblem, FlatGraphProblem):
     """
     Represents a problem on the geographic map.
     The problem is defined by a source location on the map and a destination.
+    The cost of an operator (moving along a link) is given by the cost model:
+     'air_distance' (the default), 'distance' (`link.distance`) or 'highway_weighted'.
+    The per-link costs are computed once per map and cost model (see `Roads.link_costs()`).
+    It also implements `FlatGraphProblem` (the states are the positions of the junctions in
+     `roads.arrays`), so it can be solved by `FlatUniformCost` / `FlatAStar`, and by the
+     bidirectional solvers (see `reversed()`).
+    If `reverse_links` is set, the operators move along the links backwards (from their
+     target junction to their source junction), using `Roads.reverse_links`. The reversed
+     targets and costs are cached on the map too, so creating a reversed problem is O(1).
+    It can be pickled (e.g. to be solved by the worker processes of `solve_matrix()`): its views
+     of the map's arrays are not pickled, but recreated from `roads` when it is unpickled.
     """
 
     name = 'Map'
 
-    def __init__(self, roads: Roads, source_junction_id: int, target_junction_id: int):
+    def __init__(self, roads: Roads, source_junction_id: int, target_junction_id: int,
+                 cost_model: str = AIR_DISTANCE_COST, reverse_links: bool = False):
         initial_state = MapState(source_junction_id)
         super(MapProblem, self).__init__(initial_state)
         self.roads = roads
         self.target_junction_id = target_junction_id
-        self.name += '(src: {} dst: {})'.format(source_junction_id, target_junction_id)
+        self.cost_model = cost_model
+        self.reverse_links = reverse_links
+        self.name += '(src: {} dst: {}{})'.format(source_junction_id, target_junction_id,
+                                                  ' reversed' if reverse_links else '')
+        self._init_links()
+
+    def _init_links(self):
+        """Creates the views of the links of the map used by the expansions."""
+        self._roads_arrays = arrays = self.roads.arrays
+        if not self.reverse_links:
+            links_offsets, links_targets, self._links_target_positions = \
+                arrays.offsets, arrays.targets, arrays.target_positions
+            links_costs = arrays.link_costs(self.cost_model)
+        else:
+            links_offsets, _, self._links_target_positions = arrays.reverse_links
+            links_targets = arrays.reverse_link_sources
+            links_costs = arrays.reverse_link_costs(self.cost_model)
+
+        self._links_offsets = memoryview(links_offsets)
+        self._links_targets = memoryview(links_targets)
+        self._links_costs = memoryview(links_costs)
+        self._junctions_indices = memoryview(arrays.indices)
+
+    def __getstate__(self):
+        return {name: value for name, value in self.__dict__.items() if not isinstance(value, memoryview)}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_links()
+
+    def reversed(self) -> 'MapProblem':
+        """The problem of getting from the target back to the source, moving along the links backwards."""
+        return MapProblem(self.roads, self.target_junction_id, self.initial_state.junction_id,
+                          self.cost_model, reverse_links=not self.reverse_links)
 
     def expand_state_with_costs(self, state_to_expand: GraphProblemState) -> Iterator[Tuple[GraphProblemState, float]]:
         """
@@ -49,22 +95,19 @@ class MapProblem(GraphProblem):
         # All of the states in this problem are instances of the class `MapState`.
         assert isinstance(state_to_expand, MapState)
 
-        # Get the junction (in the map) that is represented by the state to expand.
-        junction = self.roads[state_to_expand.junction_id]
+        # Find the position (in the map's arrays) of the junction that is represented by the state to expand.
+        position = self._roads_arrays.position_of(state_to_expand.junction_id)
 
         # Iterate over the outgoing roads of the current junction.
-        for link in junction.links:
-            # Create the successor state (it should be an instance of class `MapState`).
-            successor_state = MapState(link.target)
-
-            # TODO: calculate the distance between `junction` and the successor's junction.
-            # Use the method `calc_air_distance_from()` of class `Junction` to measure this distance.
-            # Do NOT use `link.distance` here.
-            successor_junction = self.roads[successor_state.junction_id]
-            operator_cost = junction.calc_air_distance_from(successor_junction)  # TODO: modify this!
+        # The operator cost is the precomputed cost of the link (by default, the air
+        # distance between the junction and the successor's junction).
+        for link_position in range(self._links_offsets[position], self._links_offsets[position + 1]):
+            operator_cost = self._links_costs[link_position]
+            if operator_cost == inf:  # the link's target is not in the map
+                continue
 
             # Yield the successor state and the cost of the operator we used to get this successor.
-            yield successor_state, operator_cost
+            yield MapState(self._links_targets[link_position]), operator_cost
 
     def is_goal(self, state: GraphProblemState) -> bool:
         """
@@ -75,3 +118,23 @@ class MapProblem(GraphProblem):
         # TODO: modify the returned value to indicate whether `state` is a final state.
         # You may use the problem's input parameters (stored as fields of this object by the constructor).
         return state.junction_id == self.target_junction_id
+
+    def flat_adjacency(self) -> FlatAdjacency:
+        return FlatAdjacency(self._links_offsets, memoryview(self._links_target_positions), self._links_costs)
+
+    def flat_nr_states(self) -> int:
+        return self._roads_arrays.nr_junctions
+
+    def flat_initial_position(self) -> int:
+        return self._roads_arrays.position_of(self.initial_state.junction_id)
+
+    def flat_goal_positions(self) -> Collection[int]:
+        if not self._roads_arrays.has_junction(self.target_junction_id):
+            return ()
+        return (self._roads_arrays.position_of(self.target_junction_id),)
+
+    def state_of_position(self, position: int) -> MapState:
+        return MapState(self._junctions_indices[position])
+
+    def flat_reversed_problem(self) -> 'MapProblem':
+        return self.reversed()
@@ -3,9 +3,14 @@ from framework.ways import *
 from .map_problem import MapProblem
 from .deliveries_problem_input import DeliveriesProblemInput
 from .relaxed_deliveries_problem import RelaxedDeliveriesState, RelaxedDeliveriesProblem
+from .distance_matrix import compute_distance_matrix
 
+from math import inf
 from typing import Set, FrozenSet, Optional, Iterator, Tuple, Union
 
+"""The cached operator cost of a stop that cannot be reached from a location."""
+UNREACHABLE_NODE = -1
+
 
 class StrictDeliveriesState(RelaxedDeliveriesState):
     """
@@ -29,7 +34,14 @@ class StrictDeliveriesProblem(RelaxedDeliveriesProblem):
     name = 'StrictDeliveries'
 
     def __init__(self, problem_input: DeliveriesProblemInput, roads: Roads,
-                 inner_problem_solver: GraphProblemSolver, use_cache: bool = True):
+                 inner_problem_solver: GraphProblemSolver, use_cache: bool = True,
+                 inner_subgraph_hops: Optional[int] = None):
+        """
+        :param inner_subgraph_hops: If set, the inner map problems are solved over a region of the map
+                                    rather than over the whole map: the junctions within the bounding box
+                                    of the problem's locations, extended by this number of hops.
+                                    Routes that leave this region are not considered.
+        """
         super(StrictDeliveriesProblem, self).__init__(problem_input)
         self.initial_state = StrictDeliveriesState(
             problem_input.start_point, frozenset(), problem_input.gas_tank_init_fuel)
@@ -38,6 +50,21 @@ class StrictDeliveriesProblem(RelaxedDeliveriesProblem):
         self.use_cache = use_cache
         self._init_cache()
 
+        self.inner_roads = roads
+        if inner_subgraph_hops is not None:
+            locations = self.possible_stop_points | {self.start_point}
+            bbox = (min(junction.lat for junction in locations), min(junction.lon for junction in locations),
+                    max(junction.lat for junction in locations), max(junction.lon for junction in locations))
+            self.inner_roads = roads.subgraph(bbox=bbox, around=[junction.index for junction in locations],
+                                              hops=inner_subgraph_hops)
+
+    def _make_inner_map_problem(self, source_junction_id: int, target_junction_id: int) -> MapProblem:
+        translation = self.inner_roads.id_translation
+        if translation is None:
+            return MapProblem(self.inner_roads, source_junction_id, target_junction_id)
+        return MapProblem(self.inner_roads, translation.from_original(source_junction_id),
+                          translation.from_original(target_junction_id))
+
     def _init_cache(self):
         self._cache = {}
         self.nr_cache_hits = 0
@@ -56,6 +83,33 @@ class StrictDeliveriesProblem(RelaxedDeliveriesProblem):
             self.nr_cache_misses += 1
         return self._cache.get(key)
 
+    def preload_cache(self, backend: Optional[str] = None, processes: int = 1):
+        """
+        Fills the cache with the distances from the start point and from every stop point to every
+         stop point, by one Dijkstra sweep per location (see `compute_distance_matrix()`), instead
+         of the point-to-point searches of the inner problem solver, one per pair, on demand.
+        The distances are the optimal ones (the same as of an optimal inner problem solver).
+         Distances longer than the gas tank capacity are never used (no state has enough fuel
+         for them), so the sweeps stop there, and such stops are cached as unreachable.
+        Does nothing if the cache is not used.
+        """
+        if not self.use_cache:
+            return
+        targets = sorted(self.possible_stop_points, key=lambda junction: junction.index)
+        sources = targets + ([self.start_point] if self.start_point not in self.possible_stop_points else [])
+        translation = self.inner_roads.id_translation
+
+        def inner_ids(junctions):
+            if translation is None:
+                return [junction.index for junction in junctions]
+            return [translation.from_original(junction.index) for junction in junctions]
+        distances = compute_distance_matrix(self.inner_roads, inner_ids(sources), inner_ids(targets),
+                                            max_cost=self.gas_tank_capacity, backend=backend, processes=processes)
+        for source, row in zip(sources, distances.tolist()):
+            for stop, distance in zip(targets, row):
+                if stop != source:
+                    self._insert_to_cache((source.index, stop.index), UNREACHABLE_NODE if distance == inf else distance)
+
     def expand_state_with_costs(self, state_to_expand: GraphProblemState) -> Iterator[Tuple[GraphProblemState, float]]:
         """
         TODO: implement this method!
@@ -67,7 +121,6 @@ class StrictDeliveriesProblem(RelaxedDeliveriesProblem):
         For each successor, a pair of the successor state and the operator cost is yielded.
         """
         assert isinstance(state_to_expand, StrictDeliveriesState)
-        UNREACHABLE_NODE = -1
 
         # Iterate over all the other possible stop points.
         for stop in self.possible_stop_points - state_to_expand.dropped_so_far:
@@ -80,7 +133,7 @@ class StrictDeliveriesProblem(RelaxedDeliveriesProblem):
 
             # we haven't calculated the distance from these two stops
             if operator_cost is None:
-                new_map_prob = MapProblem(self.roads, state_to_expand.current_location.index, stop.index)
+                new_map_prob = self._make_inner_map_problem(state_to_expand.current_location.index, stop.index)
                 restult_node = self.inner_problem_solver.solve_problem(new_map_prob).final_search_node
                 # can't reach the desired stop.
                 if restult_node is None:
@@ -0,0 +1,120 @@
+from framework.graph_search import *
+from framework.ways import *
+from framework.ways.traffic import DEFAULT_HIGHWAY_TYPE_SPEEDS, MINUTES_PER_DAY
+
+from math import inf
+from typing import Iterator, Sequence, Tuple
+
+
+class TimeDependentMapState(GraphProblemState):
+    """
+    A location on the map (a junction index) together with the time we got there
+    (in minutes since midnight, may exceed a day).
+    States are identified by the junction only: the search keeps, for each junction, the
+    earliest arrival time found, as with the distances of `MapState`.
+    """
+
+    def __init__(self, junction_id: int, time: float):
+        self.junction_id = junction_id
+        self.time = time
+
+    def __eq__(self, other):
+        assert isinstance(other, TimeDependentMapState)
+        return other.junction_id == self.junction_id
+
+    def __hash__(self):
+        return hash(self.junction_id)
+
+    def __str__(self):
+        return str(self.junction_id).rjust(5, ' ')
+
+
+class TimeDependentMapProblem(GraphProblem):
+    """
+    A map problem where the cost of an operator (moving along a link) is its travel time in minutes,
+    which depends on the time we start moving along it (rush hours are slower).
+    The travel time of a link is its free-flow time (the link length under `cost_model`, divided by
+    the free-flow speed of its highway type) multiplied by the link's traffic multiplier, interpolated
+    linearly between the starts of the time buckets (see `framework/ways/traffic.py`).
+    The links are FIFO (leaving later never arrives earlier), so keeping the earliest arrival at
+    each junction, as `TimeDependentMapState` does, finds the earliest arrival at the target.
+    The table of the travel times at the bucket starts is computed once per map (vectorized), so an
+    expansion only looks up two of its entries per link.
+    Like `MapProblem`, it can be pickled: its views of the map's arrays are recreated from `roads`.
+    """
+
+    name = 'TimeDependentMap'
+
+    def __init__(self, roads: Roads, source_junction_id: int, target_junction_id: int,
+                 departure_time: float = 8 * 60, bucket_minutes: int = 60,
+                 cost_model: str = AIR_DISTANCE_COST,
+                 highway_type_speeds: Sequence[float] = DEFAULT_HIGHWAY_TYPE_SPEEDS):
+        """
+        :param departure_time: In minutes since midnight.
+        :param bucket_minutes: The resolution of the traffic tables (must divide a day).
+        :param highway_type_speeds: Free-flow speeds (km/h) per highway type.
+        """
+        initial_state = TimeDependentMapState(source_junction_id, departure_time)
+        super(TimeDependentMapProblem, self).__init__(initial_state)
+        self.roads = roads
+        self.target_junction_id = target_junction_id
+        self.departure_time = departure_time
+        self.bucket_minutes = bucket_minutes
+        self.nr_buckets = MINUTES_PER_DAY // bucket_minutes
+        self.cost_model = cost_model
+        self.highway_type_speeds = tuple(highway_type_speeds)
+        self.max_speed = max(highway_type_speeds)  # km/h
+        self.name += '(src: {} dst: {} departure: {:02d}:{:02d})'.format(
+            source_junction_id, target_junction_id, int(departure_time) // 60 % 24, int(departure_time) % 60)
+        self._init_links()
+
+    def _init_links(self):
+        """Creates the views of the links of the map used by the expansions."""
+        self._roads_arrays = self.roads.arrays
+        # The travel times are stored flat (link-major), so the entry of a link and a bucket
+        # is `link_position * nr_buckets + bucket`.
+        travel_times = self._roads_arrays.fifo_travel_times(self.bucket_minutes, self.cost_model,
+                                                            self.highway_type_speeds).ravel()
+
+        self._links_offsets = memoryview(self._roads_arrays.offsets)
+        self._links_targets = memoryview(self._roads_arrays.targets)
+        self._travel_times = memoryview(travel_times)
+
+    def __getstate__(self):
+        return {name: value for name, value in self.__dict__.items() if not isinstance(value, memoryview)}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_links()
+
+    def expand_state_with_costs(self, state_to_expand: GraphProblemState) -> Iterator[Tuple[GraphProblemState, float]]:
+        """
+        For a given state, iterates over its successor states: the targets of the outgoing
+        links of its junction, reached at the current time plus the travel time of the link.
+        """
+        assert isinstance(state_to_expand, TimeDependentMapState)
+
+        position = self._roads_arrays.position_of(state_to_expand.junction_id)
+        time = state_to_expand.time
+        nr_buckets = self.nr_buckets
+        day_bucket = int(time // self.bucket_minutes)
+        bucket_fraction = time / self.bucket_minutes - day_bucket
+        bucket = day_bucket % nr_buckets
+        next_bucket = (bucket + 1) % nr_buckets
+        for link_position in range(self._links_offsets[position], self._links_offsets[position + 1]):
+            bucket_travel_time = self._travel_times[link_position * nr_buckets + bucket]
+            if bucket_travel_time == inf:  # the link's target is not in the map
+                continue
+            next_bucket_travel_time = self._travel_times[link_position * nr_buckets + next_bucket]
+            travel_time = bucket_travel_time + (next_bucket_travel_time - bucket_travel_time) * bucket_fraction
+            yield TimeDependentMapState(self._links_targets[link_position], time + travel_time), travel_time
+
+    def is_goal(self, state: GraphProblemState) -> bool:
+        assert isinstance(state, TimeDependentMapState)
+        return state.junction_id == self.target_junction_id
+
+    def solution_additional_str(self, result: 'SearchResult') -> str:
+        if result.final_search_node is None:
+            return ''
+        arrival_time = result.final_search_node.state.time
+        return 'arrival: {:02d}:{:02d}'.format(int(arrival_time) // 60 % 24, int(arrival_time) % 60)
@@ -0,0 +1,46 @@
+"""
+Compares `ARAStar` with separate `AStar` searches over the same decreasing weights, on random
+ problems over the map: the cost, suboptimality bound and cumulative number of expanded states
+ of each improving result of ARA*, against the total of the separate searches.
+Usage (from the repository root):
+    python experiments/anytime_benchmark.py [nr_problems] [seed]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework import *
+from deliveries import *
+
+import numpy as np
+
+
+def main():
+    nr_problems = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    roads = load_map_from_csv(Consts.get_data_file_path('tlv.csv'))
+    weights = np.linspace(0.9, 0.5, 5)
+    rng = np.random.RandomState(seed)
+    junction_ids = list(roads.keys())
+
+    for _ in range(nr_problems):
+        source_id, target_id = rng.choice(junction_ids, 2, replace=False)
+        problem = MapProblem(roads, int(source_id), int(target_id))
+        print('{} -> {}'.format(source_id, target_id))
+
+        separate_results = [AStar(AirDistHeuristic, heuristic_weight=w).solve_problem(problem) for w in weights]
+        print('   separate A*:   #dev: {:<8} time: {:7.3f}'.format(
+            sum(result.nr_expanded_states for result in separate_results),
+            sum(result.solving_time for result in separate_results)))
+        for anytime_result in ARAStar(AirDistHeuristic, weights).solve_problem_anytime(problem):
+            search_result = anytime_result.search_result
+            print('   ARA* w={:.3f}   #dev: {:<8} time: {:7.3f}   cost: {}   bound: {:.3f}'.format(
+                anytime_result.heuristic_weight, search_result.nr_expanded_states, search_result.solving_time,
+                None if search_result.final_search_node is None else search_result.final_search_node.cost,
+                anytime_result.suboptimality_bound))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compares independent `GreedyStochastic` restarts (as in `main.relaxed_deliveries_problem()`) with
+ the branch and bound restarts of `AnytimeGreedyStochastic`, on a relaxed deliveries problem,
+ with the same time budget: the number of restarts per second and the best cost found by each,
+ and the incumbent of the anytime solver each time it improves.
+Usage (from the repository root):
+    python experiments/anytime_greedy_benchmark.py [deliveries_input_file] [time_budget] [seed]
+"""
+
+import os
+import sys
+from math import inf
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework import *
+from deliveries import *
+
+import numpy as np
+
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'small_delivery.in'
+    time_budget = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    roads = load_map_from_csv(Consts.get_data_file_path('tlv.csv'))
+    problem = RelaxedDeliveriesProblem(DeliveriesProblemInput.load_from_file(input_file, roads))
+
+    np.random.seed(seed)
+    start_time = perf_counter()
+    nr_restarts = 0
+    best_cost = inf
+    while perf_counter() - start_time < time_budget:
+        result = GreedyStochastic(MSTAirDistHeuristic).solve_problem(problem)
+        nr_restarts += 1
+        if result.final_search_node is not None:
+            best_cost = min(best_cost, result.final_search_node.cost)
+    total_time = perf_counter() - start_time
+    print('independent restarts:   #restarts: {:<6} restarts/sec: {:8.1f}   best cost: {}'.format(
+        nr_restarts, nr_restarts / total_time, best_cost))
+
+    np.random.seed(seed)
+    start_time = perf_counter()
+    solver = AnytimeGreedyStochastic(MSTAirDistHeuristic, max_nr_restarts=10 ** 9, time_limit=time_budget)
+    nr_restarts = 0
+    best_cost = inf
+    for nr_restarts, anytime_result in enumerate(solver.solve_problem_anytime(problem), 1):
+        search_result = anytime_result.search_result
+        if search_result.final_search_node is not None and search_result.final_search_node.cost < best_cost:
+            best_cost = search_result.final_search_node.cost
+            print('   restart {:<6} time: {:7.2f}   #dev: {:<8} cost: {}'.format(
+                nr_restarts, search_result.solving_time, search_result.nr_expanded_states, best_cost))
+    total_time = perf_counter() - start_time
+    print('anytime restarts:       #restarts: {:<6} restarts/sec: {:8.1f}   best cost: {}'.format(
+        nr_restarts, nr_restarts / total_time, best_cost))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Compares the point-to-point queries of a `ContractionHierarchy` (through `ContractionHierarchySolver`)
+ with `FlatAStar` and `AStar` (with the air distance heuristic) on random map problems.
+The hierarchy is loaded from `hierarchy_file` if it exists; otherwise it is built and saved there.
+The costs found by all the solvers are checked to be equal.
+Usage (from the repository root):
+    python experiments/contraction_hierarchy_benchmark.py [map_file] [nr_queries] [hierarchy_file]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework import *
+from deliveries import *
+
+
+def main():
+    map_file = sys.argv[1] if len(sys.argv) > 1 else Consts.get_data_file_path('tlv.csv')
+    nr_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    hierarchy_file = sys.argv[3] if len(sys.argv) > 3 else os.path.splitext(map_file)[0] + '.ch.npz'
+    roads = load_map_from_csv(map_file)
+
+    if os.path.exists(hierarchy_file):
+        start = time.time()
+        hierarchy = ContractionHierarchy.load(hierarchy_file, roads)
+        print('Loaded the hierarchy in {:.2f}sec'.format(time.time() - start))
+    else:
+        start = time.time()
+        hierarchy = ContractionHierarchy.build(roads)
+        print('Built the hierarchy in {:.2f}sec'.format(time.time() - start))
+        hierarchy.save(hierarchy_file)
+    print('    {} links, {} shortcuts, {} core junctions'.format(
+        roads.arrays.nr_links, hierarchy.nr_shortcuts, hierarchy.nr_core_junctions))
+
+    rng = np.random.RandomState(0)
+    junction_ids = list(roads.keys())
+    problems = [MapProblem(roads, junction_ids[rng.randint(len(junction_ids))],
+                           junction_ids[rng.randint(len(junction_ids))]) for _ in range(nr_queries)]
+    reference_costs = None
+    for solver in (AStar(AirDistHeuristic), FlatAStar(AirDistHeuristic), ContractionHierarchySolver(hierarchy)):
+        results = [solver.solve_problem(problem) for problem in problems]
+        costs = [None if result.final_search_node is None else round(result.final_search_node.cost, 3)
+                 for result in results]
+        reference_costs = reference_costs or costs
+        print('{:<40} {:9.2f}ms/query   #dev: {:<10} {}'.format(
+            solver.solver_name, 1000 * sum(result.solving_time for result in results) / nr_queries,
+            sum(result.nr_expanded_states for result in results),
+            'same costs' if costs == reference_costs else 'DIFFERENT COSTS: {}'.format(costs)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Compares solving the strict deliveries problem with the inner map problems solved on demand
+ (one point-to-point search per pair of locations) and with the cache preloaded from a
+ distance matrix (one Dijkstra sweep per location), with each of the matrix backends.
+Usage (from the repository root):
+    python experiments/distance_matrix_benchmark.py [map_file] [deliveries_input_file] [processes]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework import *
+from deliveries import *
+
+
+def main():
+    map_file = sys.argv[1] if len(sys.argv) > 1 else Consts.get_data_file_path('tlv.csv')
+    input_file = sys.argv[2] if len(sys.argv) > 2 else 'small_delivery.in'
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    roads = load_map_from_csv(map_file)
+    problem_input = DeliveriesProblemInput.load_from_file(input_file, roads)
+
+    for backend in (None, SCIPY_BACKEND, FLAT_BACKEND):
+        problem = StrictDeliveriesProblem(problem_input, roads, inner_problem_solver=FlatAStar(AirDistHeuristic))
+        start = time.time()
+        if backend is not None:
+            problem.preload_cache(backend=backend, processes=processes)
+        preload_time = time.time() - start
+        result = AStar(MSTAirDistHeuristic).solve_problem(problem)
+        print('{:<10} preload: {:6.2f}sec   total: {:6.2f}sec   inner searches: {:<6} cost: {}'.format(
+            backend or 'on demand', preload_time, time.time() - start, problem.nr_cache_misses,
+            None if result.final_search_node is None else result.final_search_node.cost))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Microbenchmarks of the priority queues used for the `open` queue of the best-first search:
+ the original `heapdict` against the `IndexedHeap` (binary and 4-ary).
+The workload mimics A*: every pop is followed by several pushes, some of which
+ re-prioritize (decrease-key) or remove an item that is already in the queue.
+Usage (from the repository root):
+    python experiments/heap_benchmark.py [nr_operations]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework.graph_search.utils.heapdict import heapdict
+from framework.graph_search.utils.indexed_heap import IndexedHeap
+
+
+class Item:
+    """Hashed by identity, like `SearchNode`."""
+    __slots__ = ()
+
+
+class HeapdictQueue:
+    def __init__(self):
+        self.queue = heapdict()
+
+    def push(self, item, priority):
+        self.queue[item] = priority
+
+    def set_priority(self, item, priority):
+        self.queue[item] = priority
+
+    def pop(self):
+        return self.queue.popitem()
+
+    def remove(self, item):
+        return self.queue.pop(item)
+
+    def __len__(self):
+        return len(self.queue)
+
+
+def make_workload(nr_operations: int, seed: int = 0):
+    """A list of (operation, item index, priority), with priorities growing like f-scores do."""
+    rng = np.random.RandomState(seed)
+    operations = []
+    alive = []
+    nr_items = 0
+    base_priority = 0.0
+    for _ in range(nr_operations // 5):
+        for _ in range(3):
+            operations.append(('push', nr_items, base_priority + rng.uniform(0, 100)))
+            alive.append(nr_items)
+            nr_items += 1
+        if len(alive) > 10:
+            victim = alive[rng.randint(len(alive))]
+            operations.append(('decrease', victim, base_priority + rng.uniform(0, 10)))
+            victim = alive.pop(rng.randint(len(alive)))
+            operations.append(('remove', victim, None))
+        operations.append(('pop', None, None))
+        base_priority += 1.0
+    return operations, nr_items
+
+
+def run(queue, operations, items):
+    popped = set()
+    start = time.perf_counter()
+    for operation, item_index, priority in operations:
+        if operation == 'push':
+            queue.push(items[item_index], priority)
+        elif operation == 'pop':
+            if len(queue):
+                popped.add(id(queue.pop()[0]))
+        else:
+            item = items[item_index]
+            if id(item) in popped:
+                continue
+            if operation == 'decrease':
+                queue.set_priority(item, priority)
+            else:
+                queue.remove(item)
+    while len(queue):
+        queue.pop()
+    return time.perf_counter() - start
+
+
+def main():
+    nr_operations = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    operations, nr_items = make_workload(nr_operations)
+    items = [Item() for _ in range(nr_items)]
+    queues = [('heapdict', HeapdictQueue),
+              ('IndexedHeap(arity=2)', lambda: IndexedHeap(arity=2)),
+              ('IndexedHeap(arity=4)', lambda: IndexedHeap(arity=4))]
+    print('{} operations on {} items'.format(len(operations), nr_items))
+    baseline = None
+    for name, make_queue in queues:
+        elapsed = min(run(make_queue(), operations, items) for _ in range(3))
+        baseline = baseline or elapsed
+        print('{:<22} {:7.3f}sec   speedup: {:.2f}x'.format(name, elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares `LandmarkHeuristic` (with landmarks selected by each of the strategies) with
+ `AirDistHeuristic`, under `FlatAStar` and `AStar`, on random map problems.
+The costs found by all the solvers are checked to be equal to the costs found by `FlatUniformCost`.
+Usage (from the repository root):
+    python experiments/landmark_benchmark.py [map_file] [nr_queries] [nr_landmarks]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework import *
+from deliveries import *
+
+
+def run_solver(solver: GraphProblemSolver, problems, reference_costs):
+    results = [solver.solve_problem(problem) for problem in problems]
+    costs = [None if result.final_search_node is None else round(result.final_search_node.cost, 3)
+             for result in results]
+    print('{:<40} {:9.2f}ms/query   #dev: {:<10} {}'.format(
+        solver.solver_name, 1000 * sum(result.solving_time for result in results) / len(problems),
+        sum(result.nr_expanded_states for result in results),
+        'same costs' if reference_costs is None or costs == reference_costs
+        else 'DIFFERENT COSTS: {}'.format(costs)))
+    return costs
+
+
+def main():
+    map_file = sys.argv[1] if len(sys.argv) > 1 else Consts.get_data_file_path('tlv.csv')
+    nr_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    nr_landmarks = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    roads = load_map_from_csv(map_file)
+
+    rng = np.random.RandomState(0)
+    junction_ids = list(roads.keys())
+    problems = [MapProblem(roads, junction_ids[rng.randint(len(junction_ids))],
+                           junction_ids[rng.randint(len(junction_ids))]) for _ in range(nr_queries)]
+    reference_costs = run_solver(FlatUniformCost(), problems, None)
+    run_solver(FlatAStar(AirDistHeuristic), problems, reference_costs)
+    for strategy in (FARTHEST_LANDMARKS, AVOID_LANDMARKS):
+        start = time.time()
+        tables = LandmarkTables.build(roads, nr_landmarks=nr_landmarks, strategy=strategy)
+        print('Built {} landmarks ({}) in {:.2f}sec'.format(tables.nr_landmarks, strategy, time.time() - start))
+        heuristic_type = LandmarkHeuristic.with_tables(tables)
+        run_solver(FlatAStar(heuristic_type), problems, reference_costs)
+        run_solver(AStar(heuristic_type), problems, reference_costs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Compares the peak memory (traced by `tracemalloc`) and the time of `AStar`, `IDAStar` and
+ `SMAStar` (with the given memory caps, in nodes) on a relaxed deliveries problem.
+Tracing the memory allocations slows the searches down, so the times are only relative.
+Usage (from the repository root):
+    python experiments/memory_bounded_benchmark.py [deliveries_input_file] [max_nr_nodes ...]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework import *
+from deliveries import *
+
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'small_delivery.in'
+    memory_caps = [int(arg) for arg in sys.argv[2:]] or [1000, 100]
+    roads = load_map_from_csv(Consts.get_data_file_path('tlv.csv'))
+    problem = RelaxedDeliveriesProblem(DeliveriesProblemInput.load_from_file(input_file, roads))
+
+    solvers = [AStar(MSTAirDistHeuristic)]
+    for max_nr_nodes in memory_caps:
+        solvers += [IDAStar(MSTAirDistHeuristic, max_nr_nodes=max_nr_nodes),
+                    SMAStar(MSTAirDistHeuristic, max_nr_nodes=max_nr_nodes)]
+    for solver in solvers:
+        tracemalloc.start()
+        result = solver.solve_problem(problem)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print('{:<36} max nodes: {:<8} peak: {:7.2f}MB   time: {:7.2f}   #dev: {:<8} cost: {}'.format(
+            solver.solver_name, getattr(solver, 'max_nr_nodes', '-'), peak_memory / 2 ** 20,
+            result.solving_time, result.nr_expanded_states,
+            None if result.final_search_node is None else result.final_search_node.cost))
+
+
+if __name__ == '__main__':
+    main()
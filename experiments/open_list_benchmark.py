@@ -0,0 +1,65 @@
+"""
+Compares the open list strategies of `BestFirstSearch` (`IndexedHeap`, `LazyDeletionHeap`
+ and `RadixHeap`) on map problems, for uniform cost and A* and for the integral
+ (`distance`) and real (`air_distance`) cost models.
+For each workload, the total solving time over random queries is reported, and the
+ costs found by all the strategies are checked to be equal.
+Usage (from the repository root):
+    python experiments/open_list_benchmark.py [map_file] [nr_queries]
+"""
+
+import os
+import sys
+import numpy as np
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework import *
+from deliveries import *
+
+
+def open_list_types(cost_model: str, radix_tolerance: float):
+    # The radix heap keys are integral: exact for the `distance` costs, millimeters for the air distances.
+    radix_resolution = 1.0 if cost_model == DISTANCE_COST else 1000.0
+    return [('IndexedHeap', IndexedHeap),
+            ('LazyDeletionHeap', LazyDeletionHeap),
+            ('RadixHeap(res={:g})'.format(radix_resolution),
+             partial(RadixHeap, resolution=radix_resolution, tolerance=radix_tolerance))]
+
+
+def main():
+    map_file = sys.argv[1] if len(sys.argv) > 1 else Consts.get_data_file_path('tlv.csv')
+    nr_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    roads = load_map_from_csv(map_file)
+    rng = np.random.RandomState(0)
+    junction_ids = list(roads.keys())
+    queries = [(junction_ids[rng.randint(len(junction_ids))], junction_ids[rng.randint(len(junction_ids))])
+               for _ in range(nr_queries)]
+
+    # The air distances satisfy the triangle inequality only up to the rounding of their `acos` (a
+    #  fraction of a millimeter), so A* with them may push priorities slightly lower than the last popped one.
+    workloads = [('UniformCost', AIR_DISTANCE_COST, 0.0,
+                  lambda open_list_type: UniformCost(open_list_type=open_list_type)),
+                 ('UniformCost', DISTANCE_COST, 0.0,
+                  lambda open_list_type: UniformCost(open_list_type=open_list_type)),
+                 ('A* (AirDist)', AIR_DISTANCE_COST, 0.001,
+                  lambda open_list_type: AStar(AirDistHeuristic, open_list_type=open_list_type))]
+    for solver_name, cost_model, radix_tolerance, make_solver in workloads:
+        problems = [MapProblem(roads, source, target, cost_model=cost_model) for source, target in queries]
+        print('{} with {} costs:'.format(solver_name, cost_model))
+        reference_costs = None
+        for open_list_name, open_list_type in open_list_types(cost_model, radix_tolerance):
+            solver = make_solver(open_list_type)
+            results = [solver.solve_problem(problem) for problem in problems]
+            costs = [None if result.final_search_node is None else round(result.final_search_node.cost, 3)
+                     for result in results]
+            reference_costs = reference_costs or costs
+            print('    {:<22} {:7.2f}sec   #dev: {:<8} {}'.format(
+                open_list_name, sum(result.solving_time for result in results),
+                sum(result.nr_expanded_states for result in results),
+                'same costs' if costs == reference_costs else 'DIFFERENT COSTS: {}'.format(costs)))
+
+
+if __name__ == '__main__':
+    main()
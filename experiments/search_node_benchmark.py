@@ -0,0 +1,88 @@
+"""
+Measures the memory (bytes per node) and the creation time (under tracemalloc, so only
+ relative) of the search nodes representations:
+ - the original `SearchNode` (a class with a per-instance `__dict__`; replicated here),
+ - the current `SearchNode` (with `__slots__`),
+ - nodes allocated in a `SearchNodesArena`, kept by their handles (like the nodes in `open`),
+    or by their indices (like the nodes in `close`, see `ArenaSearchNodesCollection`).
+The nodes form a random search tree (each node's parent is an earlier node), with float
+ costs and priorities, like the nodes of a real search.
+Usage (from the repository root):
+    python experiments/search_node_benchmark.py [nr_nodes]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework.graph_search.graph_problem_interface import SearchNode
+from framework.graph_search.search_node_arena import SearchNodesArena, ArenaSearchNode
+
+
+class DictSearchNode:
+    """The `SearchNode` before the `__slots__` change (the fields are stored in a `__dict__`)."""
+
+    def __init__(self, state, parent_search_node=None, operator_cost=0, expanding_priority=None):
+        self.state = state
+        self.parent_search_node = parent_search_node
+        self.operator_cost = operator_cost
+        self.cost = None
+        self.expanding_priority = expanding_priority
+
+        self.cost = operator_cost
+        if self.parent_search_node is not None:
+            self.cost += self.parent_search_node.cost
+
+
+def build_tree(make_node, parents, operator_costs, states, arena=None):
+    """If an arena is given, the nodes are kept by their indices rather than by their handles."""
+    root = make_node(states[0], None, 0.0)
+    nodes = [root if arena is None else root.index]
+    for index in range(1, len(parents)):
+        parent = nodes[parents[index]]
+        if arena is not None:
+            parent = ArenaSearchNode(arena, parent)
+        node = make_node(states[index], parent, operator_costs[index])
+        node.expanding_priority = node.cost * 1.5
+        nodes.append(node if arena is None else node.index)
+    return nodes
+
+
+def measure(name: str, make_node_factory, parents, operator_costs, states, keep_indices: bool = False):
+    make_node, owner = make_node_factory()
+    tracemalloc.start()
+    start = time.perf_counter()
+    nodes = build_tree(make_node, parents, operator_costs, states, owner if keep_indices else None)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nr_nodes = len(parents)
+    print('{:<34} {:7.1f} bytes/node   {:6.0f}ns/node'.format(name, current / nr_nodes, elapsed / nr_nodes * 1e9))
+    del nodes, owner
+
+
+def main():
+    nr_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    rng = np.random.RandomState(0)
+    parents = [0] + [int(rng.randint(index)) for index in range(1, nr_nodes)]
+    operator_costs = rng.uniform(1, 100, nr_nodes).tolist()
+    states = list(range(nr_nodes))  # the states themselves are not part of the measurement
+    print('{} nodes (the memory of the states themselves is not included)'.format(nr_nodes))
+
+    measure('SearchNode with __dict__ (before)', lambda: (DictSearchNode, None), parents, operator_costs, states)
+    measure('SearchNode with __slots__', lambda: (SearchNode, None), parents, operator_costs, states)
+
+    def arena_factory():
+        arena = SearchNodesArena()
+        return arena.make_node, arena
+
+    measure('SearchNodesArena, kept by handles', arena_factory, parents, operator_costs, states)
+    measure('SearchNodesArena, kept by indices', arena_factory, parents, operator_costs, states, keep_indices=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Measures the time it takes a fresh interpreter to import the packages (and `main`).
+Each import is timed in a new process, so nothing is cached between the runs.
+Usage (from the repository root):
+    python experiments/startup_benchmark.py [nr_runs]
+"""
+
+import os
+import subprocess
+import sys
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['framework', 'deliveries', 'main']
+HEAVY_MODULES = ['scipy', 'matplotlib']
+
+TIMING_CODE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(name for name in {heavy_modules!r} if name in sys.modules))
+"""
+
+
+def time_import(module: str):
+    output = subprocess.check_output(
+        [sys.executable, '-c', TIMING_CODE.format(module=module, heavy_modules=HEAVY_MODULES)],
+        cwd=REPO_ROOT, universal_newlines=True)
+    elapsed, loaded_heavy_modules = (output.strip().split(' ') + [''])[:2]
+    return float(elapsed), loaded_heavy_modules
+
+
+def main():
+    nr_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for module in MODULES:
+        times = []
+        loaded_heavy_modules = ''
+        for _ in range(nr_runs):
+            elapsed, loaded_heavy_modules = time_import(module)
+            times.append(elapsed)
+        times = np.array(times) * 1000
+        print('import {:<12} min: {:7.1f}ms   median: {:7.1f}ms   heavy modules loaded: {}'.format(
+            module, times.min(), np.median(times), loaded_heavy_modules or '-'))
+
+
+if __name__ == '__main__':
+    main()
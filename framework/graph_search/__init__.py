@@ -2,6 +2,22 @@
 from .graph_problem_interface import *
 from .uniform_cost import UniformCost
 from .astar import AStar
-from .greedy_stochastic import GreedyStochastic
+from .greedy_stochastic import GreedyStochastic, AnytimeGreedyStochastic
+from .flat_search import FlatAdjacency, FlatGraphProblem, FlatUniformCost, FlatAStar, flat_dijkstra, \
+    flat_shortest_path_tree
+from .bidirectional_search import BidirectionalUniformCost, BidirectionalAStar
+from .memory_bounded_search import IDAStar, SMAStar
+from .anytime_search import AnytimeSearchResult, ARAStar
+from .batch_solve import solve_matrix
+from .cached_heuristic import CachedHeuristic, CachedHeuristicFunction, HeuristicCacheInfo
+from .utils.indexed_heap import IndexedHeap
+from .utils.open_lists import OpenList, LazyDeletionHeap, RadixHeap
 
-__all__ = ['UniformCost', 'AStar', 'GreedyStochastic'] + graph_problem_interface.__all__
+__all__ = ['UniformCost', 'AStar', 'GreedyStochastic', 'AnytimeGreedyStochastic',
+           'FlatAdjacency', 'FlatGraphProblem', 'FlatUniformCost', 'FlatAStar',
+           'flat_dijkstra', 'flat_shortest_path_tree',
+           'BidirectionalUniformCost', 'BidirectionalAStar', 'IDAStar', 'SMAStar',
+           'AnytimeSearchResult', 'ARAStar', 'solve_matrix',
+           'CachedHeuristic', 'CachedHeuristicFunction', 'HeuristicCacheInfo',
+           'IndexedHeap', 'OpenList', 'LazyDeletionHeap', 'RadixHeap'] + \
+          graph_problem_interface.__all__
@@ -0,0 +1,163 @@
+from .graph_problem_interface import *
+from .utils.indexed_heap import IndexedHeap
+
+from math import inf
+from time import perf_counter
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence, Set
+
+__all__ = ['AnytimeSearchResult', 'ARAStar']
+
+
+class AnytimeSearchResult(NamedTuple):
+    """
+    One of the improving results of an anytime solver (see `ARAStar.solve_problem_anytime()`).
+    The `nr_expanded_states` and `solving_time` of `search_result` are counted from the
+     beginning of the anytime search (the work done to get this result).
+    """
+
+    search_result: SearchResult
+    """The heuristic weight of the search that found this result."""
+    heuristic_weight: float
+    """The cost of the result is at most `suboptimality_bound` times the optimal cost (`inf` if unknown)."""
+    suboptimality_bound: float
+
+    def __str__(self):
+        return '{}   w: {:.3f}   bound: {:.3f}'.format(self.search_result, self.heuristic_weight,
+                                                       self.suboptimality_bound)
+
+
+class ARAStar(GraphProblemSolver):
+    """
+    Anytime Repairing A* (Likhachev, Gordon & Thrun): a sequence of weighted A* searches (with
+     the f-score of `AStar`: `(1-w)*g + w*h`), with decreasing weights, that reuse the work of
+     each other. In ARA* terms, the weight `w` inflates the heuristic by `w / (1-w)`, and the
+     results are within `e = max(1, w / (1-w))` of the optimal cost (weights below 0.5 deflate
+     the heuristic, which keeps the results optimal).
+    Each search stops once the best goal found so far is at least as good as the best f-score
+     in `open`, and yields its result. A state whose cost improves after it was expanded (in the
+     same search) is not re-opened, but kept in an "inconsistent" set. The next search starts from
+     the `open` queue of the previous one together with the inconsistent states, re-prioritized
+     by the new weight, and with an empty `close` set.
+    With a consistent heuristic, the cost of each result is at most `e` times the optimal cost,
+     and the reported `suboptimality_bound` is the tighter `min(e, cost / min(g + h))` over the
+     states in `open` and the inconsistent states. The search stops early once it is 1.
+    """
+
+    solver_name = 'ARA*'
+
+    def __init__(self, heuristic_function_type: HeuristicFunctionType,
+                 heuristic_weights: Sequence[float] = (0.9, 0.8, 0.7, 0.6, 0.5),
+                 time_limit: Optional[float] = None):
+        """
+        :param heuristic_weights: The weights of the successive searches, in decreasing order.
+        :param time_limit: `solve_problem()` returns the best result found once this
+                           number of seconds has passed (at least one result is found).
+        """
+        assert list(heuristic_weights) == sorted(heuristic_weights, reverse=True)
+        self.heuristic_function_type = heuristic_function_type
+        self.heuristic_weights = tuple(heuristic_weights)
+        self.time_limit = time_limit
+        self.solver_name += ' (h={heuristic_name}, w={first_weight:.3f}..{last_weight:.3f})'.format(
+            heuristic_name=heuristic_function_type.heuristic_name,
+            first_weight=self.heuristic_weights[0], last_weight=self.heuristic_weights[-1])
+
+    def solve_problem(self, problem: GraphProblem) -> SearchResult:
+        """Returns the last (best) result of `solve_problem_anytime()`, within the time limit (if any)."""
+        start_time = perf_counter()
+        anytime_result = None
+        for anytime_result in self.solve_problem_anytime(problem):
+            if self.time_limit is not None and perf_counter() - start_time >= self.time_limit:
+                break
+        return anytime_result.search_result
+
+    def solve_problem_anytime(self, problem: GraphProblem) -> Iterator[AnytimeSearchResult]:
+        """
+        Iterates over the improving results: one per weight (unless neither the solution nor its
+         bound improved), until a result is proven optimal.
+        If no solution is found, a single result without a final search node is yielded.
+        """
+        start_time = perf_counter()
+        heuristic_function = self.heuristic_function_type(problem)
+        heuristic_values: Dict[GraphProblemState, float] = {}
+
+        def estimate(state: GraphProblemState) -> float:
+            h = heuristic_values.get(state)
+            if h is None:
+                heuristic_values[state] = h = heuristic_function.estimate(state)
+            return h
+
+        # The best node found of each state (its cost is the g-score of the state).
+        nodes: Dict[GraphProblemState, SearchNode] = {problem.initial_state: SearchNode(problem.initial_state)}
+        open_queue = IndexedHeap()  # of states
+        open_queue.push(problem.initial_state, 0.0)
+        close: Set[GraphProblemState] = set()
+        inconsistent: Set[GraphProblemState] = set()
+        goal_node = nodes[problem.initial_state] if problem.is_goal(problem.initial_state) else None
+        nr_expanded_states = 0
+        last_result: Optional[AnytimeSearchResult] = None
+
+        for w in self.heuristic_weights:
+            for state in list(open_queue) + list(inconsistent):
+                open_queue.set_priority(state, (1 - w) * nodes[state].cost + w * estimate(state))
+            inconsistent.clear()
+            close.clear()
+
+            # Improve the path, until the goal found is as good as any node in `open`.
+            while not open_queue.is_empty():
+                state, priority = open_queue.peek()
+                if goal_node is not None and (1 - w) * goal_node.cost <= priority:
+                    break
+                open_queue.pop()
+                close.add(state)
+                nr_expanded_states += 1
+                node = nodes[state]
+                for successor_state, operator_cost in problem.expand_state_with_costs(state):
+                    known_node = nodes.get(successor_state)
+                    if known_node is not None and known_node.cost <= node.cost + operator_cost:
+                        continue
+                    successor_node = SearchNode(successor_state, node, operator_cost)
+                    nodes[successor_state] = successor_node
+                    if problem.is_goal(successor_state) and (goal_node is None or successor_node.cost < goal_node.cost):
+                        goal_node = successor_node
+                    if successor_state in close:
+                        inconsistent.add(successor_state)
+                    else:
+                        successor_node.expanding_priority = \
+                            (1 - w) * successor_node.cost + w * estimate(successor_state)
+                        open_queue.set_priority(successor_state, successor_node.expanding_priority)
+
+            if goal_node is None:
+                break  # `open` is empty: there is no solution
+            suboptimality_bound = self._suboptimality_bound(w, goal_node, nodes, estimate,
+                                                            list(open_queue) + list(inconsistent))
+            if last_result is not None and goal_node is last_result.search_result.final_search_node \
+                    and suboptimality_bound >= last_result.suboptimality_bound:
+                continue  # no improvement
+            last_result = AnytimeSearchResult(
+                search_result=SearchResult(solver=self, problem=problem, final_search_node=goal_node,
+                                           nr_expanded_states=nr_expanded_states,
+                                           solving_time=perf_counter() - start_time),
+                heuristic_weight=w,
+                suboptimality_bound=suboptimality_bound)
+            yield last_result
+            if suboptimality_bound <= 1:
+                return
+
+        if goal_node is None:
+            yield AnytimeSearchResult(
+                search_result=SearchResult(solver=self, problem=problem, final_search_node=None,
+                                           nr_expanded_states=nr_expanded_states,
+                                           solving_time=perf_counter() - start_time),
+                heuristic_weight=self.heuristic_weights[-1],
+                suboptimality_bound=inf)
+
+    @staticmethod
+    def _suboptimality_bound(w: float, goal_node: SearchNode, nodes: Dict[GraphProblemState, SearchNode],
+                             estimate, frontier_states) -> float:
+        inflation = max(1.0, w / (1 - w)) if w < 1 else inf
+        lower_bound = min((nodes[state].cost + estimate(state) for state in frontier_states), default=inf)
+        if lower_bound >= goal_node.cost:
+            return 1.0
+        if lower_bound <= 0:
+            return inflation
+        return min(inflation, goal_node.cost / lower_bound)
@@ -1,5 +1,7 @@
 from .graph_problem_interface import *
 from .best_first_search import BestFirstSearch
+from .utils.indexed_heap import IndexedHeap
+from .utils.open_lists import OpenListType
 
 
 class AStar(BestFirstSearch):
@@ -10,7 +12,9 @@ class AStar(BestFirstSearch):
 
     solver_name = 'A*'
 
-    def __init__(self, heuristic_function_type: HeuristicFunctionType, heuristic_weight: float = 0.5):
+    def __init__(self, heuristic_function_type: HeuristicFunctionType, heuristic_weight: float = 0.5,
+                 use_node_arena: bool = False, open_list_type: OpenListType = IndexedHeap,
+                 collect_stats: bool = False):
         """
         :param heuristic_function_type: The A* solver stores the constructor of the heuristic
                                         function, rather than an instance of that heuristic.
@@ -18,9 +22,13 @@ class AStar(BestFirstSearch):
                                         is created.
         :param heuristic_weight: Used to calculate the f-score of a node using
                                  the heuristic value and the node's cost. Default is 0.5.
+        :param use_node_arena: Allocate the search nodes in a `SearchNodesArena` (see `BestFirstSearch`).
+        :param open_list_type: The priority queue to use for `open` (see `BestFirstSearch`).
+        :param collect_stats: Collect `SearchStats` of each search (see `BestFirstSearch`).
         """
         # A* is a graph search algorithm. Hence, we use close set.
-        super(AStar, self).__init__(use_close=True)
+        super(AStar, self).__init__(use_close=True, use_node_arena=use_node_arena, open_list_type=open_list_type,
+                                    collect_stats=collect_stats)
         self.heuristic_function_type = heuristic_function_type
         self.heuristic_weight = heuristic_weight
         self.solver_name += ' (h={heuristic_name}, w={heuristic_weight:.3f})'.format(
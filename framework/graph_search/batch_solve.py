@@ -0,0 +1,98 @@
+from .graph_problem_interface import *
+
+import copy
+import os
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+__all__ = ['solve_matrix']
+
+"""
+The solvers and problems of the batch being solved (set in this process, and inherited or
+ received by the worker processes - see `_init_worker()`), and the seed of its random tasks.
+"""
+_batch: Optional[Tuple[Sequence[GraphProblemSolver], Sequence[GraphProblem], int]] = None
+
+
+def _init_worker(batch):
+    """This function is for local use only (runs in the worker processes)."""
+    global _batch
+    _batch = batch
+
+
+def _solve_task(task_index: int) -> tuple:
+    """
+    This function is for local use only (runs in the worker processes, or in this process).
+    Solves the problem of the given task (in row major order) with a copy of its solver, so the
+     tasks do not affect each other (e.g. the temperature of `GreedyStochastic`), and with
+     `np.random` seeded by the task, so the results do not depend on the worker that solved it.
+    Returns the found path as a list of (state, operator cost, expanding priority), rather
+     than as the chain of `SearchNode`s, to send it back cheaply.
+    """
+    solvers, problems, seed = _batch
+    solver = copy.copy(solvers[task_index // len(problems)])
+    problem = problems[task_index % len(problems)]
+    np.random.seed((seed + task_index) % 2 ** 32)
+    result = solver.solve_problem(problem)
+    path = None
+    if result.final_search_node is not None:
+        path = [(node.state, node.operator_cost, node.expanding_priority)
+                for node in result.final_search_node.traverse_back_to_root()]
+        path.reverse()
+    return path, result.nr_expanded_states, result.solving_time, result.stats
+
+
+def _make_result(solver: GraphProblemSolver, problem: GraphProblem, task_result: tuple) -> SearchResult:
+    path, nr_expanded_states, solving_time, stats = task_result
+    final_search_node = None
+    for state, operator_cost, expanding_priority in path or ():
+        final_search_node = SearchNode(state, final_search_node, operator_cost, expanding_priority)
+    return SearchResult(solver=solver, problem=problem, final_search_node=final_search_node,
+                        nr_expanded_states=nr_expanded_states, solving_time=solving_time, stats=stats)
+
+
+def solve_matrix(solvers: Sequence[GraphProblemSolver], problems: Sequence[GraphProblem],
+                 processes: Optional[int] = 1, seed: int = 0) -> List[List[SearchResult]]:
+    """
+    Solves each of the problems with each of the solvers, and returns the results in the same
+     order: `results[i][j]` is the result of `solvers[i]` on `problems[j]`. The `solving_time`
+     of each result is the time of its own task.
+    The tasks are distributed over a pool of `processes` worker processes (`None` for one per CPU).
+     The workers get all the solvers and problems once, when they start (inherited when the
+     processes are forked, otherwise pickled once per worker), so the map shared by the problems
+     is not sent per task. Only the found paths are sent back (changes that the solvers make to
+     the problems in the workers, like filling a cache, are not).
+    Each task is solved by a copy of its solver, and with `np.random` seeded by `seed` plus the
+     task index, so the results are reproducible and do not depend on the number of processes.
+     The state of `np.random` in this process is left as it was.
+    """
+    global _batch
+    solvers, problems = list(solvers), list(problems)
+    nr_tasks = len(solvers) * len(problems)
+    batch = (solvers, problems, seed)
+    processes = min(processes or os.cpu_count() or 1, nr_tasks)
+
+    previous_batch = _batch
+    _batch = batch
+    try:
+        if processes <= 1:
+            random_state = np.random.get_state()
+            try:
+                task_results = [_solve_task(task_index) for task_index in range(nr_tasks)]
+            finally:
+                np.random.set_state(random_state)
+        else:
+            import multiprocessing
+            context = multiprocessing.get_context()
+            if context.get_start_method() == 'fork':
+                pool = context.Pool(processes)  # the forked workers inherit the batch
+            else:
+                pool = context.Pool(processes, initializer=_init_worker, initargs=(batch,))
+            with pool:
+                task_results = pool.map(_solve_task, range(nr_tasks), chunksize=1)
+    finally:
+        _batch = previous_batch
+
+    return [[_make_result(solver, problem, task_results[i * len(problems) + j])
+             for j, problem in enumerate(problems)]
+            for i, solver in enumerate(solvers)]
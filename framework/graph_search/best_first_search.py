@@ -1,7 +1,10 @@
 from .graph_problem_interface import *
+from .search_node_arena import SearchNodesArena, ArenaSearchNodesCollection
 from .utils.timer import Timer
-from .utils.heapdict import heapdict
-from typing import Optional, Dict
+from .utils.indexed_heap import IndexedHeap
+from .utils.open_lists import OpenListType
+from typing import Optional, Dict, List, Union
+from time import perf_counter
 import abc
 
 
@@ -9,10 +12,11 @@ class SearchNodesPriorityQueue:
     """
     This class is used as a data structure for the `open` queue in the BestFirstSearch algorithm.
     Notice that we store a mapping from state to the node represents it for quick operations.
+    The priority queue of the nodes is created by `open_list_type` (see `utils/open_lists.py`).
     """
 
-    def __init__(self):
-        self._nodes_queue = heapdict()  # node -> priority (selecting the next node to expand is done by this score)
+    def __init__(self, open_list_type: OpenListType = IndexedHeap):
+        self._nodes_queue = open_list_type()  # node -> priority (selecting the next node to expand is done by this score)
         self._state_to_search_node_mapping: Dict[GraphProblemState, SearchNode] = {}
 
     def has_state(self, state: GraphProblemState) -> bool:
@@ -23,20 +27,24 @@ class SearchNodesPriorityQueue:
 
     def push_node(self, node: SearchNode):
         assert node.state not in self._state_to_search_node_mapping
-        self._nodes_queue[node] = node.expanding_priority
+        self._nodes_queue.push(node, node.expanding_priority)
         self._state_to_search_node_mapping[node.state] = node
 
     def pop_next_node(self) -> SearchNode:
-        node, _ = self._nodes_queue.popitem()
+        node, _ = self._nodes_queue.pop()
         del self._state_to_search_node_mapping[node.state]
         return node
 
+    def peek_next_nodes(self, n: int) -> List[SearchNode]:
+        """Returns the (at most) `n` nodes that would be popped next, in that order, without removing them."""
+        return [node for node, _ in self._nodes_queue.peek_n_best(n)]
+
     def extract_node(self, node: SearchNode):
         del self._state_to_search_node_mapping[node.state]
-        self._nodes_queue.pop(node)
+        self._nodes_queue.remove(node)
 
     def is_empty(self) -> bool:
-        return self._nodes_queue.empty()
+        return self._nodes_queue.is_empty()
 
     def __len__(self):
         return len(self._nodes_queue)
@@ -70,6 +78,92 @@ class SearchNodesCollection:
         return self._state_to_search_node_mapping.get(state, None)
 
 
+class _InstrumentedPriorityQueue(SearchNodesPriorityQueue):
+    """The `open` queue of a search that collects `SearchStats`: counts and times the queue operations."""
+
+    def __init__(self, open_list_type: OpenListType, stats: SearchStats):
+        super(_InstrumentedPriorityQueue, self).__init__(open_list_type)
+        self._stats = stats
+
+    def push_node(self, node: SearchNode):
+        start = perf_counter()
+        super(_InstrumentedPriorityQueue, self).push_node(node)
+        stats = self._stats
+        stats.queue_time += perf_counter() - start
+        stats.nr_queue_pushes += 1
+        if len(self) > stats.max_open_size:
+            stats.max_open_size = len(self)
+
+    def pop_next_node(self) -> SearchNode:
+        start = perf_counter()
+        node = super(_InstrumentedPriorityQueue, self).pop_next_node()
+        self._stats.queue_time += perf_counter() - start
+        self._stats.nr_queue_pops += 1
+        return node
+
+    def peek_next_nodes(self, n: int) -> List[SearchNode]:
+        start = perf_counter()
+        nodes = super(_InstrumentedPriorityQueue, self).peek_next_nodes(n)
+        self._stats.queue_time += perf_counter() - start
+        return nodes
+
+    def extract_node(self, node: SearchNode):
+        start = perf_counter()
+        super(_InstrumentedPriorityQueue, self).extract_node(node)
+        self._stats.queue_time += perf_counter() - start
+        self._stats.nr_queue_removals += 1
+
+
+class _InstrumentedCollection:
+    """
+    The `close` set of a search that collects `SearchStats` (wraps a `SearchNodesCollection` or an
+     `ArenaSearchNodesCollection`): counts the re-opened nodes and times the additions and removals.
+    """
+
+    def __init__(self, collection, stats: SearchStats):
+        self._collection = collection
+        self._stats = stats
+        self._size = 0
+
+    def add_node(self, node: SearchNode):
+        start = perf_counter()
+        self._collection.add_node(node)
+        stats = self._stats
+        stats.queue_time += perf_counter() - start
+        self._size += 1
+        if self._size > stats.max_close_size:
+            stats.max_close_size = self._size
+
+    def remove_node(self, node: SearchNode):
+        start = perf_counter()
+        self._collection.remove_node(node)
+        self._stats.queue_time += perf_counter() - start
+        self._stats.nr_reopened_nodes += 1
+        self._size -= 1
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+class _TimedHeuristic(HeuristicFunction):
+    """The heuristic of a search that collects `SearchStats`: counts and times the calls to `estimate()`."""
+
+    def __init__(self, heuristic_function: HeuristicFunction, stats: SearchStats):
+        super(_TimedHeuristic, self).__init__(heuristic_function.problem)
+        self._heuristic_function = heuristic_function
+        self._stats = stats
+
+    def estimate(self, state: GraphProblemState) -> float:
+        start = perf_counter()
+        estimation = self._heuristic_function.estimate(state)
+        self._stats.heuristic_time += perf_counter() - start
+        self._stats.nr_heuristic_calls += 1
+        return estimation
+
+    def __getattr__(self, name):
+        return getattr(self._heuristic_function, name)
+
+
 class BestFirstSearch(GraphProblemSolver):
     """
     Best First Search is a generic search algorithm, as we learnt in class.
@@ -90,14 +184,35 @@ class BestFirstSearch(GraphProblemSolver):
     The opening of a successor node is also not defined by this algorithm,
      and have to be defined by the inheritor by overriding the abstract method
      `_open_successor_node()`.
+    The priority queue behind `open` is chosen by `open_list_type` (see `utils/open_lists.py`):
+     `IndexedHeap` (the default) removes and re-prioritizes nodes in place, `LazyDeletionHeap`
+     only marks removed nodes and skips them when popped, and `RadixHeap` is a monotone
+     integer-keyed queue (for uniform cost, or A* with a consistent heuristic and
+     `heuristic_weight <= 0.5`).
+    If `use_node_arena` is set, the search nodes are allocated in a `SearchNodesArena`
+     (flat arrays with compact parent indices) instead of as `SearchNode` objects. It saves
+     memory in searches that keep millions of nodes, at the cost of a slower field access.
+     The slot of a successor node that `_open_successor_node()` did not push into `open` is
+     reused by the next successor node, so the arena holds only the nodes that were opened.
+    Once the search is done, the `open` and `close` data structures (and the arena) are released,
+     so the result keeps alive only the nodes of the path found (not the whole search tree).
+    If `collect_stats` is set, the result has `SearchStats` (see `SearchResult.stats`): `open`,
+     `close` and the heuristic (the `heuristic_function` field of the solvers that use one) are
+     replaced by instrumented versions (and the counters of a `CachedHeuristic` are collected).
+     Otherwise, the search is not instrumented at all.
     """
 
     solver_name: str = 'BestFirstSearch'
 
-    def __init__(self, use_close: bool = True):
+    def __init__(self, use_close: bool = True, use_node_arena: bool = False,
+                 open_list_type: OpenListType = IndexedHeap, collect_stats: bool = False):
         self.open: SearchNodesPriorityQueue = None
-        self.close: Optional[SearchNodesCollection] = None
+        self.close: Optional[Union[SearchNodesCollection, ArenaSearchNodesCollection]] = None
         self.use_close = use_close
+        self.use_node_arena = use_node_arena
+        self.open_list_type = open_list_type
+        self.collect_stats = collect_stats
+        self._nodes_arena: Optional[SearchNodesArena] = None
 
     def solve_problem(self, problem: GraphProblem) -> SearchResult:
         """
@@ -107,15 +222,28 @@ class BestFirstSearch(GraphProblemSolver):
         final_search_node = None
         nr_expanded_states = 0
 
-        self.open = SearchNodesPriorityQueue()
-        if self.use_close:
-            self.close = SearchNodesCollection()
+        stats = SearchStats() if self.collect_stats else None
+        self._nodes_arena = SearchNodesArena() if self.use_node_arena else None
+        if stats is None:
+            self.open = SearchNodesPriorityQueue(self.open_list_type)
         else:
+            self.open = _InstrumentedPriorityQueue(self.open_list_type, stats)
+        if not self.use_close:
             self.close = None
+        elif self._nodes_arena is None:
+            self.close = SearchNodesCollection()
+        else:
+            self.close = ArenaSearchNodesCollection(self._nodes_arena)
+        if stats is not None and self.close is not None:
+            self.close = _InstrumentedCollection(self.close, stats)
+        nodes_arena = self._nodes_arena
+        make_node = SearchNode if nodes_arena is None else nodes_arena.make_node
         self._init_solver(problem)
+        if stats is not None and getattr(self, 'heuristic_function', None) is not None:
+            self.heuristic_function = _TimedHeuristic(self.heuristic_function, stats)
 
         with Timer(print_title=False) as timer:
-            initial_search_node = SearchNode(problem.initial_state, None, 0)
+            initial_search_node = make_node(problem.initial_state, None, 0)
             initial_search_node.expanding_priority = self._calc_node_expanding_priority(initial_search_node)
             self.open.push_node(initial_search_node)
 
@@ -133,16 +261,38 @@ class BestFirstSearch(GraphProblemSolver):
 
                 # Iterate over next states and perform the update step for each.
                 for successor_state, operator_cost in problem.expand_state_with_costs(next_node_to_expand.state):
-                    successor_node = SearchNode(successor_state, next_node_to_expand, operator_cost)
+                    successor_node = make_node(successor_state, next_node_to_expand, operator_cost)
                     successor_node.expanding_priority = self._calc_node_expanding_priority(successor_node)
-                    self._open_successor_node(problem, successor_node)
-
+                    if stats is None:
+                        self._open_successor_node(problem, successor_node)
+                    else:
+                        nr_queue_pushes = stats.nr_queue_pushes
+                        self._open_successor_node(problem, successor_node)
+                        stats.nr_generated_nodes += 1
+                        if stats.nr_queue_pushes == nr_queue_pushes:
+                            stats.nr_duplicates_rejected += 1
+                    if nodes_arena is not None and self.open.get_node_by_state(successor_state) is not successor_node:
+                        nodes_arena.release_last_node(successor_node)
+
+            if final_search_node is not None and nodes_arena is not None:
+                final_search_node = SearchNode.copy_path(final_search_node)  # so the arena can be freed
+            self.open, self.close, self._nodes_arena = None, None, None
+
+        if stats is not None:
+            stats.expansion_time = max(timer.elapsed - stats.heuristic_time - stats.queue_time, 0.0)
+            cache_info = getattr(getattr(self, 'heuristic_function', None), 'cache_info', None)
+            if cache_info is not None:  # a `CachedHeuristic`
+                cache_info = cache_info()
+                stats.nr_heuristic_cache_hits = cache_info.hits
+                stats.nr_heuristic_cache_misses = cache_info.misses
+                stats.nr_heuristic_cache_evictions = cache_info.evictions
         return SearchResult(
             solver=self,
             problem=problem,
             final_search_node=final_search_node,
             nr_expanded_states=nr_expanded_states,
-            solving_time=timer.elapsed
+            solving_time=timer.elapsed,
+            stats=stats
         )
 
     def _init_solver(self, problem: GraphProblem):
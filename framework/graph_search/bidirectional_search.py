@@ -0,0 +1,198 @@
+from .graph_problem_interface import *
+from .flat_search import FlatAdjacency, FlatGraphProblem
+from .utils.timer import Timer
+
+from heapq import heappush, heappop
+from math import inf
+from typing import Callable, List, Optional, Tuple
+
+__all__ = ['BidirectionalUniformCost', 'BidirectionalAStar']
+
+
+class _SearchSide:
+    """
+    One direction of a bidirectional search: a flat best first search (see `flat_search.py`)
+     with the key `g + potential(position)`, over a lazy-deletion heap.
+    """
+
+    def __init__(self, adjacency: FlatAdjacency, nr_states: int, root: int,
+                 potential: Optional[Callable[[int], float]]):
+        self.offsets, self.targets, self.costs = adjacency
+        self.potential = potential
+        self.g_scores = [inf] * nr_states
+        self.keys = [inf] * nr_states
+        self.parents = [-1] * nr_states
+        self.operator_costs = [0.0] * nr_states
+        self.closed = bytearray(nr_states)
+        self.queue: List[Tuple[float, int]] = []
+        self.nr_expanded_states = 0
+        self.g_scores[root] = 0.0
+        self.keys[root] = 0.0 if potential is None else potential(root)
+        heappush(self.queue, (self.keys[root], root))
+
+    def min_key(self) -> float:
+        """The lowest key in the queue (`inf` if it is empty), after dropping the outdated entries."""
+        queue, closed, keys = self.queue, self.closed, self.keys
+        while queue:
+            key, position = queue[0]
+            if not closed[position] and key <= keys[position]:
+                return key
+            heappop(queue)
+        return inf
+
+    def expand_next(self, other: '_SearchSide', best: list):
+        """
+        Expands the position with the lowest key. Each reached position that was already reached
+         by the other direction closes a path; `best` = [cost, meeting position] of the shortest one.
+        """
+        _, position = heappop(self.queue)
+        self.closed[position] = 1
+        self.nr_expanded_states += 1
+        g_scores, other_g_scores = self.g_scores, other.g_scores
+        g = g_scores[position]
+        targets, costs, potential = self.targets, self.costs, self.potential
+        for link in range(self.offsets[position], self.offsets[position + 1]):
+            successor = targets[link]
+            if successor < 0:
+                continue
+            operator_cost = costs[link]
+            successor_g = operator_cost + g
+            if not successor_g < g_scores[successor]:
+                continue
+            g_scores[successor] = successor_g
+            self.parents[successor] = position
+            self.operator_costs[successor] = operator_cost
+            key = successor_g if potential is None else successor_g + potential(successor)
+            self.keys[successor] = key
+            heappush(self.queue, (key, successor))
+            path_cost = successor_g + other_g_scores[successor]
+            if path_cost < best[0]:
+                best[0], best[1] = path_cost, successor
+
+
+class BidirectionalBestFirstSearch(GraphProblemSolver):
+    """
+    Base class of the bidirectional solvers for `FlatGraphProblem`s that implement
+     `flat_reversed_problem()` (like `MapProblem`): a forward search from the initial state and
+     a backward search (over the reversed graph) from the goal, that expand alternately - each
+     time the direction with the lower key.
+    Each time a direction reaches a state that the other direction has reached, a path is
+     found, and the shortest such path `mu` is kept. With the forward potential `p_f` and the
+     backward potential `p_b = -p_f` (zero for uniform cost), the search stops once
+     `min_key_forward + min_key_backward >= mu`: every path not found yet is at least as long.
+    """
+
+    solver_name: str = 'BidirectionalBestFirstSearch'
+
+    def solve_problem(self, problem: GraphProblem) -> SearchResult:
+        assert isinstance(problem, FlatGraphProblem)
+        with Timer(print_title=False) as timer:
+            reversed_problem = problem.flat_reversed_problem()
+            if reversed_problem is None:
+                raise ValueError('{} requires a problem that implements `flat_reversed_problem()`, '
+                                 'and `{}` does not.'.format(self.solver_name, problem.name))
+            nr_states = problem.flat_nr_states()
+            goal_positions = tuple(problem.flat_goal_positions())
+            assert len(goal_positions) <= 1, 'Bidirectional search requires a single goal state.'
+            final_search_node = None
+            nr_expanded_states = 0
+            if goal_positions:
+                source, target = problem.flat_initial_position(), goal_positions[0]
+                forward_potential = self._make_forward_potential(problem, reversed_problem)
+                backward_potential = None if forward_potential is None \
+                    else (lambda position: -forward_potential(position))
+                forward = _SearchSide(problem.flat_adjacency(), nr_states, source, forward_potential)
+                backward = _SearchSide(reversed_problem.flat_adjacency(), nr_states, target, backward_potential)
+                best = [0.0, source] if source == target else [inf, -1]
+                while True:
+                    forward_key, backward_key = forward.min_key(), backward.min_key()
+                    if forward_key + backward_key >= best[0]:
+                        break
+                    if forward_key <= backward_key:
+                        forward.expand_next(backward, best)
+                    else:
+                        backward.expand_next(forward, best)
+                nr_expanded_states = forward.nr_expanded_states + backward.nr_expanded_states
+                if best[0] < inf:
+                    final_search_node = self._make_path_nodes(problem, forward, backward, best[1])
+
+        return SearchResult(
+            solver=self,
+            problem=problem,
+            final_search_node=final_search_node,
+            nr_expanded_states=nr_expanded_states,
+            solving_time=timer.elapsed
+        )
+
+    def _make_forward_potential(self, problem: GraphProblem,
+                                reversed_problem: GraphProblem) -> Optional[Callable[[int], float]]:
+        """The potential function of the forward search. None for uniform cost."""
+        return None
+
+    @staticmethod
+    def _make_path_nodes(problem: FlatGraphProblem, forward: _SearchSide, backward: _SearchSide,
+                         meeting_position: int) -> SearchNode:
+        """Builds the chain of `SearchNode`s of the path through the meeting position, and returns the last one."""
+        forward_positions = []
+        position = meeting_position
+        while position >= 0:
+            forward_positions.append(position)
+            position = forward.parents[position]
+        forward_positions.reverse()
+
+        search_node = SearchNode(problem.state_of_position(forward_positions[0]))
+        for position in forward_positions[1:]:
+            search_node = SearchNode(problem.state_of_position(position), search_node,
+                                     forward.operator_costs[position])
+        # The backward parent of a position is the next position on the way to the goal.
+        position = meeting_position
+        while backward.parents[position] >= 0:
+            next_position = backward.parents[position]
+            search_node = SearchNode(problem.state_of_position(next_position), search_node,
+                                     backward.operator_costs[position])
+            position = next_position
+        return search_node
+
+
+class BidirectionalUniformCost(BidirectionalBestFirstSearch):
+    """Bidirectional uniform cost search (bidirectional Dijkstra). Finds the same cost as `UniformCost`."""
+
+    solver_name = 'BidirectionalUniformCost'
+
+
+class BidirectionalAStar(BidirectionalBestFirstSearch):
+    """
+    Bidirectional A* with the average potential: given a heuristic `h_t` of the distance to the
+     goal, and `h_s` of the distance from the initial state (the same heuristic type, on the
+     reversed problem), the forward search uses `p_f = (h_t - h_s) / 2` and the backward search
+     `p_b = -p_f`. Both are consistent when `h_t` and `h_s` are (like `AirDistHeuristic`
+     with the air distance costs), so the result is optimal.
+    The heuristic is used through its `estimate_position()` method if it has one (see `FlatAStar`).
+    """
+
+    solver_name = 'BidirectionalA*'
+
+    def __init__(self, heuristic_function_type: HeuristicFunctionType):
+        self.heuristic_function_type = heuristic_function_type
+        self.solver_name += ' (h={heuristic_name})'.format(heuristic_name=heuristic_function_type.heuristic_name)
+
+    def _make_forward_potential(self, problem: GraphProblem,
+                                reversed_problem: GraphProblem) -> Optional[Callable[[int], float]]:
+        estimate_to_goal = self._make_estimate_position(problem)
+        estimate_from_initial = self._make_estimate_position(reversed_problem)
+        potentials = [inf] * problem.flat_nr_states()  # computed once per position, for both directions
+
+        def forward_potential(position: int) -> float:
+            potential = potentials[position]
+            if potential == inf:
+                potentials[position] = potential = (estimate_to_goal(position) - estimate_from_initial(position)) / 2
+            return potential
+        return forward_potential
+
+    def _make_estimate_position(self, problem: GraphProblem) -> Callable[[int], float]:
+        heuristic_function = self.heuristic_function_type(problem)
+        estimate_position = getattr(heuristic_function, 'estimate_position', None)
+        if estimate_position is None:
+            def estimate_position(position: int) -> float:
+                return heuristic_function.estimate(problem.state_of_position(position))
+        return estimate_position
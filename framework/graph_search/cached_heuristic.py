@@ -0,0 +1,82 @@
+from .graph_problem_interface import *
+
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+__all__ = ['CachedHeuristic', 'CachedHeuristicFunction', 'HeuristicCacheInfo']
+
+
+class HeuristicCacheInfo(NamedTuple):
+    """The counters of a `CachedHeuristicFunction` (like `functools.lru_cache`'s `cache_info()`)."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_entries: Optional[int]
+
+
+class CachedHeuristicFunction(HeuristicFunction):
+    """
+    A heuristic function that memoizes the estimations of another one, by state (so the states
+     must be hashable, as they are for the `close` set of the searches).
+    The cache holds at most `max_entries` states (`None` for no limit). When it is full, the
+     least recently used state is evicted.
+    Other attributes (e.g. `estimate_position()` of the map heuristics) are forwarded to the
+     wrapped heuristic, and are not cached.
+    """
+
+    def __init__(self, heuristic_function: HeuristicFunction, max_entries: Optional[int] = 100000):
+        assert max_entries is None or max_entries >= 1
+        super(CachedHeuristicFunction, self).__init__(heuristic_function.problem)
+        self.heuristic_function = heuristic_function
+        self.max_entries = max_entries
+        self._cache: OrderedDict = OrderedDict()
+        self.nr_hits = 0
+        self.nr_misses = 0
+        self.nr_evictions = 0
+
+    def estimate(self, state: GraphProblemState) -> float:
+        cache = self._cache
+        estimation = cache.get(state)
+        if estimation is not None:
+            self.nr_hits += 1
+            cache.move_to_end(state)
+            return estimation
+        self.nr_misses += 1
+        estimation = cache[state] = self.heuristic_function.estimate(state)
+        if self.max_entries is not None and len(cache) > self.max_entries:
+            cache.popitem(last=False)
+            self.nr_evictions += 1
+        return estimation
+
+    def cache_info(self) -> HeuristicCacheInfo:
+        return HeuristicCacheInfo(hits=self.nr_hits, misses=self.nr_misses, evictions=self.nr_evictions,
+                                  size=len(self._cache), max_entries=self.max_entries)
+
+    def cache_clear(self):
+        self._cache.clear()
+
+    def __getattr__(self, name):
+        if name == 'heuristic_function':
+            raise AttributeError(name)  # not set yet (e.g. while unpickling)
+        return getattr(self.heuristic_function, name)
+
+
+class CachedHeuristic:
+    """
+    A heuristic function type (see `HeuristicFunctionType`) that creates the heuristic functions
+     of `heuristic_function_type` wrapped by a `CachedHeuristicFunction`, so any solver can use
+     a cached heuristic, without changing the heuristic classes. For example:
+    >>> AStar(CachedHeuristic(MSTAirDistHeuristic, max_entries=10000))
+    Each search creates its own heuristic function, and so its own cache. When the solver
+     collects `SearchStats`, they count the hits, misses and evictions of the cache.
+    """
+
+    def __init__(self, heuristic_function_type: HeuristicFunctionType, max_entries: Optional[int] = 100000):
+        self.heuristic_function_type = heuristic_function_type
+        self.max_entries = max_entries
+        self.heuristic_name = 'Cached{}'.format(heuristic_function_type.heuristic_name)
+
+    def __call__(self, problem: GraphProblem) -> CachedHeuristicFunction:
+        return CachedHeuristicFunction(self.heuristic_function_type(problem), self.max_entries)
@@ -0,0 +1,246 @@
+from .graph_problem_interface import *
+from .utils.timer import Timer
+
+import abc
+from heapq import heappush, heappop
+from math import inf
+from typing import Callable, Collection, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+__all__ = ['FlatAdjacency', 'FlatGraphProblem', 'FlatUniformCost', 'FlatAStar', 'flat_dijkstra',
+           'flat_shortest_path_tree']
+
+
+class FlatAdjacency(NamedTuple):
+    """
+    The states-space graph in CSR form. The states are identified by their positions 0..n-1.
+    The successors of the state in position `i` are the entries `offsets[i]:offsets[i+1]`
+     of `targets` (the successor positions, -1 for an operator that should be ignored)
+     and `costs` (the operator costs).
+    Using memoryviews (or lists) rather than numpy arrays makes the indexing fast.
+    """
+    offsets: Sequence[int]
+    targets: Sequence[int]
+    costs: Sequence[float]
+
+
+class FlatGraphProblem(abc.ABC):
+    """
+    An *interface* (to be inherited together with `GraphProblem`) of problems whose states can be
+     identified by integers, and whose successors are stored in flat arrays (like `MapProblem`).
+    Such problems can be solved by `FlatUniformCost` / `FlatAStar`, which keep the search data
+     in arrays indexed by state position rather than in `SearchNode` objects and dictionaries.
+    """
+
+    @abc.abstractmethod
+    def flat_adjacency(self) -> FlatAdjacency:
+        ...
+
+    @abc.abstractmethod
+    def flat_nr_states(self) -> int:
+        ...
+
+    @abc.abstractmethod
+    def flat_initial_position(self) -> int:
+        ...
+
+    @abc.abstractmethod
+    def flat_goal_positions(self) -> Collection[int]:
+        ...
+
+    @abc.abstractmethod
+    def state_of_position(self, position: int) -> GraphProblemState:
+        ...
+
+    def flat_reversed_problem(self) -> Optional['FlatGraphProblem']:
+        """
+        The problem on the reversed graph, from the goal to the initial state (with the same positions).
+        Used by the bidirectional solvers. Optional: only problems with a single goal state can implement
+         it. By default it is None (the problem cannot be reversed), which the bidirectional solvers reject.
+        """
+        return None
+
+
+class _FlatSearchTree(NamedTuple):
+    g_scores: List[float]
+    parents: List[int]
+    operator_costs: List[float]
+    goal_position: Optional[int]
+    nr_expanded_states: int
+
+
+def _flat_best_first_search(adjacency: FlatAdjacency, nr_states: int, initial_positions: Iterable[int],
+                            goal_positions: Collection[int] = (),
+                            estimate_position: Optional[Callable[[int], float]] = None,
+                            heuristic_weight: float = 0.5, max_priority: float = inf) -> _FlatSearchTree:
+    """
+    Best first search over integer states, with the priority `g` (uniform cost) or
+     `(1-w)*g + w*h` (weighted A*, when `estimate_position` is given).
+    The open queue is a heap of (priority, position) with lazy deletion: an improved state is
+     pushed again, and the outdated entries are skipped when popped. As in `AStar`, a state
+     is improved (and re-opened, if it is closed) only when its priority improves, so with
+     w=1 (the priority is h alone) a state keeps the first path found to it.
+    """
+    offsets, targets, costs = adjacency
+    g_scores = [inf] * nr_states
+    priorities = [inf] * nr_states
+    parents = [-1] * nr_states
+    operator_costs = [0.0] * nr_states
+    closed = bytearray(nr_states)
+    heuristic_values = [-1.0] * nr_states if estimate_position is not None else None
+    w = heuristic_weight
+
+    open_queue = []
+    for position in initial_positions:
+        g_scores[position] = 0.0
+        if heuristic_values is None:
+            priorities[position] = 0.0
+        else:
+            heuristic_values[position] = h = estimate_position(position)
+            priorities[position] = w * h
+        heappush(open_queue, (priorities[position], position))
+
+    nr_expanded_states = 0
+    while open_queue:
+        priority, position = heappop(open_queue)
+        if closed[position] or priority > priorities[position]:
+            continue  # an outdated entry
+        if priority > max_priority:
+            break
+        closed[position] = 1
+        nr_expanded_states += 1
+        if position in goal_positions:
+            return _FlatSearchTree(g_scores, parents, operator_costs, position, nr_expanded_states)
+
+        g = g_scores[position]
+        for link in range(offsets[position], offsets[position + 1]):
+            successor = targets[link]
+            if successor < 0:
+                continue
+            operator_cost = costs[link]
+            successor_g = operator_cost + g
+            if not successor_g < g_scores[successor]:
+                continue
+            if heuristic_values is None:
+                successor_priority = successor_g
+            else:
+                h = heuristic_values[successor]
+                if h < 0:
+                    heuristic_values[successor] = h = estimate_position(successor)
+                successor_priority = (1 - w) * successor_g + w * h
+                if not successor_priority < priorities[successor]:
+                    continue  # as in `AStar` (with w=1, a state is never improved)
+            g_scores[successor] = successor_g
+            parents[successor] = position
+            operator_costs[successor] = operator_cost
+            priorities[successor] = successor_priority
+            closed[successor] = 0
+            heappush(open_queue, (successor_priority, successor))
+
+    return _FlatSearchTree(g_scores, parents, operator_costs, None, nr_expanded_states)
+
+
+def flat_dijkstra(adjacency: FlatAdjacency, nr_states: int, source_positions: Iterable[int],
+                  max_cost: float = inf) -> List[float]:
+    """
+    Returns the shortest distances from the nearest of the given sources to all the states
+     (`inf` for unreachable states, or for states farther than `max_cost`).
+    """
+    search_tree = _flat_best_first_search(adjacency, nr_states, source_positions, max_priority=max_cost)
+    if max_cost == inf:
+        return search_tree.g_scores
+    return [g if g <= max_cost else inf for g in search_tree.g_scores]
+
+
+def flat_shortest_path_tree(adjacency: FlatAdjacency, nr_states: int, source_positions: Iterable[int],
+                            max_cost: float = inf) -> Tuple[List[float], List[int]]:
+    """
+    Same as `flat_dijkstra()`, but also returns the parent of each state in the shortest paths
+     tree (-1 for the sources, and for the states that were not reached).
+    """
+    search_tree = _flat_best_first_search(adjacency, nr_states, source_positions, max_priority=max_cost)
+    if max_cost == inf:
+        return search_tree.g_scores, search_tree.parents
+    return ([g if g <= max_cost else inf for g in search_tree.g_scores],
+            [parent if g <= max_cost else -1 for g, parent in zip(search_tree.g_scores, search_tree.parents)])
+
+
+class FlatBestFirstSearch(GraphProblemSolver):
+    """
+    Base class of the best first search solvers for `FlatGraphProblem`s.
+    The search keeps g-scores, parent positions and a closed bitmap in flat arrays indexed
+     by the state position, and builds the `SearchNode`s only for the path found.
+    The results are the same as of the respective `BestFirstSearch` solvers (the same cost;
+     the path itself might differ when there are several optimal paths).
+    """
+
+    solver_name: str = 'FlatBestFirstSearch'
+
+    def solve_problem(self, problem: GraphProblem) -> SearchResult:
+        assert isinstance(problem, FlatGraphProblem)
+        with Timer(print_title=False) as timer:
+            search_tree = _flat_best_first_search(
+                problem.flat_adjacency(), problem.flat_nr_states(), [problem.flat_initial_position()],
+                problem.flat_goal_positions(), *self._heuristic_args(problem))
+            final_search_node = None
+            if search_tree.goal_position is not None:
+                final_search_node = self._make_path_nodes(problem, search_tree)
+
+        return SearchResult(
+            solver=self,
+            problem=problem,
+            final_search_node=final_search_node,
+            nr_expanded_states=search_tree.nr_expanded_states,
+            solving_time=timer.elapsed
+        )
+
+    def _heuristic_args(self, problem: GraphProblem) -> tuple:
+        """The (estimate_position, heuristic_weight) arguments of the search. None for uniform cost."""
+        return ()
+
+    @staticmethod
+    def _make_path_nodes(problem: FlatGraphProblem, search_tree: _FlatSearchTree) -> SearchNode:
+        """Builds the chain of `SearchNode`s of the path found, and returns the last one."""
+        path_positions = []
+        position = search_tree.goal_position
+        while position >= 0:
+            path_positions.append(position)
+            position = search_tree.parents[position]
+        path_positions.reverse()
+
+        search_node = SearchNode(problem.state_of_position(path_positions[0]))
+        for position in path_positions[1:]:
+            search_node = SearchNode(problem.state_of_position(position), search_node,
+                                     search_tree.operator_costs[position])
+        return search_node
+
+
+class FlatUniformCost(FlatBestFirstSearch):
+    """Uniform cost search (see `UniformCost`) for `FlatGraphProblem`s."""
+
+    solver_name = 'FlatUniformCost'
+
+
+class FlatAStar(FlatBestFirstSearch):
+    """
+    Weighted A* (see `AStar`) for `FlatGraphProblem`s.
+    The heuristic is evaluated at most once per state. If the heuristic has an
+     `estimate_position(position)` method it is used; otherwise `estimate()` is
+     called with `problem.state_of_position(position)`.
+    """
+
+    solver_name = 'FlatA*'
+
+    def __init__(self, heuristic_function_type: HeuristicFunctionType, heuristic_weight: float = 0.5):
+        self.heuristic_function_type = heuristic_function_type
+        self.heuristic_weight = heuristic_weight
+        self.solver_name += ' (h={heuristic_name}, w={heuristic_weight:.3f})'.format(
+            heuristic_name=heuristic_function_type.heuristic_name,
+            heuristic_weight=self.heuristic_weight)
+
+    def _heuristic_args(self, problem: GraphProblem) -> tuple:
+        heuristic_function = self.heuristic_function_type(problem)
+        estimate_position = getattr(heuristic_function, 'estimate_position', None)
+        if estimate_position is None:
+            def estimate_position(position: int) -> float:
+                return heuristic_function.estimate(problem.state_of_position(position))
+        return estimate_position, self.heuristic_weight
@@ -1,5 +1,5 @@
 import abc
-from typing import Iterator, Tuple, Optional, Type, NamedTuple, Union, Callable
+from typing import Iterator, Tuple, Optional, Type, NamedTuple, Union, Callable, List, Sequence
 
 
 """
@@ -8,7 +8,7 @@ imported when writing (from another file):
 >>> from framework.graph_search.graph_problem_interface import *
 """
 __all__ = ['GraphProblemState', 'GraphProblem', 'GraphProblemStatesPath', 'SearchNode',
-           'SearchResult', 'GraphProblemSolver',
+           'SearchStats', 'SearchResult', 'GraphProblemSolver',
            'HeuristicFunction', 'HeuristicFunctionType', 'NullHeuristic']
 
 
@@ -113,8 +113,11 @@ class SearchNode:
     A node basically has a state that it represents, and potentially a parent node.
     A node may also have its cost, the cost of the operator performed to reach this node,
     and the f-score of this node (expanding_priority) when needed.
+    Searches create many nodes, so the fields are stored in slots (no per-node `__dict__`).
     """
 
+    __slots__ = ('state', 'parent_search_node', 'operator_cost', 'cost', 'expanding_priority')
+
     def __init__(self, state: GraphProblemState,
                  parent_search_node: Optional['SearchNode'] = None,
                  operator_cost: float = 0,
@@ -122,13 +125,9 @@ class SearchNode:
         self.state: GraphProblemState = state
         self.parent_search_node: SearchNode = parent_search_node
         self.operator_cost: float = operator_cost
-        self.cost: Optional[float] = None
+        self.cost: float = operator_cost if parent_search_node is None else operator_cost + parent_search_node.cost
         self.expanding_priority: Optional[float] = expanding_priority
 
-        self.cost = operator_cost
-        if self.parent_search_node is not None:
-            self.cost += self.parent_search_node.cost
-
     def traverse_back_to_root(self) -> Iterator['SearchNode']:
         """
         This is an iterator. It iterates over the nodes in the path
@@ -149,6 +148,63 @@ class SearchNode:
         path.reverse()
         return GraphProblemStatesPath(path)
 
+    @staticmethod
+    def copy_path(search_node) -> 'SearchNode':
+        """
+        Returns a copy of the given node (a `SearchNode` or any object with its fields, like
+         `ArenaSearchNode`), linked to copies of the nodes in its path to the root only.
+        """
+        path = list(search_node.traverse_back_to_root())
+        path.reverse()
+        copied_node = None
+        for node in path:
+            copied_node = SearchNode(node.state, copied_node, node.operator_cost, node.expanding_priority)
+        return copied_node
+
+
+class SearchStats:
+    """
+    Counters of a search, collected by `BestFirstSearch` when `collect_stats` is set (see `SearchResult.stats`).
+    The time of the search is split into the time spent by the heuristic, the time spent on
+     the `open` queue and the `close` set, and the rest (`expansion_time`): generating the
+     successors, creating their nodes and the goal tests.
+    """
+
+    __slots__ = ('nr_generated_nodes', 'nr_duplicates_rejected', 'nr_reopened_nodes',
+                 'max_open_size', 'max_close_size', 'nr_queue_pushes', 'nr_queue_pops', 'nr_queue_removals',
+                 'nr_heuristic_calls', 'nr_heuristic_cache_hits', 'nr_heuristic_cache_misses',
+                 'nr_heuristic_cache_evictions', 'heuristic_time', 'queue_time', 'expansion_time')
+
+    def __init__(self):
+        self.nr_generated_nodes: int = 0  # the successor nodes created
+        self.nr_duplicates_rejected: int = 0  # successor nodes not opened (their state had a node as good)
+        self.nr_reopened_nodes: int = 0  # closed nodes replaced by a better node, to be expanded again
+        self.max_open_size: int = 0
+        self.max_close_size: int = 0
+        self.nr_queue_pushes: int = 0  # the operations on the priority queue behind `open`
+        self.nr_queue_pops: int = 0
+        self.nr_queue_removals: int = 0  # nodes removed not from the top (to be replaced by a better node, etc.)
+        self.nr_heuristic_calls: int = 0
+        self.nr_heuristic_cache_hits: int = 0  # of a `CachedHeuristic` (all stay 0 for other heuristics)
+        self.nr_heuristic_cache_misses: int = 0
+        self.nr_heuristic_cache_evictions: int = 0
+        self.heuristic_time: float = 0.0  # in seconds
+        self.queue_time: float = 0.0
+        self.expansion_time: float = 0.0
+
+    def __str__(self):
+        res_str = '#gen: {}   #dup: {}   #reopen: {}   max|open|: {}   max|close|: {}   ' \
+                  'queue push/pop/remove: {}/{}/{}   #h: {}'.format(
+                    self.nr_generated_nodes, self.nr_duplicates_rejected, self.nr_reopened_nodes,
+                    self.max_open_size, self.max_close_size,
+                    self.nr_queue_pushes, self.nr_queue_pops, self.nr_queue_removals,
+                    self.nr_heuristic_calls)
+        if self.nr_heuristic_cache_hits or self.nr_heuristic_cache_misses:
+            res_str += '   h cache hit/miss/evict: {}/{}/{}'.format(
+                self.nr_heuristic_cache_hits, self.nr_heuristic_cache_misses, self.nr_heuristic_cache_evictions)
+        return res_str + '   time h/queue/expand: {:.2f}/{:.2f}/{:.2f}'.format(
+            self.heuristic_time, self.queue_time, self.expansion_time)
+
 
 class SearchResult(NamedTuple):
     """
@@ -166,6 +222,8 @@ class SearchResult(NamedTuple):
     nr_expanded_states: int
     """The time (in seconds) took to solve."""
     solving_time: float
+    """The counters of the search, if the solver collects them (see `SearchStats`). Otherwise `None`."""
+    stats: Optional[SearchStats] = None
 
     def __str__(self):
         """
@@ -220,6 +278,15 @@ class GraphProblemSolver(abc.ABC):
     def solve_problem(self, problem: GraphProblem) -> SearchResult:
         ...
 
+    def solve_many(self, problems: Sequence[GraphProblem], processes: Optional[int] = 1,
+                   seed: int = 0) -> List[SearchResult]:
+        """
+        Solves each of the given problems, and returns the results in the same order.
+        The problems can be solved by a pool of worker processes (see `solve_matrix()`).
+        """
+        from .batch_solve import solve_matrix
+        return solve_matrix([self], problems, processes, seed)[0]
+
 
 class HeuristicFunction(abc.ABC):
     """
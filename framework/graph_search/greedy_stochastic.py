@@ -1,14 +1,23 @@
 from .graph_problem_interface import *
 from .best_first_search import BestFirstSearch
-from typing import Optional
+from .anytime_search import AnytimeSearchResult
+from .cached_heuristic import CachedHeuristicFunction
+from .utils.indexed_heap import IndexedHeap
+from .utils.open_lists import OpenListType
+from math import inf
+from time import perf_counter
+from typing import Iterator, Optional
 import numpy as np
 
 
 class GreedyStochastic(BestFirstSearch):
     def __init__(self, heuristic_function_type: HeuristicFunctionType,
-                 T_init: float = 1.0, N: int = 5, T_scale_factor: float = 0.95):
+                 T_init: float = 1.0, N: int = 5, T_scale_factor: float = 0.95,
+                 use_node_arena: bool = False, open_list_type: OpenListType = IndexedHeap,
+                 collect_stats: bool = False):
         # GreedyStochastic is a graph search algorithm. Hence, we use close set.
-        super(GreedyStochastic, self).__init__(use_close=True)
+        super(GreedyStochastic, self).__init__(use_close=True, use_node_arena=use_node_arena,
+                                               open_list_type=open_list_type, collect_stats=collect_stats)
         self.heuristic_function_type = heuristic_function_type
         self.T = T_init
         self.N = N
@@ -42,53 +51,29 @@ class GreedyStochastic(BestFirstSearch):
         Extracts the next node to expand from the open queue,
          using the stochastic method to choose out of the N
          best items from open.
-        TODO: implement this method!
-        Use `np.random.choice(...)` whenever you need to randomly choose
-         an item from an array of items given a probabilities array `p`.
-        You can read the documentation of `np.random.choice(...)` and
-         see usage examples by searching it in Google.
-        Notice: You might want to pop min(N, len(open) items from the
-                `open` priority queue, and then choose an item out
-                of these popped items. The other items have to be
-                pushed again into that queue.
+        The N best nodes are only peeked at, and only the chosen one is extracted from `open`.
+        The heuristic value of each of them is its expanding priority (`GreedyStochastic` is
+         greedy), so the heuristic is not computed again, and the probabilities of the N nodes
+         are computed in one go (`np.random.choice(...)` chooses by them).
         """
 
         if self.open.is_empty():
             return None
 
-        size_to_extract = min(self.N, len(self.open))
-        # check if size of open is smaller than N.
-
-        h = self.heuristic_function.estimate
-
-        # put all min(N,sizeof(open)) nodes in a list called x (just like in the example)
-        x = []
-        for i in range(size_to_extract):
-            node = self.open.pop_next_node()
-            x.append(node)
-        min_node = x[0]
+        # the min(N, len(open)) best nodes, the best one first.
+        x = self.open.peek_next_nodes(self.N)
+        h = np.array([x_node.expanding_priority for x_node in x], dtype=np.float64)
 
         # we might have reached out goal and the heuristic function will return 0
-        if h(min_node.state) == 0:
-            node_to_expand = min_node
+        if h[0] == 0:
+            node_to_expand = x[0]
         else:
-            # calc the probability list for each heuristic value.
-            p = []
-            sum = 0
-            for x_node in x:
-                sum += ((h(x_node.state) / h(min_node.state)) ** ((-1) / self.T))
+            # the probability of each node, by its heuristic value relative to the best one.
+            p = (h / h[0]) ** (-1 / self.T)
+            p /= p.sum()
+            node_to_expand = x[np.random.choice(len(x), p=p)]
 
-            for x_node in x:
-                probability = ((h(x_node.state) / h(min_node.state)) ** ((-1) / self.T)) / sum
-                p.append(probability)
-
-            # choose randomly
-            node_to_expand = np.random.choice(x, size=None, p=p)
-
-        # pushing un-chosen nodes back to the open list
-        for x_node in x:
-            if x_node.state != node_to_expand.state:
-                self.open.push_node(x_node)
+        self.open.extract_node(node_to_expand)
 
         # put chosen node in close
         if self.use_close:
@@ -97,3 +82,141 @@ class GreedyStochastic(BestFirstSearch):
         # decrese T by 0.95
         self.T *= self.T_scale_factor
         return node_to_expand
+
+
+class AnytimeGreedyStochastic(GreedyStochastic):
+    """
+    Restarts `GreedyStochastic` (each time from the initial temperature) `max_nr_restarts` times,
+     or until `time_limit` seconds have passed, and keeps the best solution found (the incumbent).
+     Once the time is up, the running restart is stopped too (unless there is no incumbent yet).
+    Branch and bound: once there is an incumbent, a restart does not open (nor computes the
+     heuristic of) nodes whose cost is not lower than the cost of the incumbent. If an admissible
+     `bound_heuristic_type` is given, it also does not open nodes whose cost plus that lower
+     bound of their remaining cost is not lower than the cost of the incumbent.
+    If `max_restart_expansions_ratio` is given, a pruned restart stops once it has expanded that
+     many times the number of states expanded by the first restart (which is not pruned): a restart
+     that cannot find a better solution otherwise searches the states below the incumbent until
+     none is left. By default the restarts are not limited.
+    The restarts share a single heuristic function, wrapped by a `CachedHeuristicFunction` of
+     `heuristic_cache_entries` entries, so the heuristic is created once and each state is
+     estimated once (rather than once per restart).
+    """
+
+    def __init__(self, heuristic_function_type: HeuristicFunctionType,
+                 bound_heuristic_type: Optional[HeuristicFunctionType] = None,
+                 max_nr_restarts: int = 100, time_limit: Optional[float] = None,
+                 max_restart_expansions_ratio: Optional[float] = None,
+                 heuristic_cache_entries: Optional[int] = 100000,
+                 T_init: float = 1.0, N: int = 5, T_scale_factor: float = 0.95,
+                 use_node_arena: bool = False, open_list_type: OpenListType = IndexedHeap,
+                 collect_stats: bool = False):
+        assert max_nr_restarts >= 1
+        assert max_restart_expansions_ratio is None or max_restart_expansions_ratio > 0
+        super(AnytimeGreedyStochastic, self).__init__(heuristic_function_type, T_init, N, T_scale_factor,
+                                                      use_node_arena, open_list_type, collect_stats)
+        self.T_init = T_init
+        self.bound_heuristic_type = bound_heuristic_type
+        self.max_nr_restarts = max_nr_restarts
+        self.time_limit = time_limit
+        self.max_restart_expansions_ratio = max_restart_expansions_ratio
+        self.heuristic_cache_entries = heuristic_cache_entries
+        self.solver_name = 'AnytimeGreedyStochastic (h={heuristic_name})'.format(
+            heuristic_name=heuristic_function_type.heuristic_name)
+        self._shared_heuristic: Optional[CachedHeuristicFunction] = None
+        self._bound_heuristic: Optional[HeuristicFunction] = None
+        self._incumbent_cost = inf
+        self._deadline = inf
+        self._max_restart_expansions = inf
+        self._nr_restart_expansions = 0
+
+    def solve_problem(self, problem: GraphProblem) -> SearchResult:
+        """Returns the incumbent after the last restart (see `solve_problem_anytime()`)."""
+        anytime_result = None
+        for anytime_result in self.solve_problem_anytime(problem):
+            pass
+        return anytime_result.search_result
+
+    def solve_problem_anytime(self, problem: GraphProblem) -> Iterator[AnytimeSearchResult]:
+        """
+        Yields the incumbent after each restart (the same one as before, if the restart found no
+         better solution, or a result without a final search node while there is no incumbent).
+        The `nr_expanded_states` and `solving_time` of the results are counted from the first
+         restart. Their `stats` (if collected) are of the last restart only, except for the
+         counters of the heuristic cache, which is shared by the restarts.
+        The `suboptimality_bound` is the cost of the incumbent divided by the lower bound of the
+         initial state by `bound_heuristic_type` (`inf` without it, while there is no incumbent,
+         or if that lower bound is 0).
+        """
+        start_time = perf_counter()
+        self._shared_heuristic = CachedHeuristicFunction(self.heuristic_function_type(problem),
+                                                         self.heuristic_cache_entries)
+        if self.bound_heuristic_type is None:
+            self._bound_heuristic = None
+        elif self.bound_heuristic_type is self.heuristic_function_type:
+            self._bound_heuristic = self._shared_heuristic
+        else:
+            self._bound_heuristic = self.bound_heuristic_type(problem)
+        initial_lower_bound = 0.0 if self._bound_heuristic is None \
+            else self._bound_heuristic.estimate(problem.initial_state)
+        self._incumbent_cost = inf
+        self._deadline = inf if self.time_limit is None else start_time + self.time_limit
+        self._max_restart_expansions = inf
+        incumbent = None
+        nr_expanded_states = 0
+        try:
+            for _ in range(self.max_nr_restarts):
+                self.T = self.T_init
+                self._nr_restart_expansions = 0
+                result = super(AnytimeGreedyStochastic, self).solve_problem(problem)
+                nr_expanded_states += result.nr_expanded_states
+                if incumbent is None and self.max_restart_expansions_ratio is not None:
+                    self._max_restart_expansions = self.max_restart_expansions_ratio * result.nr_expanded_states
+                if result.final_search_node is not None and result.final_search_node.cost < self._incumbent_cost:
+                    incumbent = result.final_search_node
+                    self._incumbent_cost = incumbent.cost
+                yield AnytimeSearchResult(
+                    search_result=SearchResult(solver=self, problem=problem, final_search_node=incumbent,
+                                               nr_expanded_states=nr_expanded_states,
+                                               solving_time=perf_counter() - start_time, stats=result.stats),
+                    heuristic_weight=1.0,
+                    suboptimality_bound=self._incumbent_cost / initial_lower_bound
+                    if initial_lower_bound > 0 else inf)
+                if perf_counter() >= self._deadline:
+                    break
+        finally:
+            self._shared_heuristic = None
+            self._bound_heuristic = None
+            self._incumbent_cost = inf
+            self._deadline = inf
+            self._max_restart_expansions = inf
+
+    def _init_solver(self, problem: GraphProblem):
+        super(GreedyStochastic, self)._init_solver(problem)
+        if self._shared_heuristic is not None:
+            self.heuristic_function = self._shared_heuristic
+        else:  # a restart run directly by `GreedyStochastic.solve_problem()`
+            self.heuristic_function = self.heuristic_function_type(problem)
+
+    def _calc_node_expanding_priority(self, search_node: SearchNode) -> float:
+        if search_node.cost >= self._incumbent_cost:
+            return inf  # it is not opened anyway
+        return super(AnytimeGreedyStochastic, self)._calc_node_expanding_priority(search_node)
+
+    def _extract_next_search_node_to_expand(self) -> Optional[SearchNode]:
+        if self._incumbent_cost < inf and (perf_counter() >= self._deadline or
+                                           self._nr_restart_expansions >= self._max_restart_expansions):
+            return None  # out of time, or the restart is too long: stop it, and keep the incumbent
+        self._nr_restart_expansions += 1
+        return super(AnytimeGreedyStochastic, self)._extract_next_search_node_to_expand()
+
+    def _open_successor_node(self, problem: GraphProblem, successor_node: SearchNode):
+        if successor_node.cost >= self._incumbent_cost:
+            return  # it cannot lead to a better solution than the incumbent
+        if self._bound_heuristic is not None and self._incumbent_cost < inf:
+            if self._bound_heuristic is self._shared_heuristic:
+                lower_bound = successor_node.expanding_priority  # the greedy heuristic, already computed
+            else:
+                lower_bound = self._bound_heuristic.estimate(successor_node.state)
+            if successor_node.cost + lower_bound >= self._incumbent_cost:
+                return
+        super(AnytimeGreedyStochastic, self)._open_successor_node(problem, successor_node)
@@ -0,0 +1,323 @@
+from .graph_problem_interface import *
+from .utils.indexed_heap import IndexedHeap
+from .utils.timer import Timer
+
+from math import inf
+from typing import Dict, Iterator, List, Optional, Tuple
+
+__all__ = ['IDAStar', 'SMAStar']
+
+
+class IDAStar(GraphProblemSolver):
+    """
+    Iterative Deepening A*: a sequence of depth first searches, each bounded by an f-score
+     threshold (with the f-score of `AStar`: `(1-w)*g + w*h`). The first threshold is the
+     f-score of the initial state, and each next one is the lowest f-score that exceeded the
+     previous threshold. With an admissible heuristic and w=0.5, the solution is optimal.
+    The memory is bounded by `max_nr_nodes`: the depth first search keeps only the current
+     path (states on it are not visited again), and a transposition table of at most
+     `max_nr_nodes` states. The table keeps the heuristic value of each state (so it is
+     computed once, rather than once per iteration), and the lowest cost it was reached with
+     in the current iteration (a state reached again with no lower cost is not searched again).
+     Paths longer than `max_nr_nodes` are not searched.
+    Since the f-scores are floats, there might be many iterations (the states expanded in
+     each of them are counted in `nr_expanded_states`).
+    """
+
+    solver_name = 'IDA*'
+
+    def __init__(self, heuristic_function_type: HeuristicFunctionType, heuristic_weight: float = 0.5,
+                 max_nr_nodes: int = 1000000):
+        self.heuristic_function_type = heuristic_function_type
+        self.heuristic_weight = heuristic_weight
+        self.max_nr_nodes = max_nr_nodes
+        self.solver_name += ' (h={heuristic_name}, w={heuristic_weight:.3f})'.format(
+            heuristic_name=heuristic_function_type.heuristic_name,
+            heuristic_weight=self.heuristic_weight)
+
+    def solve_problem(self, problem: GraphProblem) -> SearchResult:
+        with Timer(print_title=False) as timer:
+            heuristic_function = self.heuristic_function_type(problem)
+            # The transposition table: state -> [heuristic value, lowest cost, iteration of the lowest cost].
+            table: Dict[GraphProblemState, list] = {}
+            root = SearchNode(problem.initial_state)
+            root.expanding_priority = threshold = self.heuristic_weight * heuristic_function.estimate(root.state)
+            final_search_node = None
+            nr_expanded_states = 0
+            iteration = 0
+            while final_search_node is None and threshold < inf:
+                final_search_node, threshold, nr_iteration_expanded_states = \
+                    self._search_contour(problem, heuristic_function, table, iteration, root, threshold)
+                nr_expanded_states += nr_iteration_expanded_states
+                iteration += 1
+
+        return SearchResult(
+            solver=self,
+            problem=problem,
+            final_search_node=final_search_node,
+            nr_expanded_states=nr_expanded_states,
+            solving_time=timer.elapsed
+        )
+
+    def _search_contour(self, problem: GraphProblem, heuristic_function: HeuristicFunction,
+                        table: Dict[GraphProblemState, list], iteration: int, root: SearchNode,
+                        threshold: float) -> Tuple[Optional[SearchNode], float, int]:
+        """
+        A depth first search of the nodes whose f-score is at most `threshold` (using an explicit
+         stack of successor iterators, rather than recursion).
+        Returns (the goal node found or None, the next threshold, the number of expanded states).
+        """
+        if problem.is_goal(root.state):
+            return root, threshold, 1
+        w = self.heuristic_weight
+        next_threshold = inf
+        nr_expanded_states = 1
+        path_states = {root.state}
+        stack: List[Tuple[SearchNode, Iterator[Tuple[GraphProblemState, float]]]] = \
+            [(root, iter(problem.expand_state_with_costs(root.state)))]
+        while stack:
+            search_node, successors = stack[-1]
+            for successor_state, operator_cost in successors:
+                if successor_state in path_states:
+                    continue
+                successor_node = SearchNode(successor_state, search_node, operator_cost)
+                entry = table.get(successor_state)
+                if entry is None:
+                    entry = [heuristic_function.estimate(successor_state), inf, iteration]
+                    if len(table) < self.max_nr_nodes:
+                        table[successor_state] = entry
+                elif entry[2] != iteration:
+                    entry[1], entry[2] = inf, iteration
+                if entry[1] <= successor_node.cost:
+                    continue
+                successor_node.expanding_priority = (1 - w) * successor_node.cost + w * entry[0]
+                if successor_node.expanding_priority > threshold:
+                    next_threshold = min(next_threshold, successor_node.expanding_priority)
+                    continue
+                entry[1] = successor_node.cost
+                nr_expanded_states += 1
+                if problem.is_goal(successor_state):
+                    return successor_node, threshold, nr_expanded_states
+                if len(stack) < self.max_nr_nodes:
+                    stack.append((successor_node, iter(problem.expand_state_with_costs(successor_state))))
+                    path_states.add(successor_state)
+                    break
+            else:
+                stack.pop()
+                path_states.discard(search_node.state)
+        return None, next_threshold, nr_expanded_states
+
+
+class _SMANode:
+    """A node of the search tree kept by `SMAStar`."""
+
+    __slots__ = ('state', 'parent', 'operator_cost', 'cost', 'f', 'depth', 'children', 'forgotten', 'forgotten_f')
+
+    def __init__(self, state: GraphProblemState, parent: Optional['_SMANode'], operator_cost: float, f: float):
+        self.state = state
+        self.parent = parent
+        self.operator_cost = operator_cost
+        self.cost = operator_cost if parent is None else parent.cost + operator_cost
+        self.f = f
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.children: Dict[GraphProblemState, '_SMANode'] = {}
+        # The backed-up f-scores of the children that were dropped from the memory (`inf` for
+        #  dead ends, that are not generated again), and the lowest of them.
+        self.forgotten: Dict[GraphProblemState, float] = {}
+        self.forgotten_f = inf
+
+    def has_ancestor_state(self, state: GraphProblemState) -> bool:
+        node = self
+        while node is not None:
+            if node.state == state:
+                return True
+            node = node.parent
+        return False
+
+
+class _SMAMemory:
+    """The nodes of the search tree that `SMAStar` keeps in the memory."""
+
+    def __init__(self):
+        # `open_queue` holds the nodes to expand: the leaves that were not expanded, by their
+        #  f-score, and the expanded nodes that have dropped children, by the f-score of these children.
+        # `leaves` holds the nodes without children in the memory, the worst one first.
+        self.open_queue, self.leaves = IndexedHeap(), IndexedHeap()
+        # The cheapest node of each state in the memory, to prune the dominated duplicates.
+        self.nodes_by_state: Dict[GraphProblemState, _SMANode] = {}
+        self.nr_nodes = 0
+
+    def add(self, node: _SMANode):
+        self.nr_nodes += 1
+        self.open_queue.push(node, (node.f, -node.depth))
+        self.leaves.push(node, (-node.f, node.depth))
+        cheapest = self.nodes_by_state.get(node.state)
+        if cheapest is None or node.cost < cheapest.cost:
+            self.nodes_by_state[node.state] = node
+
+    def is_dominated(self, node: _SMANode) -> bool:
+        """Whether a node in the memory reaches the state of `node` with no higher cost, and no deeper."""
+        cheapest = self.nodes_by_state.get(node.state)
+        return cheapest is not None and cheapest.cost <= node.cost and cheapest.depth <= node.depth
+
+    def drop(self, node: _SMANode, expanded_node: Optional[_SMANode]):
+        """
+        Drops the given node (that has no children in the memory), and makes its parent remember
+         its f-score. A parent left without children becomes a leaf, unless it is the node being expanded.
+        """
+        self.nr_nodes -= 1
+        if node in self.leaves:
+            self.leaves.remove(node)
+        if node in self.open_queue:
+            self.open_queue.remove(node)
+        if self.nodes_by_state.get(node.state) is node:
+            del self.nodes_by_state[node.state]
+        parent = node.parent
+        del parent.children[node.state]
+        parent.forgotten[node.state] = node.f
+        if node.f < parent.forgotten_f:
+            parent.forgotten_f = node.f
+            self.open_queue.set_priority(parent, (parent.forgotten_f, -parent.depth))
+        if not parent.children and parent is not expanded_node:
+            parent.f = parent.forgotten_f
+            self.leaves.set_priority(parent, (-parent.f, parent.depth))
+
+    def back_up(self, node: _SMANode):
+        """
+        Backs up the f-scores from the given expanded node to the root: the f-score of an expanded
+         node is the lowest f-score of its children (in the memory or dropped).
+        A node whose f-score becomes `inf` is a dead end: it is dropped right away, and its parent
+         remembers it as such, so it is not generated again.
+        """
+        while node is not None:
+            f = min(min((child.f for child in node.children.values()), default=inf), node.forgotten_f)
+            if f == inf and node.parent is not None:
+                node.f = f
+                parent = node.parent
+                self.drop(node, expanded_node=None)
+                node = parent
+                continue
+            if f == node.f:
+                return
+            node.f = f
+            if node in self.leaves:
+                self.leaves.set_priority(node, (-f, node.depth))
+            node = node.parent
+
+
+class SMAStar(GraphProblemSolver):
+    """
+    Simplified Memory-bounded A* (with the f-score of `AStar`): an A* over a search tree of at
+     most `max_nr_nodes` nodes. When the memory is full, the worst leaf (the highest f-score,
+     and then the shallowest) is dropped, and its parent remembers the lowest f-score of its
+     dropped children (`forgotten_f`), so it is expanded again (generating the dropped children
+     only) once that is the lowest f-score. The f-scores never decrease along a path (pathmax),
+     a regenerated child gets back the f-score it had when it was dropped, and after each
+     expansion the f-scores are backed up the tree (the f-score of an expanded node is the
+     lowest f-score of its children).
+    A node that is not a goal and whose children cannot fit in the memory (its path has
+     `max_nr_nodes` nodes) gets an f-score of `inf`, as does a node whose children all have it.
+     Such dead ends are dropped from the memory as soon as they are found, and are not generated
+     again by their parent. Once the lowest f-score in `open` is `inf`, the search fails, so it
+     always terminates. But when the memory cannot hold the states reachable from the initial
+     state, many paths to the same states might be searched before that.
+    With an admissible heuristic and w=0.5, the solution is optimal among the solutions whose
+     path fits in the memory (at most `max_nr_nodes` nodes). States on the path to a node are
+     not generated again below it, and neither are states that a node in the memory reaches
+     with no higher cost and no deeper. Of several operators from a node to the same state,
+     only the cheapest one is used.
+    `nr_expanded_states` counts the re-expansions as well.
+    """
+
+    solver_name = 'SMA*'
+
+    def __init__(self, heuristic_function_type: HeuristicFunctionType, heuristic_weight: float = 0.5,
+                 max_nr_nodes: int = 1000000):
+        assert max_nr_nodes >= 2
+        self.heuristic_function_type = heuristic_function_type
+        self.heuristic_weight = heuristic_weight
+        self.max_nr_nodes = max_nr_nodes
+        self.solver_name += ' (h={heuristic_name}, w={heuristic_weight:.3f})'.format(
+            heuristic_name=heuristic_function_type.heuristic_name,
+            heuristic_weight=self.heuristic_weight)
+
+    def solve_problem(self, problem: GraphProblem) -> SearchResult:
+        with Timer(print_title=False) as timer:
+            heuristic_function = self.heuristic_function_type(problem)
+            w = self.heuristic_weight
+            root = _SMANode(problem.initial_state, None, 0.0, w * heuristic_function.estimate(problem.initial_state))
+            memory = _SMAMemory()
+            open_queue, leaves = memory.open_queue, memory.leaves
+            memory.add(root)
+            final_node = None
+            nr_expanded_states = 0
+
+            while not open_queue.is_empty():
+                (node, (node_f, _)) = open_queue.pop()
+                if node_f == inf:
+                    break
+                nr_expanded_states += 1
+                if problem.is_goal(node.state):
+                    final_node = node
+                    break
+
+                # While it is expanded, the node is not a candidate to be dropped.
+                if node in leaves:
+                    leaves.remove(node)
+                forgotten, node.forgotten = node.forgotten, {}
+                successors: Dict[GraphProblemState, float] = {}
+                for successor_state, operator_cost in problem.expand_state_with_costs(node.state):
+                    if operator_cost < successors.get(successor_state, inf):
+                        successors[successor_state] = operator_cost
+                for successor_state, operator_cost in successors.items():
+                    if successor_state in node.children or node.has_ancestor_state(successor_state):
+                        continue
+                    child = _SMANode(successor_state, node, operator_cost, 0.0)
+                    if memory.is_dominated(child):
+                        continue
+                    if child.depth >= self.max_nr_nodes - 1 and not problem.is_goal(successor_state):
+                        child.f = inf  # its children cannot fit in the memory
+                    else:
+                        child.f = max(node_f, forgotten.get(successor_state, 0.0),
+                                      (1 - w) * child.cost + w * heuristic_function.estimate(successor_state))
+                    if child.f == inf:
+                        node.forgotten[successor_state] = inf  # a dead end
+                        continue
+                    if memory.nr_nodes >= self.max_nr_nodes:
+                        if leaves.is_empty():
+                            node.forgotten[successor_state] = inf  # the memory holds only the path to `node`
+                            continue
+                        worst_leaf, _ = leaves.peek()
+                        if child.f > worst_leaf.f:
+                            node.forgotten[successor_state] = child.f
+                            continue
+                        memory.drop(worst_leaf, expanded_node=node)
+                    node.children[successor_state] = child
+                    memory.add(child)
+                node.forgotten_f = min(node.forgotten.values(), default=inf)
+
+                if not node.children:
+                    leaves.push(node, (-node.f, node.depth))
+                if node.forgotten_f < inf:
+                    open_queue.set_priority(node, (node.forgotten_f, -node.depth))
+                elif node in open_queue:
+                    open_queue.remove(node)
+                memory.back_up(node)
+
+            final_search_node = None
+            if final_node is not None:
+                path = []
+                while final_node is not None:
+                    path.append(final_node)
+                    final_node = final_node.parent
+                for sma_node in reversed(path):
+                    final_search_node = SearchNode(sma_node.state, final_search_node, sma_node.operator_cost,
+                                                   sma_node.f)
+
+        return SearchResult(
+            solver=self,
+            problem=problem,
+            final_search_node=final_search_node,
+            nr_expanded_states=nr_expanded_states,
+            solving_time=timer.elapsed
+        )
@@ -0,0 +1,147 @@
+from .graph_problem_interface import *
+
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+__all__ = ['SearchNodesArena', 'ArenaSearchNode', 'ArenaSearchNodesCollection']
+
+
+class SearchNodesArena:
+    """
+    Stores the search nodes created during a single search in flat arrays, rather than
+     as separate objects: the state of each node, the index of its parent node (a 4-byte
+     integer instead of a reference; -1 for the root), its operator cost, cost and
+     expanding priority (8-byte floats instead of float objects).
+    The nodes are accessed through `ArenaSearchNode` handles, which provide the interface of `SearchNode`.
+    A node of the arena takes ~40 bytes. Handles are kept only for the nodes in `open`, while
+     the `close` collection (`ArenaSearchNodesCollection`) keeps node indices, so a closed node
+     takes ~70 bytes, compared to ~120 bytes of a `SearchNode` object with its float fields
+     (see `experiments/search_node_benchmark.py`).
+    The arena is used by `BestFirstSearch` when created with `use_node_arena=True`.
+    """
+
+    def __init__(self):
+        self.states: List[GraphProblemState] = []
+        self.parents = array('i')
+        self.operator_costs = array('d')
+        self.costs = array('d')
+        self.expanding_priorities = array('d')
+
+    def __len__(self):
+        return len(self.states)
+
+    def make_node(self, state: GraphProblemState, parent_search_node: Optional['ArenaSearchNode'] = None,
+                  operator_cost: float = 0) -> 'ArenaSearchNode':
+        """Same as `SearchNode(state, parent_search_node, operator_cost)`, allocated in this arena."""
+        if parent_search_node is None:
+            parent_index, cost = -1, operator_cost
+        else:
+            assert parent_search_node.arena is self
+            parent_index = parent_search_node.index
+            cost = operator_cost + self.costs[parent_index]
+        index = len(self.states)
+        self.states.append(state)
+        self.parents.append(parent_index)
+        self.operator_costs.append(operator_cost)
+        self.costs.append(cost)
+        self.expanding_priorities.append(0.0)
+        return ArenaSearchNode(self, index)
+
+    def release_last_node(self, node: 'ArenaSearchNode'):
+        """
+        Frees the slot of the given node, which must be the last one made, so that the next node
+         made reuses it. It is used for successor nodes that the search did not open: a slot is
+         kept only for the nodes that were pushed into `open`.
+        """
+        assert node.arena is self and node.index == len(self.states) - 1
+        self.states.pop()
+        self.parents.pop()
+        self.operator_costs.pop()
+        self.costs.pop()
+        self.expanding_priorities.pop()
+
+
+class ArenaSearchNode:
+    """
+    A handle of a node stored in a `SearchNodesArena`. It has the fields and methods of `SearchNode`.
+    Handles are made on demand (by `parent_search_node`, `traverse_back_to_root()` and the `close`
+     collection), so a node might have several handles: compare them by `index`, not by identity.
+     Only `open` keeps a handle per node (the one the node was pushed with).
+    """
+
+    __slots__ = ('arena', 'index')
+
+    def __init__(self, arena: SearchNodesArena, index: int):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def state(self) -> GraphProblemState:
+        return self.arena.states[self.index]
+
+    @property
+    def parent_search_node(self) -> Optional['ArenaSearchNode']:
+        parent_index = self.arena.parents[self.index]
+        return None if parent_index < 0 else ArenaSearchNode(self.arena, parent_index)
+
+    @property
+    def operator_cost(self) -> float:
+        return self.arena.operator_costs[self.index]
+
+    @property
+    def cost(self) -> float:
+        return self.arena.costs[self.index]
+
+    @property
+    def expanding_priority(self) -> float:
+        return self.arena.expanding_priorities[self.index]
+
+    @expanding_priority.setter
+    def expanding_priority(self, expanding_priority: float):
+        self.arena.expanding_priorities[self.index] = expanding_priority
+
+    def traverse_back_to_root(self) -> Iterator['ArenaSearchNode']:
+        parents = self.arena.parents
+        index = self.index
+        while index >= 0:
+            yield ArenaSearchNode(self.arena, index)
+            index = parents[index]
+
+    def make_states_path(self) -> GraphProblemStatesPath:
+        states, parents = self.arena.states, self.arena.parents
+        path = []
+        index = self.index
+        while index >= 0:
+            path.append(states[index])
+            index = parents[index]
+        path.reverse()
+        return GraphProblemStatesPath(path)
+
+
+class ArenaSearchNodesCollection:
+    """
+    The `close` collection (see `SearchNodesCollection`) of searches that use a `SearchNodesArena`.
+    It keeps the index of each node rather than its handle, and creates the handles on demand.
+    """
+
+    def __init__(self, arena: SearchNodesArena):
+        self._arena = arena
+        self._state_to_node_index_mapping: Dict[GraphProblemState, int] = {}
+
+    def add_node(self, node: ArenaSearchNode):
+        assert node.state not in self._state_to_node_index_mapping
+        self._state_to_node_index_mapping[node.state] = node.index
+
+    def remove_node(self, node: ArenaSearchNode):
+        assert node.state in self._state_to_node_index_mapping
+        del self._state_to_node_index_mapping[node.state]
+
+    def has_node(self, node: ArenaSearchNode) -> bool:
+        return self._state_to_node_index_mapping.get(node.state, -1) == node.index
+
+    def has_state(self, state: GraphProblemState) -> bool:
+        return state in self._state_to_node_index_mapping
+
+    def get_node_by_state(self, state: GraphProblemState) -> Optional[ArenaSearchNode]:
+        index = self._state_to_node_index_mapping.get(state, None)
+        return None if index is None else ArenaSearchNode(self._arena, index)
@@ -1,5 +1,7 @@
 from .graph_problem_interface import *
 from .best_first_search import BestFirstSearch
+from .utils.indexed_heap import IndexedHeap
+from .utils.open_lists import OpenListType
 
 
 class UniformCost(BestFirstSearch):
@@ -10,9 +12,11 @@ class UniformCost(BestFirstSearch):
 
     solver_name = 'UniformCost'
 
-    def __init__(self):
+    def __init__(self, use_node_arena: bool = False, open_list_type: OpenListType = IndexedHeap,
+                 collect_stats: bool = False):
         # Uniform Cost is a graph search algorithm. Hence, we use close set.
-        super(UniformCost, self).__init__(use_close=True)
+        super(UniformCost, self).__init__(use_close=True, use_node_arena=use_node_arena,
+                                          open_list_type=open_list_type, collect_stats=collect_stats)
 
     def _open_successor_node(self, problem: GraphProblem, successor_node: SearchNode):
         if self.close.has_state(successor_node.state):
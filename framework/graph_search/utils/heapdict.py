@@ -1,4 +1,4 @@
-import collections
+import collections.abc
 
 
 def doc(s):
@@ -12,7 +12,7 @@ def doc(s):
     return f
 
 
-class heapdict(collections.MutableMapping):
+class heapdict(collections.abc.MutableMapping):
     __marker = object()
 
     @staticmethod
@@ -0,0 +1,156 @@
+from .open_lists import OpenList
+
+from heapq import heappush, heappop
+from typing import Dict, Hashable, Iterator, List, Tuple
+
+
+class IndexedHeap(OpenList):
+    """
+    An indexed d-ary min-heap: a priority queue of (hashable) items that also
+     supports finding, re-prioritizing and removing any item in O(log n).
+    The heap is stored in two parallel lists (the priorities and the items), and
+     a dictionary maps each item to its current position in these lists.
+    Changing the priority of an item moves it in place (up or down) from its current
+     position, and all the sifts are iterative: the moved entry is written only once,
+     into the "hole" left after shifting the entries in its way.
+    A larger `arity` makes the heap shallower (cheaper pushes and decrease-keys) at
+     the cost of more comparisons per level when popping. The default of 4 is usually
+     the fastest (see `experiments/heap_benchmark.py`).
+    Items with equal priorities are popped in an unspecified order.
+    """
+
+    def __init__(self, arity: int = 4):
+        assert arity >= 2
+        self._arity = arity
+        self._priorities: List = []
+        self._items: List = []
+        self._positions: Dict[Hashable, int] = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item) -> bool:
+        return item in self._positions
+
+    def __iter__(self) -> Iterator:
+        """Iterates over the items, in no particular order."""
+        return iter(self._items)
+
+    def is_empty(self) -> bool:
+        return not self._items
+
+    def clear(self):
+        self._priorities.clear()
+        self._items.clear()
+        self._positions.clear()
+
+    def priority_of(self, item):
+        """Raises `KeyError` if the item is not in the heap."""
+        return self._priorities[self._positions[item]]
+
+    def push(self, item, priority):
+        """Adds a new item to the heap. Use `set_priority()` for an item that might be in the heap."""
+        assert item not in self._positions
+        self._priorities.append(priority)
+        self._items.append(item)
+        self._sift_up(len(self._items) - 1, item, priority)
+
+    def set_priority(self, item, priority):
+        """Adds the item, or moves it in place if it is already in the heap (decrease-key / increase-key)."""
+        position = self._positions.get(item)
+        if position is None:
+            self.push(item, priority)
+        elif priority < self._priorities[position]:
+            self._sift_up(position, item, priority)
+        else:
+            self._sift_down(position, item, priority)
+
+    def peek(self) -> Tuple:
+        """Returns the (item, priority) with the lowest priority. Raises `IndexError` if the heap is empty."""
+        return self._items[0], self._priorities[0]
+
+    def peek_n_best(self, n: int) -> List[Tuple]:
+        """
+        Returns the (item, priority) of the (at most) `n` items with the lowest priorities, in
+         increasing order of priority, without removing them: a best first traversal of the top
+         of the heap, with a small heap of the candidate positions. O(n log n).
+        """
+        priorities, items, arity = self._priorities, self._items, self._arity
+        size = len(items)
+        best = []
+        candidates = [(priorities[0], 0)] if size else []
+        while candidates and len(best) < n:
+            priority, position = heappop(candidates)
+            best.append((items[position], priority))
+            first_child = position * arity + 1
+            for child in range(first_child, min(first_child + arity, size)):
+                heappush(candidates, (priorities[child], child))
+        return best
+
+    def pop(self) -> Tuple:
+        """Removes and returns the (item, priority) with the lowest priority. Raises `IndexError` if empty."""
+        priorities, items = self._priorities, self._items
+        top_item, top_priority = items[0], priorities[0]
+        del self._positions[top_item]
+        last_item, last_priority = items.pop(), priorities.pop()
+        if items:
+            self._sift_down(0, last_item, last_priority)
+        return top_item, top_priority
+
+    def remove(self, item):
+        """Removes the given item from the heap and returns its priority. Raises `KeyError` if it is not there."""
+        priorities, items = self._priorities, self._items
+        position = self._positions.pop(item)
+        priority = priorities[position]
+        last_item, last_priority = items.pop(), priorities.pop()
+        if position < len(items):
+            # The last entry fills the hole, and then moves up or down to its place.
+            if last_priority < priority:
+                self._sift_up(position, last_item, last_priority)
+            else:
+                self._sift_down(position, last_item, last_priority)
+        return priority
+
+    def _sift_up(self, position: int, item, priority):
+        """Places (item, priority) in the hole at `position`, after moving down the larger ancestors."""
+        priorities, items, positions, arity = self._priorities, self._items, self._positions, self._arity
+        while position > 0:
+            parent = (position - 1) // arity
+            parent_priority = priorities[parent]
+            if not priority < parent_priority:
+                break
+            parent_item = items[parent]
+            priorities[position] = parent_priority
+            items[position] = parent_item
+            positions[parent_item] = position
+            position = parent
+        priorities[position] = priority
+        items[position] = item
+        positions[item] = position
+
+    def _sift_down(self, position: int, item, priority):
+        """Places (item, priority) in the hole at `position`, after moving up the smaller descendants."""
+        priorities, items, positions, arity = self._priorities, self._items, self._positions, self._arity
+        size = len(items)
+        while True:
+            first_child = position * arity + 1
+            if first_child >= size:
+                break
+            best_child, best_priority = first_child, priorities[first_child]
+            for child in range(first_child + 1, min(first_child + arity, size)):
+                child_priority = priorities[child]
+                if child_priority < best_priority:
+                    best_child, best_priority = child, child_priority
+            if not best_priority < priority:
+                break
+            best_item = items[best_child]
+            priorities[position] = best_priority
+            items[position] = best_item
+            positions[best_item] = position
+            position = best_child
+        priorities[position] = priority
+        items[position] = item
+        positions[item] = position
+
+
+__all__ = ['IndexedHeap']
@@ -0,0 +1,228 @@
+import abc
+from heapq import heappush, heappop, heapify, nsmallest
+from itertools import count
+from math import inf
+from typing import Callable, Dict, Hashable, List, Tuple
+
+
+class OpenList(abc.ABC):
+    """
+    The interface of the priority queues that can back the `open` queue of `BestFirstSearch`
+     (see the `open_list_type` argument of the solvers).
+    The items are hashable (search nodes) and each item is in the queue at most once.
+    """
+
+    @abc.abstractmethod
+    def push(self, item: Hashable, priority: float):
+        ...
+
+    @abc.abstractmethod
+    def pop(self) -> Tuple[Hashable, float]:
+        """Removes and returns the (item, priority) with the lowest priority. Raises `IndexError` if empty."""
+        ...
+
+    @abc.abstractmethod
+    def remove(self, item: Hashable) -> float:
+        """Removes the given item and returns its priority. Raises `KeyError` if it is not in the queue."""
+        ...
+
+    @abc.abstractmethod
+    def is_empty(self) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def __len__(self):
+        ...
+
+    def peek_n_best(self, n: int) -> List[Tuple[Hashable, float]]:
+        """
+        Returns the (item, priority) of the (at most) `n` items that would be popped next, in
+         that order, without removing them.
+        This default implementation pops them and pushes them back. The queues below override
+         it to read them in place.
+        """
+        best = [self.pop() for _ in range(min(n, len(self)))]
+        for item, priority in best:
+            self.push(item, priority)
+        return best
+
+
+"""A type of an open list (or any callable that creates an empty open list)."""
+OpenListType = Callable[[], OpenList]
+
+
+_REMOVED = object()  # marks the entries of removed items
+
+
+class LazyDeletionHeap(OpenList):
+    """
+    A binary heap (`heapq`) of [priority, sequence number, item] entries.
+    Removing an item only marks its entry, and marked entries are skipped when they reach the
+     top, so the common A* pattern of removing a node and pushing an improved one costs a
+     single O(log n) push. When most of the heap consists of marked entries, it is rebuilt.
+    Items with equal priorities are popped in the order they were pushed.
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._sequence_numbers = count()
+
+    def push(self, item: Hashable, priority: float):
+        assert item not in self._entries
+        entry = [priority, next(self._sequence_numbers), item]
+        self._entries[item] = entry
+        heappush(self._heap, entry)
+
+    def pop(self) -> Tuple[Hashable, float]:
+        heap = self._heap
+        while heap:
+            priority, _, item = heappop(heap)
+            if item is not _REMOVED:
+                del self._entries[item]
+                return item, priority
+        raise IndexError('pop from an empty queue')
+
+    def peek_n_best(self, n: int) -> List[Tuple[Hashable, float]]:
+        """A best first traversal of the top of the heap (the marked entries are skipped): O(n log n)."""
+        heap = self._heap
+        best = []
+        candidates = [(heap[0], 0)] if heap else []
+        while candidates and len(best) < n:
+            entry, position = heappop(candidates)
+            if entry[2] is not _REMOVED:
+                best.append((entry[2], entry[0]))
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heappush(candidates, (heap[child], child))
+        return best
+
+    def remove(self, item: Hashable) -> float:
+        entry = self._entries.pop(item)
+        entry[2] = _REMOVED
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [entry for entry in self._heap if entry[2] is not _REMOVED]
+            heapify(self._heap)
+        return entry[0]
+
+    def is_empty(self) -> bool:
+        return not self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RadixHeap(OpenList):
+    """
+    A monotone radix heap over integer keys: `int(priority * resolution)`.
+    An entry is stored in the bucket numbered by the highest bit in which its key differs from
+     the last popped key (bucket 0 holds the entries whose key equals it, and bucket 64 all the
+     entries whose keys differ from it above bit 63). Popping from an empty bucket 0 finds the
+     lowest non-empty bucket, and redistributes its entries by the new minimal key into lower
+     buckets. Each entry moves down at most ~64 times overall, and there are no comparisons
+     between entries in the other operations.
+    The queue is monotone: the priorities pushed must be non-negative, and not lower than the
+     last popped one (true for uniform cost, and for A* with a consistent heuristic and
+     `heuristic_weight <= 0.5`). Pushing a lower priority raises `ValueError`, unless it is lower
+     by at most `tolerance`, in which case it is treated as equal to the last popped one (for
+     priorities that are monotone only up to rounding errors, e.g. A* with `AirDistHeuristic`).
+    Infinite priorities (e.g. of dead ends) are kept in an overflow bucket, after all the
+     finite ones. Once one is popped, only infinite priorities can be pushed.
+    The order is exact when the priorities are integral multiples of `1 / resolution` (for
+     example, uniform cost with the `link.distance` costs and `resolution=1`). Otherwise, the
+     entries whose priorities fall into the same key are popped in an arbitrary order.
+    Removed entries are only marked, and are dropped when their bucket is redistributed or popped.
+    """
+
+    _OVERFLOW_BUCKET = 65  # the bucket of the infinite priorities
+
+    def __init__(self, resolution: float = 1.0, tolerance: float = 0.0):
+        assert tolerance >= 0
+        self._resolution = resolution
+        self._scaled_tolerance = tolerance * resolution
+        self._last_key = 0  # inf once an infinite priority was popped
+        self._buckets: List[List[list]] = [[] for _ in range(66)]  # [key, priority, item] entries
+        self._entries: Dict[Hashable, list] = {}
+
+    def push(self, item: Hashable, priority: float):
+        assert item not in self._entries
+        scaled_priority = priority * self._resolution
+        last_key = self._last_key
+        if scaled_priority < last_key:
+            if not scaled_priority >= last_key - self._scaled_tolerance:
+                raise ValueError('Cannot push the priority {} into a monotone RadixHeap: the priorities must be '
+                                 'non-negative and not lower than the last popped one.'.format(priority))
+            scaled_priority = last_key
+        if scaled_priority == inf:
+            entry = [inf, priority, item]
+            bucket_index = self._OVERFLOW_BUCKET
+        else:
+            key = int(scaled_priority)
+            entry = [key, priority, item]
+            bucket_index = min((key ^ last_key).bit_length(), 64)
+        self._entries[item] = entry
+        self._buckets[bucket_index].append(entry)
+
+    def pop(self) -> Tuple[Hashable, float]:
+        if not self._entries:
+            raise IndexError('pop from an empty queue')
+        buckets = self._buckets
+        while True:
+            lowest_bucket = buckets[0]
+            while lowest_bucket:
+                _, priority, item = lowest_bucket.pop()
+                if item is not _REMOVED:
+                    del self._entries[item]
+                    return item, priority
+            self._redistribute()
+
+    def peek_n_best(self, n: int) -> List[Tuple[Hashable, float]]:
+        """
+        The keys of each bucket are lower than the keys of the next buckets, so the buckets are
+         scanned in order. Bucket 0 is popped from its end, and the entries of the other buckets
+         are taken by their keys (entries with the same key are in an arbitrary order).
+        """
+        best = []
+        for bucket_index, bucket in enumerate(self._buckets):
+            if len(best) >= n:
+                break
+            if bucket_index == 0:
+                entries = (entry for entry in reversed(bucket) if entry[2] is not _REMOVED)
+            else:
+                entries = nsmallest(n - len(best), (entry for entry in bucket if entry[2] is not _REMOVED),
+                                    key=lambda entry: entry[0])
+            for _, priority, item in entries:
+                if len(best) >= n:
+                    break
+                best.append((item, priority))
+        return best
+
+    def _redistribute(self):
+        """Moves the entries of the lowest non-empty bucket by the new minimal key (the entries exist)."""
+        buckets = self._buckets
+        for bucket_index in range(1, len(buckets)):
+            entries = [entry for entry in buckets[bucket_index] if entry[2] is not _REMOVED]
+            buckets[bucket_index] = []
+            if entries:
+                break
+        if bucket_index == self._OVERFLOW_BUCKET:  # only infinite priorities are left
+            self._last_key = inf
+            buckets[0] = entries
+            return
+        last_key = self._last_key = min(entry[0] for entry in entries)
+        for entry in entries:
+            buckets[min((entry[0] ^ last_key).bit_length(), 64)].append(entry)
+
+    def remove(self, item: Hashable) -> float:
+        entry = self._entries.pop(item)
+        entry[2] = _REMOVED
+        return entry[1]
+
+    def is_empty(self) -> bool:
+        return not self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+__all__ = ['OpenList', 'OpenListType', 'LazyDeletionHeap', 'RadixHeap']
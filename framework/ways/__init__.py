@@ -3,7 +3,23 @@ lists the names you will need and what you can import with:
 >>> from framework import
 """
 
-from .graph import load_map_from_csv, Junction, Roads, Link
-from .tools import compute_distance
+from .graph import load_map_from_csv, load_map_from_csv_parallel, Junction, Roads, Link
+from .tools import compute_distance, compute_distances
+from .compact_graph import CompactRoads
+from .lazy_roads import LazyRoads
+from .roads_arrays import RoadsArrays, AIR_DISTANCE_COST, DISTANCE_COST, HIGHWAY_WEIGHTED_COST
 
-__all__ = ['load_map_from_csv', 'Junction', 'Roads', 'Link', 'compute_distance']
+__all__ = ['load_map_from_csv', 'load_map_from_csv_parallel', 'Junction', 'Roads', 'Link',
+           'compute_distance', 'compute_distances', 'CompactRoads', 'LazyRoads', 'RoadsArrays',
+           'AIR_DISTANCE_COST', 'DISTANCE_COST', 'HIGHWAY_WEIGHTED_COST']
+
+# The contraction hierarchies are imported on first use, and are not in `__all__` (so `import *`
+#  does not import them). Import them by name: `from framework.ways import ContractionHierarchy`.
+_LAZY_NAMES = {'ContractionHierarchy': 'contraction_hierarchy', 'HierarchyPath': 'contraction_hierarchy'}
+
+
+def __getattr__(name):
+    if name not in _LAZY_NAMES:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    from importlib import import_module
+    return getattr(import_module('.' + _LAZY_NAMES[name], __name__), name)
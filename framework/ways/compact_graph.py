@@ -0,0 +1,213 @@
+"""
+ A memory-compact implementation of `Roads`.
+ The graph is stored only in the flat arrays of `RoadsArrays`. Junctions and links
+ are exposed through lightweight view objects, created on demand by each access.
+ Usage:
+ >>> roads = CompactRoads.from_roads(load_map_from_csv(Consts.get_data_file_path("tlv.csv")))
+ >>> junction = roads[15]
+ >>> for link in junction.links: ...
+"""
+
+from . import tools
+from .graph import Roads, Junction, Link, LinkTrafficParams
+from .roads_arrays import RoadsArrays
+
+import numpy as np
+from typing import List, Tuple, Iterator, Union
+
+__all__ = ['CompactRoads', 'JunctionView', 'LinkView']
+
+
+class LinkView:
+    """
+    A read-only view of a single link stored in `RoadsArrays`.
+    It has the same fields as `Link` and compares equal to the `Link` it represents.
+    Like `Link`, it can also be indexed, sliced, unpacked and iterated in the order of
+     the fields (e.g. `source, target, distance, highway_type, *_ = link` or `link[:4]`).
+    """
+
+    __slots__ = ('_roads', '_link_position', 'source')
+
+    def __init__(self, roads: 'CompactRoads', link_position: int, source: int):
+        self._roads = roads
+        self._link_position = link_position
+        self.source = source
+
+    @property
+    def target(self) -> int:
+        return self._roads._targets[self._link_position]
+
+    @property
+    def distance(self) -> int:
+        return self._roads._distances[self._link_position]
+
+    @property
+    def highway_type(self) -> int:
+        return self._roads._highway_types[self._link_position]
+
+    @property
+    def link_params(self) -> LinkTrafficParams:
+        cos_frequencies, sin_frequencies = self._roads._arrays.traffic_params
+        return LinkTrafficParams(float(cos_frequencies[self._link_position]),
+                                 float(sin_frequencies[self._link_position]))
+
+    def _as_tuple(self) -> Tuple[int, int, int, int]:
+        return self.source, self.target, self.distance, self.highway_type
+
+    def to_link(self) -> Link:
+        return Link(self.source, self.target, self.distance, self.highway_type, self.link_params)
+
+    def __len__(self):
+        return len(Link._fields)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.to_link())
+
+    def __getitem__(self, index: Union[int, slice]):
+        return self.to_link()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, LinkView):
+            return self._as_tuple() == other._as_tuple()
+        if isinstance(other, Link):
+            return self._as_tuple() == tuple(other[:4])
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._as_tuple())
+
+    def __repr__(self):
+        return 'LinkView(source={}, target={}, distance={}, highway_type={})'.format(*self._as_tuple())
+
+
+class JunctionView:
+    """
+    A read-only view of a single junction stored in `RoadsArrays`.
+    It has the same fields and methods as `Junction`. Like `Junction`,
+    it is identified (compared and hashed) by its index.
+    """
+
+    __slots__ = ('_roads', '_position')
+
+    def __init__(self, roads: 'CompactRoads', position: int):
+        self._roads = roads
+        self._position = position
+
+    @property
+    def index(self) -> int:
+        return self._roads._indices[self._position]
+
+    @property
+    def lat(self) -> float:
+        return self._roads._lats[self._position]
+
+    @property
+    def lon(self) -> float:
+        return self._roads._lons[self._position]
+
+    @property
+    def coordinates(self) -> Tuple[float, float]:
+        return self.lat, self.lon
+
+    @property
+    def links(self) -> List[LinkView]:
+        roads = self._roads
+        source = roads._indices[self._position]
+        return [LinkView(roads, link_position, source)
+                for link_position in range(roads._offsets[self._position], roads._offsets[self._position + 1])]
+
+    def __eq__(self, other):
+        if not isinstance(other, (JunctionView, Junction)):
+            return False
+        return self.index == other.index
+
+    def __hash__(self):
+        return hash(self.index)
+
+    def __repr__(self):
+        return 'JunctionView(index={}, lat={}, lon={})'.format(self.index, self.lat, self.lon)
+
+    def calc_air_distance_from(self, other_junction: Union['JunctionView', Junction]) -> float:
+        assert(isinstance(other_junction, (JunctionView, Junction)))
+        return tools.compute_distance(self.coordinates, other_junction.coordinates)
+
+
+class CompactRoads(Roads):
+    """
+    A `Roads` implementation backed by contiguous arrays rather than by a dictionary of `Junction` objects.
+    It supports the same interface (`roads[idx]`, `in`, `len`, iteration, `junctions()`,
+    `iterlinks()`, `return_focus()`), but the returned junctions and links are
+    `JunctionView` / `LinkView` objects created on demand.
+    Memory usage is a few tens of bytes per link, instead of several hundreds.
+    """
+
+    def __init__(self, arrays: RoadsArrays):
+        dict.__init__(self)
+        self.generation = 0
+        self.base_traffic = tools.base_traffic_pattern()
+        self.mean_lat_lon = (float(np.mean(arrays.lats)), float(np.mean(arrays.lons)))
+        self._arrays = arrays
+        self._indices = memoryview(arrays.indices)
+        self._lats = memoryview(arrays.lats)
+        self._lons = memoryview(arrays.lons)
+        self._offsets = memoryview(arrays.offsets)
+        self._targets = memoryview(arrays.targets)
+        self._distances = memoryview(arrays.distances)
+        self._highway_types = memoryview(arrays.highway_types)
+
+    @staticmethod
+    def from_roads(roads: Roads) -> 'CompactRoads':
+        return CompactRoads(roads.arrays)
+
+    def __getitem__(self, junction_id: int) -> JunctionView:
+        return JunctionView(self, self._arrays.position_of(junction_id))
+
+    def __contains__(self, junction_id) -> bool:
+        return self._arrays.has_junction(junction_id)
+
+    def __len__(self) -> int:
+        return self._arrays.nr_junctions
+
+    def __bool__(self) -> bool:
+        return self._arrays.nr_junctions > 0
+
+    def __eq__(self, other):
+        """
+        Whether `other` is a map (`Roads`) with the same flat arrays: the same junctions, in the same
+         positions, with the same links. The underlying dictionary of `CompactRoads` is always empty,
+         so the comparison of `dict` would find any two maps equal. Other dictionaries are compared
+         with the junctions of the map.
+        """
+        if not isinstance(other, Roads):
+            return dict(self.items()) == other if isinstance(other, dict) else NotImplemented
+        other_arrays = other.arrays
+        return self._arrays is other_arrays or \
+            all(np.array_equal(getattr(self._arrays, name), getattr(other_arrays, name))
+                for name in RoadsArrays.ARRAY_NAMES)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'CompactRoads(nr_junctions={}, nr_links={})'.format(self._arrays.nr_junctions, self._arrays.nr_links)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._arrays.indices.tolist())
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[junction_id] for junction_id in self]
+
+    def items(self):
+        return [(junction_id, self[junction_id]) for junction_id in self]
+
+    def get(self, junction_id, default=None):
+        return self[junction_id] if junction_id in self else default
+
+    def __reduce__(self):
+        return CompactRoads, (self._arrays,)
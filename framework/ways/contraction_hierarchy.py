@@ -0,0 +1,456 @@
+"""
+ Contraction Hierarchies (CH) over a road map, for fast exact point-to-point queries.
+ The preprocessing contracts the junctions one by one, in the order of their importance:
+ contracting a junction removes it from the remaining graph, and adds a shortcut link
+ `u -> w` for each path `u -> v -> w` through it that is the only shortest path
+ (when no "witness" path that avoids `v` is found by a local search).
+ A query is a bidirectional Dijkstra in which both directions only move up in the
+ order, and the shortcuts of the path found are then unpacked back into links.
+ Junctions that become too dense to contract are left in an uncontracted core, and with the
+ air distance costs the queries are goal directed, which mostly helps inside the core.
+ Usage:
+ >>> hierarchy = ContractionHierarchy.build(roads, cost_model=AIR_DISTANCE_COST)
+ >>> hierarchy.save(Consts.get_data_file_path("tlv.ch.npz"))
+ >>> hierarchy = ContractionHierarchy.load(Consts.get_data_file_path("tlv.ch.npz"), roads)
+ >>> cost, junction_ids = hierarchy.shortest_path(54, 549)
+ The hierarchy can also solve `MapProblem`s (see `deliveries.ContractionHierarchySolver`).
+"""
+
+from .graph import Roads
+from .roads_arrays import RoadsArrays, AIR_DISTANCE_COST
+from .tools import compute_distance
+
+import numpy as np
+from heapq import heappush, heappop
+from math import inf
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+__all__ = ['ContractionHierarchy', 'HierarchyPath']
+
+HIERARCHY_FORMAT_VERSION = 2
+
+
+class HierarchyPath(NamedTuple):
+    """
+    A path found by `ContractionHierarchy.query()`: its total cost, the positions of its
+     junctions (from the source to the target), the cost of each of its links, and the number
+     of junctions settled by the query.
+    """
+    cost: float
+    positions: List[int]
+    link_costs: List[float]
+    nr_settled: int
+
+
+class _HierarchyBuilder:
+    """
+    Contracts the junctions of a graph (given as a list of links between junction positions).
+    The remaining graph is kept in dictionaries: `out_links[u][w]` and `in_links[w][u]` are the
+     cost of the (cheapest) link `u -> w`, and `middles[(u, w)]` is the junction that a shortcut
+     `u -> w` skips. The order is chosen greedily by the edge difference (the number of shortcuts
+     added minus the number of links removed), the number of already contracted neighbors and the
+     level (the length of the longest chain of contracted junctions below the junction), which
+     spread the contraction evenly over the map. The priorities are re-evaluated lazily, when a
+     junction reaches the top of the queue.
+    """
+
+    def __init__(self, nr_junctions: int, sources: Sequence[int], targets: Sequence[int], costs: Sequence[float],
+                 witness_settled_limit: int, max_degree: int):
+        self.nr_junctions = nr_junctions
+        self.witness_settled_limit = witness_settled_limit
+        self.max_degree = max_degree
+        self.out_links: List[Dict[int, float]] = [{} for _ in range(nr_junctions)]
+        self.in_links: List[Dict[int, float]] = [{} for _ in range(nr_junctions)]
+        self.middles: Dict[Tuple[int, int], int] = {}
+        self.nr_contracted_neighbors = [0] * nr_junctions
+        self.levels = [0] * nr_junctions
+        for source, target, cost in zip(sources, targets, costs):
+            if target < 0 or source == target or cost == inf:
+                continue
+            if cost < self.out_links[source].get(target, inf):
+                self.out_links[source][target] = cost
+                self.in_links[target][source] = cost
+
+    def _witness_distances(self, source: int, avoided: int, max_cost: float, targets: Dict[int, float]) -> Dict[int, float]:
+        """
+        A local Dijkstra from `source` that does not pass through `avoided`. It stops when all the
+         targets are settled, after `max_cost`, or after settling `witness_settled_limit` junctions.
+        Returns the (tentative) distances found: each of them is the length of some path.
+        """
+        out_links = self.out_links
+        distances = {source: 0.0}
+        queue = [(0.0, source)]
+        nr_settled = 0
+        nr_targets_left = len(targets)
+        while queue:
+            distance, junction = heappop(queue)
+            if distance > distances[junction]:
+                continue
+            if distance > max_cost or nr_settled >= self.witness_settled_limit:
+                break
+            nr_settled += 1
+            if junction in targets:
+                nr_targets_left -= 1
+                if nr_targets_left == 0:
+                    break
+            for successor, cost in out_links[junction].items():
+                if successor == avoided:
+                    continue
+                successor_distance = distance + cost
+                if successor_distance < distances.get(successor, inf):
+                    distances[successor] = successor_distance
+                    heappush(queue, (successor_distance, successor))
+        return distances
+
+    def _shortcuts_of(self, junction: int) -> List[Tuple[int, int, float]]:
+        """The shortcuts (u, w, cost) needed if the given junction is contracted now."""
+        in_links, out_links = self.in_links[junction], self.out_links[junction]
+        shortcuts = []
+        if not in_links or not out_links:
+            return shortcuts
+        max_out_cost = max(out_links.values())
+        for source, in_cost in in_links.items():
+            targets = {target: in_cost + out_cost for target, out_cost in out_links.items() if target != source}
+            if not targets:
+                continue
+            witness_distances = self._witness_distances(source, junction, in_cost + max_out_cost, targets)
+            shortcuts.extend((source, target, cost) for target, cost in targets.items()
+                             if witness_distances.get(target, inf) > cost)
+        return shortcuts
+
+    def _priority_of(self, junction: int, shortcuts: List[Tuple[int, int, float]]) -> int:
+        edge_difference = len(shortcuts) - len(self.in_links[junction]) - len(self.out_links[junction])
+        return 2 * edge_difference + self.nr_contracted_neighbors[junction] + self.levels[junction]
+
+    def contract_all(self):
+        """
+        Returns the ranks of the junctions (their order of contraction), the number of contracted
+         junctions, and the upward links: (source, target, cost, middle) for the links from a
+         junction to a junction of higher rank, and (target, source, cost, middle) for the links
+         into a junction from a junction of higher rank. The middle is -1 for a link of the map.
+        A junction with more than `max_degree` links (in + out) when it reaches the top of the
+         queue is not contracted: it is left in the core, which is the remaining graph at the end.
+         The core junctions get the highest ranks, and all the core links are kept as upward links
+         in both directions.
+        """
+        ranks = [-1] * self.nr_junctions
+        up_links, down_links, core = [], [], []
+        in_links, out_links, middles = self.in_links, self.out_links, self.middles
+        queue = [(self._priority_of(junction, self._shortcuts_of(junction)), junction)
+                 for junction in range(self.nr_junctions)]
+        queue.sort()
+        rank = 0
+        while queue:
+            _, junction = heappop(queue)
+            if len(in_links[junction]) + len(out_links[junction]) > self.max_degree:
+                core.append(junction)
+                continue
+            shortcuts = self._shortcuts_of(junction)
+            priority = self._priority_of(junction, shortcuts)
+            if queue and priority > queue[0][0]:
+                heappush(queue, (priority, junction))  # re-evaluated lazily: not the lowest anymore
+                continue
+
+            ranks[junction] = rank
+            rank += 1
+            for target, cost in out_links[junction].items():
+                up_links.append((junction, target, cost, middles.get((junction, target), -1)))
+                del in_links[target][junction]
+                self.nr_contracted_neighbors[target] += 1
+                self.levels[target] = max(self.levels[target], self.levels[junction] + 1)
+            for source, cost in in_links[junction].items():
+                down_links.append((junction, source, cost, middles.get((source, junction), -1)))
+                del out_links[source][junction]
+                self.nr_contracted_neighbors[source] += 1
+                self.levels[source] = max(self.levels[source], self.levels[junction] + 1)
+            out_links[junction], in_links[junction] = {}, {}
+            for source, target, cost in shortcuts:
+                if cost < out_links[source].get(target, inf):
+                    out_links[source][target] = in_links[target][source] = cost
+                    middles[(source, target)] = junction
+
+        nr_contracted = rank
+        for core_rank, junction in enumerate(core, start=nr_contracted):
+            ranks[junction] = core_rank
+            up_links.extend((junction, target, cost, middles.get((junction, target), -1))
+                            for target, cost in out_links[junction].items())
+            down_links.extend((junction, source, cost, middles.get((source, junction), -1))
+                              for source, cost in in_links[junction].items())
+        return ranks, nr_contracted, up_links, down_links
+
+
+def _is_map_of(arrays: RoadsArrays, cost_model: str, indices: np.ndarray, offsets: np.ndarray,
+               targets: np.ndarray, link_costs: np.ndarray) -> bool:
+    """Whether the given junctions, links (in CSR form) and link costs are those of `arrays` under `cost_model`."""
+    return np.array_equal(indices, arrays.indices) and np.array_equal(offsets, arrays.offsets) and \
+        np.array_equal(targets, arrays.targets) and np.array_equal(link_costs, arrays.link_costs(cost_model))
+
+
+def _links_to_csr(nr_junctions: int, links: List[Tuple[int, int, float, int]]) -> Tuple[np.ndarray, ...]:
+    """(offsets, neighbors, costs, middles) arrays of the given (junction, neighbor, cost, middle) links."""
+    links.sort(key=lambda link: link[0])
+    junctions = np.fromiter((link[0] for link in links), dtype=np.int64, count=len(links))
+    offsets = np.concatenate([np.zeros(1, dtype=np.int64),
+                              np.cumsum(np.bincount(junctions, minlength=nr_junctions), dtype=np.int64)])
+    neighbors = np.fromiter((link[1] for link in links), dtype=np.int64, count=len(links))
+    costs = np.fromiter((link[2] for link in links), dtype=np.float64, count=len(links))
+    middles = np.fromiter((link[3] for link in links), dtype=np.int64, count=len(links))
+    return offsets, neighbors, costs, middles
+
+
+class ContractionHierarchy:
+    """
+    A contraction hierarchy of a map, for one cost model (see `RoadsArrays.link_costs()`).
+    The junctions are identified by their positions in `roads.arrays`. The upward graph is
+     stored in two CSR structures (like `RoadsArrays`):
+        up_*    - the links `v -> w` from each junction `v` to the junctions of higher rank.
+        down_*  - the links `u -> v` into each junction `v` from the junctions of higher rank
+                  (`down_neighbors` are the sources `u`).
+    `*_middles` is the junction skipped by a shortcut, or -1 for a link of the map.
+    The junctions of rank `nr_contracted` and above are the core (see `build()`): the links between
+     them are kept in both structures, so the searches move freely inside the core.
+    The hierarchy can be saved to (and loaded from) a `.npz` file.
+    The costs found are exact: a missed witness only adds a redundant shortcut.
+    """
+
+    ARRAY_NAMES = ('ranks', 'up_offsets', 'up_neighbors', 'up_costs', 'up_middles',
+                   'down_offsets', 'down_neighbors', 'down_costs', 'down_middles')
+
+    def __init__(self, arrays: RoadsArrays, cost_model: str, nr_contracted: int, ranks: np.ndarray,
+                 up_offsets: np.ndarray, up_neighbors: np.ndarray, up_costs: np.ndarray, up_middles: np.ndarray,
+                 down_offsets: np.ndarray, down_neighbors: np.ndarray, down_costs: np.ndarray,
+                 down_middles: np.ndarray):
+        assert len(ranks) == arrays.nr_junctions
+        self.arrays = arrays
+        self.cost_model = cost_model
+        self.nr_contracted = nr_contracted
+        self.ranks = ranks
+        self.up_offsets, self.up_neighbors, self.up_costs, self.up_middles = \
+            up_offsets, up_neighbors, up_costs, up_middles
+        self.down_offsets, self.down_neighbors, self.down_costs, self.down_middles = \
+            down_offsets, down_neighbors, down_costs, down_middles
+        self._ranks = memoryview(ranks)
+        self._lats, self._lons = memoryview(arrays.lats), memoryview(arrays.lons)
+        self._up = tuple(memoryview(array) for array in (up_offsets, up_neighbors, up_costs, up_middles))
+        self._down = tuple(memoryview(array) for array in (down_offsets, down_neighbors, down_costs, down_middles))
+
+    @staticmethod
+    def build(roads: Union[Roads, RoadsArrays], cost_model: str = AIR_DISTANCE_COST,
+              witness_settled_limit: int = 50, max_degree: int = 32) -> 'ContractionHierarchy':
+        """
+        Contracts the junctions of the map. This takes a while, so the result is usually saved with `save()`.
+        :param witness_settled_limit: The number of junctions settled by each witness search.
+                                      A lower limit makes the preprocessing faster, but adds more shortcuts.
+        :param max_degree: Junctions that have more links than this (including the shortcuts) when their
+                           turn comes are left uncontracted, in the core. Contracting them would add many
+                           shortcuts and take most of the preprocessing time; a larger core makes the
+                           queries slower.
+        """
+        arrays = roads if isinstance(roads, RoadsArrays) else roads.arrays
+        builder = _HierarchyBuilder(arrays.nr_junctions, arrays.source_positions.tolist(),
+                                    arrays.target_positions.tolist(), arrays.link_costs(cost_model).tolist(),
+                                    witness_settled_limit, max_degree)
+        ranks, nr_contracted, up_links, down_links = builder.contract_all()
+        return ContractionHierarchy(arrays, cost_model, nr_contracted, np.asarray(ranks, dtype=np.int64),
+                                    *_links_to_csr(arrays.nr_junctions, up_links),
+                                    *_links_to_csr(arrays.nr_junctions, down_links))
+
+    @property
+    def nr_junctions(self) -> int:
+        return len(self.ranks)
+
+    @property
+    def nr_core_junctions(self) -> int:
+        return self.nr_junctions - self.nr_contracted
+
+    @property
+    def nr_shortcuts(self) -> int:
+        # The links between core junctions are stored in both structures; they are counted once.
+        down_junctions = np.repeat(np.arange(self.nr_junctions), np.diff(self.down_offsets))
+        down_shortcuts = (self.down_middles >= 0) & (self.ranks[down_junctions] < self.nr_contracted)
+        return int(np.count_nonzero(self.up_middles >= 0) + np.count_nonzero(down_shortcuts))
+
+    def save(self, filename: str):
+        """
+        Stores the hierarchy in a `.npz` file, together with the links of the map and their costs, to
+         validate it on loading.
+        The file is written to `filename` as is (`np.savez()` would add a `.npz` suffix to a name without one).
+        """
+        with open(filename, 'wb') as file:
+            np.savez(file, version=HIERARCHY_FORMAT_VERSION, cost_model=self.cost_model,
+                     nr_contracted=self.nr_contracted, indices=self.arrays.indices, offsets=self.arrays.offsets,
+                     targets=self.arrays.targets, link_costs=self.arrays.link_costs(self.cost_model),
+                     **{name: getattr(self, name) for name in self.ARRAY_NAMES})
+
+    @staticmethod
+    def load(filename: str, roads: Union[Roads, RoadsArrays]) -> 'ContractionHierarchy':
+        """Loads a hierarchy saved by `save()`. Raises `ValueError` if it was built for another map."""
+        arrays = roads if isinstance(roads, RoadsArrays) else roads.arrays
+        with np.load(filename) as stored:
+            if int(stored['version']) != HIERARCHY_FORMAT_VERSION:
+                raise ValueError('Unsupported contraction hierarchy version {} in `{}`.'.format(
+                    int(stored['version']), filename))
+            cost_model = str(stored['cost_model'])
+            if not _is_map_of(arrays, cost_model, stored['indices'], stored['offsets'], stored['targets'],
+                              stored['link_costs']):
+                raise ValueError('The contraction hierarchy in `{}` was built for another map.'.format(filename))
+            return ContractionHierarchy(arrays, cost_model, int(stored['nr_contracted']),
+                                        **{name: stored[name] for name in ContractionHierarchy.ARRAY_NAMES})
+
+    def was_built_for(self, roads: Union[Roads, RoadsArrays]) -> bool:
+        """Whether the hierarchy was built for the given map: the same junctions and links, with the same costs."""
+        arrays = roads if isinstance(roads, RoadsArrays) else roads.arrays
+        return arrays is self.arrays or \
+            _is_map_of(arrays, self.cost_model, self.arrays.indices, self.arrays.offsets, self.arrays.targets,
+                       self.arrays.link_costs(self.cost_model))
+
+    def query(self, source_position: int, target_position: int) -> Optional[HierarchyPath]:
+        """
+        The shortest path between the junctions in the given positions, or None if there is no path.
+        Both searches only relax links to junctions of higher rank (or inside the core), and the
+         direction with the lower key is expanded each time. The query stops once both lowest keys
+         are not lower than the cost of the shortest path found so far.
+        """
+        if source_position == target_position:
+            return HierarchyPath(0.0, [source_position], [], 0)
+        forward_potential = self._forward_potential(source_position, target_position)
+        backward_potential = None if forward_potential is None else (lambda position: -forward_potential(position))
+        forward = _UpwardSearch(self._up, self._down, source_position, forward_potential)
+        backward = _UpwardSearch(self._down, self._up, target_position, backward_potential)
+        # A path through a junction in the queue costs at least its key minus this offset.
+        forward_offset = 0.0 if forward_potential is None else forward_potential(target_position)
+        backward_offset = 0.0 if backward_potential is None else backward_potential(source_position)
+        best = [inf, -1]
+        while True:
+            forward_bound = forward.min_key() - forward_offset
+            backward_bound = backward.min_key() - backward_offset
+            if min(forward_bound, backward_bound) >= best[0]:
+                break
+            if forward_bound <= backward_bound:
+                forward.expand_next(backward.distances, best)
+            else:
+                backward.expand_next(forward.distances, best)
+        best_cost, meeting_position = best
+        if meeting_position < 0:
+            return None
+
+        positions = [meeting_position]
+        while forward.parents[positions[-1]] >= 0:
+            positions.append(forward.parents[positions[-1]])
+        positions.reverse()
+        while backward.parents[positions[-1]] >= 0:
+            positions.append(backward.parents[positions[-1]])
+        return self._unpack(positions, best_cost, len(forward.settled) + len(backward.settled))
+
+    def _forward_potential(self, source_position: int, target_position: int) -> Optional[Callable[[int], float]]:
+        """
+        With the air distance costs, the searches are goal directed (as bidirectional A*, see
+         `BidirectionalAStar`) by the average potential `(air(v, target) - air(source, v)) / 2`.
+         It is consistent on the shortcuts too (their cost is the cost of a path), so the costs
+         found are still exact. This mainly helps inside the core. None for the other cost models.
+        """
+        if self.cost_model != AIR_DISTANCE_COST:
+            return None
+        lats, lons = self._lats, self._lons
+        source = (lats[source_position], lons[source_position])
+        target = (lats[target_position], lons[target_position])
+        potentials = {}
+
+        def forward_potential(position: int) -> float:
+            potential = potentials.get(position)
+            if potential is None:
+                point = (lats[position], lons[position])
+                potentials[position] = potential = (compute_distance(point, target) - compute_distance(source, point)) / 2
+            return potential
+        return forward_potential
+
+    def _find_link(self, source: int, target: int) -> Tuple[float, int]:
+        """The (cost, middle) of the hierarchy link `source -> target`."""
+        if self._ranks[source] < self._ranks[target]:
+            junction, neighbor, (offsets, neighbors, costs, middles) = source, target, self._up
+        else:
+            junction, neighbor, (offsets, neighbors, costs, middles) = target, source, self._down
+        for link in range(offsets[junction], offsets[junction + 1]):
+            if neighbors[link] == neighbor:
+                return costs[link], middles[link]
+        raise KeyError((source, target))
+
+    def _unpack(self, hierarchy_positions: List[int], cost: float, nr_settled: int) -> HierarchyPath:
+        """Replaces each shortcut of the path by the two links it skips, recursively."""
+        positions, link_costs = [hierarchy_positions[0]], []
+        stack = list(zip(hierarchy_positions[-2::-1], hierarchy_positions[:0:-1]))
+        while stack:
+            source, target = stack.pop()
+            link_cost, middle = self._find_link(source, target)
+            if middle < 0:
+                positions.append(target)
+                link_costs.append(link_cost)
+            else:
+                stack.append((middle, target))
+                stack.append((source, middle))
+        return HierarchyPath(cost, positions, link_costs, nr_settled)
+
+    def shortest_path(self, source_junction_id: int, target_junction_id: int) -> Optional[Tuple[float, List[int]]]:
+        """The (cost, junction ids) of the shortest path between the given junctions, or None."""
+        path = self.query(self.arrays.position_of(source_junction_id), self.arrays.position_of(target_junction_id))
+        if path is None:
+            return None
+        return path.cost, self.arrays.indices[path.positions].tolist()
+
+
+class _UpwardSearch:
+    """
+    One direction of a hierarchy query: Dijkstra (or A*, with the key `distance + potential`) over
+     one of the upward CSR structures, with stall-on-demand: a junction that can be reached with a
+     lower cost through a link from a higher junction (a link of the other structure) is not on a
+     shortest path, so its links are not relaxed.
+    """
+
+    def __init__(self, graph: Tuple[Sequence, ...], stall_graph: Tuple[Sequence, ...], root: int,
+                 potential: Optional[Callable[[int], float]]):
+        self.offsets, self.neighbors, self.costs, _ = graph
+        self.stall_offsets, self.stall_neighbors, self.stall_costs, _ = stall_graph
+        self.potential = potential
+        self.distances = {root: 0.0}
+        self.parents = {root: -1}
+        self.settled = set()
+        self.queue = [(0.0 if potential is None else potential(root), root)]
+
+    def min_key(self) -> float:
+        queue, settled = self.queue, self.settled
+        while queue:
+            if queue[0][1] not in settled:
+                return queue[0][0]
+            heappop(queue)
+        return inf
+
+    def expand_next(self, other_distances: Dict[int, float], best: list):
+        """
+        Settles the junction with the lowest key. Each junction whose distance improves and that was
+         reached by the other direction closes a path; `best` = [cost, meeting position] of the shortest one.
+        """
+        _, position = heappop(self.queue)
+        self.settled.add(position)
+        distances = self.distances
+        distance = distances[position]
+        path_cost = distance + other_distances.get(position, inf)
+        if path_cost < best[0]:
+            best[0], best[1] = path_cost, position
+
+        stall_neighbors, stall_costs = self.stall_neighbors, self.stall_costs
+        for link in range(self.stall_offsets[position], self.stall_offsets[position + 1]):
+            if distances.get(stall_neighbors[link], inf) + stall_costs[link] < distance:
+                return
+
+        parents, neighbors, costs, potential = self.parents, self.neighbors, self.costs, self.potential
+        for link in range(self.offsets[position], self.offsets[position + 1]):
+            neighbor = neighbors[link]
+            neighbor_distance = distance + costs[link]
+            if neighbor_distance < distances.get(neighbor, inf):
+                distances[neighbor] = neighbor_distance
+                parents[neighbor] = position
+                key = neighbor_distance if potential is None else neighbor_distance + potential(neighbor)
+                heappush(self.queue, (key, neighbor))
+                path_cost = neighbor_distance + other_distances.get(neighbor, inf)
+                if path_cost < best[0]:
+                    best[0], best[1] = path_cost, neighbor
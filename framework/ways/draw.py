@@ -1,14 +1,17 @@
 'accessible using "import ways.draw"'
 
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
-    raise ImportError('Please install matplotlib:  http://matplotlib.org/users/installing.html#windows')
 
-plt.axis('equal')
+def _pyplot():
+    '''matplotlib is slow to import, so it is imported only when drawing.
+    The axes are left to the caller: call plt.axis('equal') once, before drawing the map.'''
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise ImportError('Please install matplotlib:  http://matplotlib.org/users/installing.html#windows')
+    return plt
 
 def plotOrders(roads, orders):
-    from matplotlib import pyplot as plt
+    plt = _pyplot()
     for i,order in enumerate(orders):
         ps, pt = roads[order[0]], roads[order[1]]
 
@@ -23,7 +26,8 @@ def plotOrders(roads, orders):
 def plotPath(path, color=None, marker=None):
     '''path is a list of junction-ids - keys in the dictionary.
     e.g. [0, 33, 54, 60]
-    Don't forget plt.show()'''
+    Don't forget plt.axis('equal') (once, before drawing) and plt.show()'''
+    plt = _pyplot()
     flons, tolons, flats, tolats = [], [], [], []
     #for l in path.links:
     for ps,pt in zip(path.junctions[:-1], path.junctions[1:]):
@@ -4,8 +4,18 @@
 """
 
 from . import tools
+from .roads_arrays import RoadsArrays, AIR_DISTANCE_COST, DEFAULT_HIGHWAY_TYPE_WEIGHTS
+import gc
+import os
 import sys
-from typing import List, Tuple, Dict, Iterator, Set, NamedTuple
+import numpy as np
+from contextlib import contextmanager
+from itertools import islice
+from typing import List, Tuple, Dict, Iterator, Iterable, Set, NamedTuple, Optional, TextIO, TYPE_CHECKING
+
+if TYPE_CHECKING:  # for the annotations only (imported on first use, or importing this module)
+    from .spatial_index import SpatialIndex
+    from .subgraph import IdTranslation
 
 
 # Some additional parameters for a link
@@ -52,6 +62,9 @@ class Roads(Dict[int, Junction]):
     g.generation = 5
     """
 
+    # Set for a graph extracted by `subgraph()` (see `subgraph.IdTranslation`).
+    id_translation: Optional['IdTranslation'] = None
+
     def junctions(self) -> List[Junction]:
         return list(self.values())
 
@@ -62,6 +75,88 @@ class Roads(Dict[int, Junction]):
         self.base_traffic = tools.base_traffic_pattern()
         tmp = [(n.lat, n.lon) for n in junction_list.values()]
         self.mean_lat_lon = (sum([i[0] for i in tmp]) / len(tmp), sum([i[1] for i in tmp]) / len(tmp))
+        self._arrays: Optional[RoadsArrays] = None
+
+    @property
+    def arrays(self) -> RoadsArrays:
+        """The flat CSR representation of the graph. Built once, on first use."""
+        if self._arrays is None:
+            self._arrays = RoadsArrays.from_junctions(self.values())
+        return self._arrays
+
+    def compute_distances(self, src_ids, dst_ids) -> np.ndarray:
+        """
+        Vectorized air distances (in Meters) between pairs of junctions, given by their indices.
+        `src_ids` and `dst_ids` are broadcast against each other, so a distances matrix is given by:
+        >>> roads.compute_distances(np.array(ids)[:, np.newaxis], np.array(ids)[np.newaxis, :])
+        The values are the same as those of `Junction.calc_air_distance_from()`.
+        """
+        return self.arrays.air_distances(self.arrays.positions_of(src_ids), self.arrays.positions_of(dst_ids))
+
+    def compute_distances_from(self, src_id: int, dst_ids) -> np.ndarray:
+        """One-to-many version of `compute_distances()`."""
+        return self.compute_distances(src_id, dst_ids)
+
+    @property
+    def spatial_index(self) -> 'SpatialIndex':
+        """
+        A spatial index over the junctions, for nearest-k, radius and bounding-box queries:
+        >>> ids, distances = roads.spatial_index.nearest(lat, lon, k=1)
+        Built once, on first use.
+        """
+        return self.arrays.spatial_index
+
+    def subgraph(self, bbox: Optional[Tuple[float, float, float, float]] = None,
+                 around: Optional[Iterable[int]] = None, hops: int = 0, compact: bool = False) -> 'Roads':
+        """
+        Extracts the region made of the junctions within `bbox` = (min_lat, min_lon, max_lat, max_lon)
+        and/or the junctions in `around`, extended by all the junctions within `hops` links.
+        The returned graph is re-indexed as 0..n-1 and has an `id_translation` table (`ValueError` is
+        raised if no junction is selected):
+        >>> region = roads.subgraph(around=[54, 549], hops=100)
+        >>> problem = MapProblem(region, region.id_translation.from_original(54), ...)
+        """
+        from .subgraph import extract_subgraph
+        return extract_subgraph(self, bbox, around, hops, compact)
+
+    def link_costs(self, cost_model: str = AIR_DISTANCE_COST,
+                   highway_type_weights=DEFAULT_HIGHWAY_TYPE_WEIGHTS) -> np.ndarray:
+        """
+        The cost of every link, in the order of `self.arrays`, under the given cost model:
+        'air_distance', 'distance' (`Link.distance`) or 'highway_weighted'.
+        Built once per cost model and cached.
+        """
+        return self.arrays.link_costs(cost_model, highway_type_weights)
+
+    @property
+    def reverse_links(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The incoming links of every junction (see `RoadsArrays.reverse_links`), indexed by the
+        positions of `self.arrays`. `Junction.links` holds the outgoing links only. Built once and cached.
+        """
+        return self.arrays.reverse_links
+
+    def traffic_multipliers(self, bucket_minutes: int = 60) -> np.ndarray:
+        """
+        The traffic multiplier of every link (in the order of `self.arrays`) per time bucket of the day,
+        as a (nr_links, 1440 // bucket_minutes) table. Built once per bucket size and cached.
+        """
+        return self.arrays.traffic_multipliers(bucket_minutes)
+
+    def save_snapshot(self, filename: str):
+        """Stores the graph as a binary snapshot that can be memory-mapped by `load_snapshot()`."""
+        from .snapshot import save_snapshot
+        save_snapshot(self, filename)
+
+    @staticmethod
+    def load_snapshot(filename: str, compact: bool = False) -> 'Roads':
+        """
+        Opens a snapshot created by `save_snapshot()`.
+        The junctions are materialized lazily, on the first access to them.
+        If `compact` is set, a `CompactRoads` that exposes junction views is returned.
+        """
+        from .snapshot import load_snapshot
+        return load_snapshot(filename, compact)
 
     def return_focus(self, start_junction_id: int) -> Set[Link]:
         found = set()
@@ -82,26 +177,120 @@ class Roads(Dict[int, Junction]):
         return (link for j in self.values() for link in j.links)
 
 
-def _make_link(source_idx: int, link_string: str) -> Link:
+@contextmanager
+def _gc_paused():
+    """
+    This function is for local use only.
+    Building the map allocates millions of long-lived objects, which makes the
+    cyclic garbage collector run over and over again for nothing.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class _JunctionRow(NamedTuple):
+    """A parsed row of the map file. The links are (target, distance, highway_type) triplets."""
+    index: int
+    lat: float
+    lon: float
+    links: List[Tuple[int, int, int]]
+
+
+def _parse_link(link_string: str) -> Tuple[int, int, int]:
     """This function is for local use only"""
     link_params = [int(x) for x in link_string.split("@")]
     assert len(link_params) == 3
-    target_idx = link_params[0]
-    distance = link_params[1]
-    highway_type = link_params[2]
-    link_traffic_params = LinkTrafficParams(*tools.generate_traffic_noise_params(source_idx, target_idx))
-    return Link(source_idx, target_idx, distance, highway_type, link_traffic_params)
+    target_idx, distance, highway_type = link_params
+    return target_idx, distance, highway_type
 
 
-def _make_junction(idx_str: str, lat_str: str, lon_str: str, *link_row: str) -> Junction:
+def _parse_junction_row(idx_str: str, lat_str: str, lon_str: str, *link_row: str) -> _JunctionRow:
     """This function is for local use only"""
     idx, lat, lon = int(idx_str), float(lat_str), float(lon_str)
     try:
-        links = [_make_link(idx, lnk) for lnk in link_row]
-        links = list(filter(lambda lnk: lnk.distance > 0, links))
+        links = [_parse_link(lnk) for lnk in link_row]
+        links = [lnk for lnk in links if lnk[1] > 0]
     except ValueError:
         links = []
-    return Junction(idx, lat, lon, links)
+    return _JunctionRow(idx, lat, lon, links)
+
+
+def _parse_rows(lines: Iterable[str]) -> RoadsArrays:
+    """
+    This function is for local use only.
+    Parses lines of the map file into flat arrays.
+    """
+    import csv
+    indices, lats, lons, offsets = [], [], [], [0]
+    targets, distances, highway_types = [], [], []
+    for row in csv.reader(lines):
+        junction_row = _parse_junction_row(*row)
+        indices.append(junction_row.index)
+        lats.append(junction_row.lat)
+        lons.append(junction_row.lon)
+        for target, distance, highway_type in junction_row.links:
+            targets.append(target)
+            distances.append(distance)
+            highway_types.append(highway_type)
+        offsets.append(len(targets))
+    return RoadsArrays.from_lists(indices=indices, lats=lats, lons=lons, offsets=offsets,
+                                  targets=targets, distances=distances, highway_types=highway_types)
+
+
+def _make_roads(arrays: RoadsArrays, drop_dangling_links: bool) -> Roads:
+    """
+    This function is for local use only.
+    Builds the `Junction`s and `Link`s out of the parsed arrays. The traffic noise
+    parameters of all the links are generated in a single vectorized pass.
+    If a junction index appears more than once, the last row wins.
+    """
+    if drop_dangling_links:
+        arrays = arrays.without_dangling_links()
+    cos_frequencies, sin_frequencies = arrays.traffic_params
+    links = iter(zip(arrays.targets.tolist(), arrays.distances.tolist(), arrays.highway_types.tolist(),
+                     cos_frequencies.tolist(), sin_frequencies.tolist()))
+    junctions = {idx: Junction(idx, lat, lon,
+                               [Link(idx, target, distance, highway_type, LinkTrafficParams(cos_f, sin_f))
+                                for target, distance, highway_type, cos_f, sin_f in islice(links, nr_links)])
+                 for idx, lat, lon, nr_links in zip(arrays.indices.tolist(), arrays.lats.tolist(),
+                                                    arrays.lons.tolist(), np.diff(arrays.offsets).tolist())}
+    roads = Roads(junctions)
+    if len(roads) == arrays.nr_junctions:
+        roads._arrays = arrays
+    return roads
+
+
+def _is_compressed(filename: str) -> bool:
+    """This function is for local use only"""
+    return os.path.splitext(filename)[1].lower() in ('.gz', '.xz', '.lzma', '.zst', '.zstd')
+
+
+def _open_map_file(filename: str) -> TextIO:
+    """
+    This function is for local use only.
+    Opens the map file for reading text. Files compressed with gzip (.gz), xz (.xz, .lzma)
+    or zstd (.zst, .zstd) are decompressed on the fly, while reading.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.gz':
+        import gzip
+        return gzip.open(filename, 'rt')
+    if extension in ('.xz', '.lzma'):
+        import lzma
+        return lzma.open(filename, 'rt')
+    if extension in ('.zst', '.zstd'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('Please install zstandard to read `{}`:  pip install zstandard'.format(filename))
+        import io
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(filename, 'rb'), closefd=True))
+    return open(filename, 'rt')
 
 
 @tools.timed
@@ -110,14 +299,69 @@ def load_map_from_csv(filename: str, start=0, count=sys.maxsize) -> Roads:
     returns graph, encoded as an adjacency list
     @param slice_params can be used to cut part of the file
     example: load_map_from_csv(start=50000, count=50000))
+    The file may be compressed (.gz, .xz or .zst).
     """
 
-    import csv
-    from itertools import islice
-    with open(filename, 'rt') as f:
-        it = islice(f, start, min(start + count, sys.maxsize))
-        lst = {int(row[0]): _make_junction(*row) for row in csv.reader(it)}
-        if count < sys.maxsize:
-            lst = {i: Junction(i, j.lat, j.lon, [lnk for lnk in j.links if lnk.target in lst])
-                   for i, j in lst.items()}
-    return Roads(lst)
+    with _gc_paused():
+        with _open_map_file(filename) as f:
+            it = islice(f, start, min(start + count, sys.maxsize))
+            arrays = _parse_rows(it)
+        return _make_roads(arrays, drop_dangling_links=count < sys.maxsize)
+
+
+def _parse_file_range(filename: str, range_start: int, range_end: int) -> RoadsArrays:
+    """
+    This function is for local use only (runs in the worker processes).
+    Parses the lines of a plain text file that start within the byte range [range_start, range_end).
+    """
+    def lines_in_range(f):
+        position = range_start
+        if range_start > 0:
+            # The line that contains `range_start - 1` belongs to the previous range.
+            f.seek(range_start - 1)
+            position += len(f.readline()) - 1
+        while position < range_end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode('utf-8')
+
+    with open(filename, 'rb') as f:
+        return _parse_rows(lines_in_range(f))
+
+
+def _parse_lines(lines: List[str]) -> RoadsArrays:
+    """This function is for local use only (runs in the worker processes)."""
+    return _parse_rows(lines)
+
+
+@tools.timed
+def load_map_from_csv_parallel(filename: str, start=0, count=sys.maxsize,
+                               processes: Optional[int] = None, lines_per_chunk: int = 20000) -> Roads:
+    """
+    Same as `load_map_from_csv`, but the parsing is done by a pool of `processes` worker processes.
+    A plain text file is split into byte ranges that the workers read by themselves.
+    A compressed file (or a sliced one, using `start` / `count`) is streamed by this
+    process and handed to the workers in chunks of `lines_per_chunk` lines.
+    The parsed chunks are merged, in order, into a single `Roads`.
+    """
+    from multiprocessing import Pool
+    processes = processes or os.cpu_count() or 1
+    is_sliced = start > 0 or count < sys.maxsize
+
+    with Pool(processes) as pool:
+        if not is_sliced and not _is_compressed(filename):
+            file_size = os.path.getsize(filename)
+            nr_ranges = processes * 4
+            ranges = [(filename, file_size * i // nr_ranges, file_size * (i + 1) // nr_ranges)
+                      for i in range(nr_ranges)]
+            chunks = pool.starmap(_parse_file_range, ranges)
+        else:
+            with _open_map_file(filename) as f:
+                it = islice(f, start, min(start + count, sys.maxsize))
+                line_chunks = iter(lambda: list(islice(it, lines_per_chunk)), [])
+                chunks = list(pool.imap(_parse_lines, line_chunks))
+
+    with _gc_paused():
+        return _make_roads(RoadsArrays.concatenate(chunks), drop_dangling_links=count < sys.maxsize)
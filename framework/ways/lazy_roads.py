@@ -0,0 +1,57 @@
+"""
+ A handle to a map that is loaded only when it is first used.
+ Usage:
+ >>> roads = LazyRoads(Consts.get_data_file_path("tlv.csv"))  # nothing is loaded yet
+ >>> problem = MapProblem(roads.get(), 54, 549)  # the map is loaded here (once)
+"""
+
+from .graph import Roads, load_map_from_csv
+
+from typing import Callable, Optional
+
+__all__ = ['LazyRoads']
+
+
+class LazyRoads:
+    """
+    Loads the map on the first call to `get()` and returns the same `Roads` afterwards.
+    Files ending with `.roads` are loaded as snapshots (see `Roads.load_snapshot()`),
+    and other files with `load_map_from_csv()`, unless another `loader` is given.
+    For convenience, attribute access and `[]`, `in`, `len`, iteration are forwarded to the loaded map.
+    """
+
+    def __init__(self, filename: str, loader: Optional[Callable[[str], Roads]] = None):
+        self.filename = filename
+        if loader is None:
+            loader = Roads.load_snapshot if filename.endswith('.roads') else load_map_from_csv
+        self._loader = loader
+        self._roads: Optional[Roads] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._roads is not None
+
+    def get(self) -> Roads:
+        if self._roads is None:
+            self._roads = self._loader(self.filename)
+        return self._roads
+
+    def __getattr__(self, name):
+        if name.startswith('_'):  # not forwarded (avoids recursion before `__init__` and when pickling)
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+    def __getitem__(self, junction_id):
+        return self.get()[junction_id]
+
+    def __contains__(self, junction_id) -> bool:
+        return junction_id in self.get()
+
+    def __len__(self) -> int:
+        return len(self.get())
+
+    def __iter__(self):
+        return iter(self.get())
+
+    def __repr__(self):
+        return 'LazyRoads({!r}, loaded={})'.format(self.filename, self.is_loaded)
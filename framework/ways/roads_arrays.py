@@ -0,0 +1,329 @@
+"""
+ A flat (struct-of-arrays) representation of a road map.
+ The adjacency is stored in CSR form: the outgoing links of the junction
+ stored in position `i` are the entries `offsets[i]:offsets[i+1]` of the
+ per-link arrays.
+"""
+
+from . import tools
+
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:  # imported on first use
+    from .spatial_index import SpatialIndex
+
+
+"""The cost models that can be used for the per-link costs (see `RoadsArrays.link_costs()`)."""
+AIR_DISTANCE_COST = 'air_distance'  # The air distance between the link's junctions (as `calc_air_distance_from()`).
+DISTANCE_COST = 'distance'  # `Link.distance`.
+HIGHWAY_WEIGHTED_COST = 'highway_weighted'  # `Link.distance` multiplied by a per-highway-type weight.
+COST_MODELS = (AIR_DISTANCE_COST, DISTANCE_COST, HIGHWAY_WEIGHTED_COST)
+
+"""Highway types are numbered from the fastest (0) to the slowest. By default each slower type costs 10% more."""
+DEFAULT_HIGHWAY_TYPE_WEIGHTS = tuple(1 + 0.1 * highway_type for highway_type in range(20))
+
+
+class RoadsArrays:
+    """
+    Flat NumPy arrays describing a road map:
+        indices        - junction index (id) of each junction position.
+        lats, lons     - coordinates of each junction position.
+        offsets        - CSR offsets into the per-link arrays (length nr_junctions + 1).
+        targets        - target junction index (id) of each link.
+        distances      - `Link.distance` of each link.
+        highway_types  - `Link.highway_type` of each link.
+    The arrays may be backed by a memory-mapped snapshot file (read only).
+    Code that reads single elements in a loop (the search problems and the graph views) wraps these
+     arrays in `memoryview`s: indexing a memoryview yields plain python numbers, which is much faster
+     than indexing a numpy array (and gives python floats/ints rather than numpy scalars).
+    """
+
+    ARRAY_NAMES = ('indices', 'lats', 'lons', 'offsets', 'targets', 'distances', 'highway_types')
+    DTYPES = {
+        'indices': np.int64,
+        'lats': np.float64,
+        'lons': np.float64,
+        'offsets': np.int64,
+        'targets': np.int64,
+        'distances': np.int32,
+        'highway_types': np.int16,
+    }
+
+    def __init__(self, indices: np.ndarray, lats: np.ndarray, lons: np.ndarray, offsets: np.ndarray,
+                 targets: np.ndarray, distances: np.ndarray, highway_types: np.ndarray):
+        assert len(indices) == len(lats) == len(lons) == len(offsets) - 1
+        assert len(targets) == len(distances) == len(highway_types) == offsets[-1]
+        self.indices = indices
+        self.lats = lats
+        self.lons = lons
+        self.offsets = offsets
+        self.targets = targets
+        self.distances = distances
+        self.highway_types = highway_types
+        self._junction_id_to_position: Optional[Dict[int, int]] = None
+        self._positions_are_indices: Optional[bool] = None
+        self._traffic_params: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._geodesic_terms: Optional[tools.GeodesicTerms] = None
+        self._target_positions: Optional[np.ndarray] = None
+        self._reverse_links: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._reverse_link_sources: Optional[np.ndarray] = None
+        self._link_costs: Dict[Tuple, np.ndarray] = {}
+        self._reverse_link_costs: Dict[Tuple, np.ndarray] = {}
+        self._traffic_multipliers: Dict[int, np.ndarray] = {}
+        self._fifo_travel_times: Dict[Tuple, np.ndarray] = {}
+        self._spatial_index = None
+
+    @staticmethod
+    def from_junctions(junctions: Iterable) -> 'RoadsArrays':
+        """
+        Builds the arrays out of junction objects (anything with `index`, `lat`, `lon` and `links`).
+        The order of the junctions is preserved.
+        """
+        indices, lats, lons, offsets = [], [], [], [0]
+        targets, distances, highway_types = [], [], []
+        for junction in junctions:
+            indices.append(junction.index)
+            lats.append(junction.lat)
+            lons.append(junction.lon)
+            for link in junction.links:
+                targets.append(link.target)
+                distances.append(link.distance)
+                highway_types.append(link.highway_type)
+            offsets.append(len(targets))
+        return RoadsArrays.from_lists(indices=indices, lats=lats, lons=lons, offsets=offsets,
+                                      targets=targets, distances=distances, highway_types=highway_types)
+
+    @staticmethod
+    def from_lists(**lists) -> 'RoadsArrays':
+        return RoadsArrays(**{name: np.asarray(lists[name], dtype=RoadsArrays.DTYPES[name])
+                              for name in RoadsArrays.ARRAY_NAMES})
+
+    @staticmethod
+    def concatenate(parts: List['RoadsArrays']) -> 'RoadsArrays':
+        """Concatenates the junctions (and their links) of several arrays, in order."""
+        link_offsets = np.cumsum([0] + [part.nr_links for part in parts])
+        offsets = [np.zeros(1, dtype=np.int64)] + [part.offsets[1:] + link_offset
+                                                   for part, link_offset in zip(parts, link_offsets)]
+        concatenated = {name: np.concatenate([getattr(part, name) for part in parts]
+                                             or [np.zeros(0, dtype=RoadsArrays.DTYPES[name])])
+                        for name in RoadsArrays.ARRAY_NAMES if name != 'offsets'}
+        return RoadsArrays(offsets=np.concatenate(offsets), **concatenated)
+
+    def without_dangling_links(self) -> 'RoadsArrays':
+        """Returns a copy without the links whose target is not one of the junctions."""
+        links_mask = np.isin(self.targets, self.indices)
+        return self.with_links_mask(links_mask)
+
+    def with_links_mask(self, links_mask: np.ndarray) -> 'RoadsArrays':
+        """Returns a copy that keeps only the links selected by the given boolean mask."""
+        kept_links_prefix_count = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(links_mask, dtype=np.int64)])
+        return RoadsArrays(indices=self.indices, lats=self.lats, lons=self.lons,
+                           offsets=kept_links_prefix_count[self.offsets],
+                           targets=self.targets[links_mask], distances=self.distances[links_mask],
+                           highway_types=self.highway_types[links_mask])
+
+    @property
+    def nr_junctions(self) -> int:
+        return len(self.indices)
+
+    @property
+    def nr_links(self) -> int:
+        return len(self.targets)
+
+    @property
+    def sources(self) -> np.ndarray:
+        """The source junction index (id) of each link."""
+        return np.repeat(self.indices, np.diff(self.offsets))
+
+    @property
+    def traffic_params(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The `LinkTrafficParams` of all the links, as (cos_frequencies, sin_frequencies) arrays.
+        Generated in a single vectorized pass on first use.
+        """
+        if self._traffic_params is None:
+            self._traffic_params = tools.generate_traffic_noise_params_many(self.sources, self.targets)
+        return self._traffic_params
+
+    @property
+    def geodesic_terms(self) -> tools.GeodesicTerms:
+        """The per-junction trigonometric terms used for air distances. Computed on first use."""
+        if self._geodesic_terms is None:
+            self._geodesic_terms = tools.GeodesicTerms.of(self.lats, self.lons)
+        return self._geodesic_terms
+
+    def air_distances(self, source_positions, target_positions) -> np.ndarray:
+        """
+        Air distances (as `compute_distance`, see `tools.compute_distances_between`) between the
+         junctions in the given positions. The positions arrays are broadcast against each other.
+        """
+        terms = self.geodesic_terms
+        return tools.compute_distances_between(terms.take(source_positions), terms.take(target_positions))
+
+    @property
+    def spatial_index(self) -> 'SpatialIndex':
+        """A grid index over the junctions coordinates (see `spatial_index.py`). Built on first use."""
+        if self._spatial_index is None:
+            from .spatial_index import SpatialIndex
+            self._spatial_index = SpatialIndex(self.indices, self.geodesic_terms)
+        return self._spatial_index
+
+    @property
+    def source_positions(self) -> np.ndarray:
+        """The position of the source junction of each link."""
+        return np.repeat(np.arange(self.nr_junctions), np.diff(self.offsets))
+
+    @property
+    def target_positions(self) -> np.ndarray:
+        """The position of the target junction of each link (-1 for a target that is not in the map)."""
+        if self._target_positions is None:
+            if self.positions_are_indices:
+                in_map = (self.targets >= 0) & (self.targets < self.nr_junctions)
+                self._target_positions = np.where(in_map, self.targets, -1)
+            else:
+                id_to_position = self._id_to_position_map()
+                self._target_positions = np.fromiter(
+                    (id_to_position.get(target, -1) for target in self.targets.tolist()),
+                    dtype=np.int64, count=self.nr_links)
+        return self._target_positions
+
+    @property
+    def reverse_links(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The incoming links of each junction, in CSR form: (reverse_offsets, link_positions, source_positions).
+        The incoming links of the junction in position `i` are the links in the positions
+        `link_positions[reverse_offsets[i]:reverse_offsets[i+1]]` of the per-link arrays, and
+        `source_positions` (in the same order) are the positions of their source junctions.
+        Links whose target is not in the map are excluded. Built on first use.
+        """
+        if self._reverse_links is None:
+            target_positions = self.target_positions
+            link_positions = np.flatnonzero(target_positions >= 0)
+            link_positions = link_positions[np.argsort(target_positions[link_positions], kind='stable')]
+            nr_incoming_links = np.bincount(target_positions[link_positions], minlength=self.nr_junctions)
+            reverse_offsets = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(nr_incoming_links)])
+            self._reverse_links = (reverse_offsets, link_positions, self.source_positions[link_positions])
+        return self._reverse_links
+
+    @property
+    def reverse_link_sources(self) -> np.ndarray:
+        """
+        The junction index (id) of the source junction of each incoming link, in the order of
+        `reverse_links` (the targets of the links when moving along them backwards). Built on first use.
+        """
+        if self._reverse_link_sources is None:
+            _, _, source_positions = self.reverse_links
+            self._reverse_link_sources = self.indices[source_positions]
+            self._reverse_link_sources.setflags(write=False)
+        return self._reverse_link_sources
+
+    def link_costs(self, cost_model: str = AIR_DISTANCE_COST,
+                   highway_type_weights: Sequence[float] = DEFAULT_HIGHWAY_TYPE_WEIGHTS) -> np.ndarray:
+        """
+        The cost of each link under the given cost model (one of `COST_MODELS`).
+        Computed once per cost model, on first use. The cost of a link whose
+        target is not in the map is infinite.
+        """
+        cache_key = self._link_costs_key(cost_model, highway_type_weights)
+        if cache_key not in self._link_costs:
+            if cost_model == AIR_DISTANCE_COST:
+                costs = self.air_distances(self.source_positions, self.target_positions)
+            elif cost_model == DISTANCE_COST:
+                costs = self.distances.astype(np.float64)
+            else:
+                costs = self.distances * np.asarray(highway_type_weights, dtype=np.float64)[self.highway_types]
+            costs[self.target_positions < 0] = np.inf
+            costs.setflags(write=False)
+            self._link_costs[cache_key] = costs
+        return self._link_costs[cache_key]
+
+    def reverse_link_costs(self, cost_model: str = AIR_DISTANCE_COST,
+                           highway_type_weights: Sequence[float] = DEFAULT_HIGHWAY_TYPE_WEIGHTS) -> np.ndarray:
+        """
+        The costs (see `link_costs()`) of the incoming links, in the order of `reverse_links`.
+        Computed once per cost model, on first use.
+        """
+        cache_key = self._link_costs_key(cost_model, highway_type_weights)
+        if cache_key not in self._reverse_link_costs:
+            _, link_positions, _ = self.reverse_links
+            costs = self.link_costs(cost_model, highway_type_weights)[link_positions]
+            costs.setflags(write=False)
+            self._reverse_link_costs[cache_key] = costs
+        return self._reverse_link_costs[cache_key]
+
+    @staticmethod
+    def _link_costs_key(cost_model: str, highway_type_weights: Sequence[float]) -> Tuple:
+        if cost_model not in COST_MODELS:
+            raise ValueError('Unknown cost model `{}`. Use one of: {}.'.format(cost_model, ', '.join(COST_MODELS)))
+        return (cost_model, tuple(highway_type_weights)) if cost_model == HIGHWAY_WEIGHTED_COST else (cost_model,)
+
+    def traffic_multipliers(self, bucket_minutes: int = 60) -> np.ndarray:
+        """
+        The (nr_links, nr_buckets) table of the traffic multipliers of the links, per time
+        bucket of `bucket_minutes` minutes (see `traffic.py`). Computed once per bucket size, on first use.
+        """
+        if bucket_minutes not in self._traffic_multipliers:
+            from .traffic import traffic_multipliers
+            multipliers = traffic_multipliers(*self.traffic_params, bucket_minutes=bucket_minutes)
+            multipliers.setflags(write=False)
+            self._traffic_multipliers[bucket_minutes] = multipliers
+        return self._traffic_multipliers[bucket_minutes]
+
+    def fifo_travel_times(self, bucket_minutes: int = 60, cost_model: str = AIR_DISTANCE_COST,
+                          highway_type_speeds: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        The (nr_links, nr_buckets) table of the FIFO travel times (in minutes) of the links at the
+        start of each time bucket, with the link lengths of `cost_model` and the free-flow speeds
+        `highway_type_speeds` (by default `traffic.DEFAULT_HIGHWAY_TYPE_SPEEDS`). See `traffic.py`.
+        Computed once per bucket size, cost model and speeds, on first use.
+        """
+        from .traffic import DEFAULT_HIGHWAY_TYPE_SPEEDS, fifo_travel_times, free_flow_minutes
+        highway_type_speeds = tuple(highway_type_speeds or DEFAULT_HIGHWAY_TYPE_SPEEDS)
+        cache_key = (bucket_minutes, cost_model, highway_type_speeds)
+        if cache_key not in self._fifo_travel_times:
+            free_flow_times = free_flow_minutes(self.link_costs(cost_model), self.highway_types, highway_type_speeds)
+            travel_times = fifo_travel_times(free_flow_times, self.traffic_multipliers(bucket_minutes), bucket_minutes)
+            travel_times.setflags(write=False)
+            self._fifo_travel_times[cache_key] = travel_times
+        return self._fifo_travel_times[cache_key]
+
+    @property
+    def positions_are_indices(self) -> bool:
+        """Whether the junction stored in position `i` has the index `i` (the common case)."""
+        if self._positions_are_indices is None:
+            self._positions_are_indices = bool(np.array_equal(self.indices, np.arange(self.nr_junctions)))
+        return self._positions_are_indices
+
+    def position_of(self, junction_id: int) -> int:
+        """Returns the position of the given junction index, or raises `KeyError`."""
+        if self.positions_are_indices:
+            if isinstance(junction_id, (int, np.integer)) and 0 <= junction_id < self.nr_junctions:
+                return int(junction_id)
+            raise KeyError(junction_id)
+        return self._id_to_position_map()[junction_id]
+
+    def _id_to_position_map(self) -> Dict[int, int]:
+        if self._junction_id_to_position is None:
+            self._junction_id_to_position = {junction_id: position
+                                             for position, junction_id in enumerate(self.indices.tolist())}
+        return self._junction_id_to_position
+
+    def positions_of(self, junction_ids) -> np.ndarray:
+        """Vectorized version of `position_of()`."""
+        junction_ids = np.asarray(junction_ids, dtype=np.int64)
+        if self.positions_are_indices:
+            if junction_ids.size and (junction_ids.min() < 0 or junction_ids.max() >= self.nr_junctions):
+                raise KeyError('Some of the given junction indices are not in the map.')
+            return junction_ids
+        return np.vectorize(self.position_of, otypes=[np.int64])(junction_ids)
+
+    def has_junction(self, junction_id: int) -> bool:
+        try:
+            self.position_of(junction_id)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def links_range(self, position: int) -> range:
+        return range(int(self.offsets[position]), int(self.offsets[position + 1]))
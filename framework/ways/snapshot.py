@@ -0,0 +1,107 @@
+"""
+ Binary snapshots of a road map.
+ A snapshot stores the flat CSR arrays of `RoadsArrays` in a single file,
+ so that loading it is done by memory-mapping the file instead of parsing the CSV.
+ Usage:
+ >>> roads = load_map_from_csv(Consts.get_data_file_path("tlv.csv"))
+ >>> roads.save_snapshot(Consts.get_data_file_path("tlv.roads"))
+ >>> roads = Roads.load_snapshot(Consts.get_data_file_path("tlv.roads"))
+"""
+
+from . import tools
+from .graph import Roads, Junction, Link, LinkTrafficParams
+from .compact_graph import CompactRoads
+from .roads_arrays import RoadsArrays
+
+import json
+import mmap
+import struct
+import numpy as np
+from typing import Union
+
+__all__ = ['save_snapshot', 'load_snapshot', 'SnapshotRoads']
+
+SNAPSHOT_MAGIC = b'ROADSNAP'
+SNAPSHOT_VERSION = 1
+_HEADER_PREFIX = struct.Struct('<8sII')  # magic, version, json header length
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def save_snapshot(roads: Union[Roads, RoadsArrays], filename: str):
+    """
+    Writes the map into a single binary file:
+    a small header (magic, version and a JSON description of the arrays)
+    followed by the raw arrays, each aligned to 64 bytes.
+    """
+    arrays = roads if isinstance(roads, RoadsArrays) else roads.arrays
+    arrays_description = []
+    offset = 0
+    for name in RoadsArrays.ARRAY_NAMES:
+        array = np.ascontiguousarray(getattr(arrays, name), dtype=RoadsArrays.DTYPES[name])
+        arrays_description.append({'name': name, 'dtype': array.dtype.str, 'length': len(array), 'offset': offset})
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({'arrays': arrays_description}).encode('ascii')
+    data_start = _align(_HEADER_PREFIX.size + len(header))
+
+    with open(filename, 'wb') as f:
+        f.write(_HEADER_PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+        f.write(header)
+        for description in arrays_description:
+            array = np.ascontiguousarray(getattr(arrays, description['name']), dtype=description['dtype'])
+            f.seek(data_start + description['offset'])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+
+
+def load_snapshot(filename: str, compact: bool = False) -> Union['SnapshotRoads', CompactRoads]:
+    """
+    Memory-maps a snapshot written by `save_snapshot()`.
+    The arrays are read-only views over the mapped file, so the pages are
+    loaded on demand and shared between processes using the same snapshot.
+    :param compact: If set, a `CompactRoads` (junction views) is returned instead
+                    of a `SnapshotRoads` (lazily materialized `Junction` objects).
+    """
+    with open(filename, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, header_length = _HEADER_PREFIX.unpack_from(mapped, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError('File `{}` is not a roads snapshot.'.format(filename))
+    if version != SNAPSHOT_VERSION:
+        raise ValueError('Unsupported roads snapshot version {} in `{}`.'.format(version, filename))
+    header = json.loads(bytes(mapped[_HEADER_PREFIX.size:_HEADER_PREFIX.size + header_length]).decode('ascii'))
+    data_start = _align(_HEADER_PREFIX.size + header_length)
+    arrays = {description['name']: np.frombuffer(mapped, dtype=np.dtype(description['dtype']),
+                                                 count=description['length'],
+                                                 offset=data_start + description['offset'])
+              for description in header['arrays']}
+    roads_type = CompactRoads if compact else SnapshotRoads
+    return roads_type(RoadsArrays(**arrays))
+
+
+class SnapshotRoads(CompactRoads):
+    """
+    A `Roads` graph backed by `RoadsArrays` (typically memory-mapped from a snapshot).
+    In contrast to `CompactRoads`, accessing a junction materializes a regular `Junction`
+    (with its `Link`s) on the first access, and keeps it in the dictionary for later accesses.
+    """
+
+    def __getitem__(self, junction_id: int) -> Junction:
+        junction = dict.get(self, junction_id)
+        if junction is None:
+            junction = self._make_junction(self._arrays.position_of(junction_id))
+            dict.__setitem__(self, junction.index, junction)
+        return junction
+
+    def _make_junction(self, position: int) -> Junction:
+        source_idx = self._indices[position]
+        links = [Link(source_idx, self._targets[i], self._distances[i], self._highway_types[i],
+                      LinkTrafficParams(*tools.generate_traffic_noise_params(source_idx, self._targets[i])))
+                 for i in range(self._offsets[position], self._offsets[position + 1])]
+        return Junction(source_idx, self._lats[position], self._lons[position], links)
+
+    def __reduce__(self):
+        return SnapshotRoads, (self._arrays,)
@@ -0,0 +1,108 @@
+"""
+ A grid-based spatial index over the junctions coordinates.
+ Usage:
+ >>> ids, distances = roads.spatial_index.nearest(32.07, 34.78, k=3)
+ >>> ids, distances = roads.spatial_index.within_radius(32.07, 34.78, radius=500)
+ >>> ids = roads.spatial_index.in_bbox(32.06, 34.77, 32.08, 34.79)
+"""
+
+from . import tools
+
+import numpy as np
+from math import cos, radians, pi
+from typing import Tuple
+
+__all__ = ['SpatialIndex']
+
+"""The number of meters in one degree of latitude, according to `tools.compute_distance`."""
+METERS_PER_LAT_DEGREE = 40000 / (2 * pi) * 1000 * pi / 180
+
+
+class SpatialIndex:
+    """
+    The junctions are bucketed into a uniform grid of (lat, lon) cells. The positions of the
+    junctions are sorted by their cell key (`row * nr_cols + col`), so the junctions of
+    consecutive cells in a grid row are stored contiguously, and a range of cells in a row
+    is found with a single binary search.
+    Candidates are refined using the exact air distance (as `compute_distance`).
+    """
+
+    def __init__(self, indices: np.ndarray, terms: tools.GeodesicTerms, junctions_per_cell: float = 4.0):
+        self.indices = indices
+        self.terms = terms
+        nr_junctions = len(indices)
+        if nr_junctions == 0:
+            self.min_lat = self.min_lon = 0.0
+            self.cell_size = 1.0
+            self.nr_rows = self.nr_cols = 1
+        else:
+            self.min_lat, self.min_lon = float(terms.lats.min()), float(terms.lons.min())
+            lat_span = float(terms.lats.max()) - self.min_lat
+            lon_span = float(terms.lons.max()) - self.min_lon
+            area = max(lat_span, 1e-6) * max(lon_span, 1e-6)
+            self.cell_size = max((area * junctions_per_cell / nr_junctions) ** 0.5, 1e-6)
+            self.nr_rows = int(lat_span / self.cell_size) + 1
+            self.nr_cols = int(lon_span / self.cell_size) + 1
+        keys = self._rows_of(terms.lats) * self.nr_cols + self._cols_of(terms.lons)
+        self._sorted_positions = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._sorted_positions]
+
+    def _rows_of(self, lats) -> np.ndarray:
+        return np.clip(((np.asarray(lats) - self.min_lat) / self.cell_size).astype(np.int64), 0, self.nr_rows - 1)
+
+    def _cols_of(self, lons) -> np.ndarray:
+        return np.clip(((np.asarray(lons) - self.min_lon) / self.cell_size).astype(np.int64), 0, self.nr_cols - 1)
+
+    def _positions_in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """Positions of the junctions in the grid cells that intersect the given bounding box (a superset)."""
+        if max_lat < min_lat or max_lon < min_lon:
+            return np.zeros(0, dtype=np.int64)
+        first_row, last_row = self._rows_of([min_lat, max_lat]).tolist()
+        first_col, last_col = self._cols_of([min_lon, max_lon]).tolist()
+        rows = np.arange(first_row, last_row + 1)
+        starts = np.searchsorted(self._sorted_keys, rows * self.nr_cols + first_col, side='left')
+        ends = np.searchsorted(self._sorted_keys, rows * self.nr_cols + last_col, side='right')
+        return np.concatenate([self._sorted_positions[start:end] for start, end in zip(starts, ends)])
+
+    def in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """The indices of the junctions within the given bounding box (inclusive)."""
+        positions = self._positions_in_bbox(min_lat, min_lon, max_lat, max_lon)
+        lats, lons = self.terms.lats[positions], self.terms.lons[positions]
+        inside = (lats >= min_lat) & (lats <= max_lat) & (lons >= min_lon) & (lons <= max_lon)
+        return self.indices[np.sort(positions[inside])]
+
+    def within_radius(self, lat: float, lon: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The indices of the junctions within `radius` meters from (lat, lon), and their distances.
+        Sorted by the distance.
+        """
+        positions, distances = self._positions_within_radius(lat, lon, radius)
+        return self.indices[positions], distances
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The indices of the `k` junctions nearest to (lat, lon), and their distances.
+        Sorted by the distance.
+        """
+        k = min(k, len(self.indices))
+        if k <= 0:
+            return self.indices[:0], np.zeros(0)
+        # Grow the search radius until it contains `k` junctions. Every junction outside
+        # the radius is farther than the ones inside, so the `k` nearest of those are the answer.
+        radius = self.cell_size * METERS_PER_LAT_DEGREE
+        while True:
+            positions, distances = self._positions_within_radius(lat, lon, radius)
+            if len(positions) >= k:
+                return self.indices[positions[:k]], distances[:k]
+            radius *= 2
+
+    def _positions_within_radius(self, lat: float, lon: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        lat_degrees = radius / METERS_PER_LAT_DEGREE
+        farthest_lat = min(abs(lat) + lat_degrees, 89.9)
+        lon_degrees = min(radius / (METERS_PER_LAT_DEGREE * cos(radians(farthest_lat))), 180.0)
+        positions = self._positions_in_bbox(lat - lat_degrees, lon - lon_degrees, lat + lat_degrees, lon + lon_degrees)
+        distances = tools.compute_distances_between(tools.GeodesicTerms.of(lat, lon), self.terms.take(positions))
+        inside = distances <= radius
+        positions, distances = positions[inside], distances[inside]
+        order = np.lexsort((positions, distances))
+        return positions[order], distances[order]
@@ -0,0 +1,103 @@
+"""
+ Extraction of a region of the map into a smaller, compact `Roads` graph.
+ The junctions of the subgraph are re-indexed as 0..n-1, and the returned graph
+ has an `id_translation` table for translating between the indices of both graphs.
+ Usage:
+ >>> region = roads.subgraph(bbox=(32.06, 34.77, 32.08, 34.79), hops=5)
+ >>> path_in_region = ...  # solve problems on `region`
+ >>> original_id = region.id_translation.to_original(region_junction_id)
+"""
+
+from .graph import Roads, _make_roads
+from .roads_arrays import RoadsArrays
+
+import numpy as np
+from typing import Dict, Iterable, Optional, Tuple
+
+__all__ = ['IdTranslation', 'extract_subgraph']
+
+
+class IdTranslation:
+    """Translates junction indices between a subgraph and the graph it was extracted from."""
+
+    def __init__(self, original_ids: np.ndarray):
+        self.original_ids = original_ids  # subgraph index -> original index
+        self._from_original: Dict[int, int] = {original_id: subgraph_id
+                                               for subgraph_id, original_id in enumerate(original_ids.tolist())}
+
+    def __len__(self):
+        return len(self.original_ids)
+
+    def to_original(self, subgraph_id: int) -> int:
+        return int(self.original_ids[subgraph_id])
+
+    def from_original(self, original_id: int) -> int:
+        """Raises `KeyError` if the junction is not in the subgraph."""
+        return self._from_original[original_id]
+
+    def contains_original(self, original_id: int) -> bool:
+        return original_id in self._from_original
+
+
+def _expand_by_hops(arrays: RoadsArrays, selected: np.ndarray, hops: int) -> np.ndarray:
+    """Adds to the selection the junctions reachable within `hops` links (in either direction)."""
+    source_positions = arrays.source_positions
+    target_positions = arrays.target_positions
+    valid_links = target_positions >= 0
+    source_positions, target_positions = source_positions[valid_links], target_positions[valid_links]
+    for _ in range(hops):
+        expanded = selected.copy()
+        expanded[target_positions[selected[source_positions]]] = True
+        expanded[source_positions[selected[target_positions]]] = True
+        if np.array_equal(expanded, selected):
+            break
+        selected = expanded
+    return selected
+
+
+def extract_subgraph(roads: Roads, bbox: Optional[Tuple[float, float, float, float]] = None,
+                     around: Optional[Iterable[int]] = None, hops: int = 0,
+                     compact: bool = False) -> Roads:
+    """
+    Returns the subgraph induced by the selected junctions:
+     - the junctions within `bbox` = (min_lat, min_lon, max_lat, max_lon), if given.
+     - the junctions in `around` (original indices), if given.
+     - the junctions within `hops` links (in either direction) from the above.
+    Only the links between two selected junctions are kept. The junctions are re-indexed
+    as 0..n-1 (keeping their original order), and the returned graph has an `id_translation`
+    (`IdTranslation`) attribute. The links keep the traffic parameters of the original links.
+    :param compact: If set, a `CompactRoads` is returned instead of a regular `Roads`.
+    Raises `ValueError` if no junction is selected.
+    """
+    arrays = roads.arrays
+    selected = np.zeros(arrays.nr_junctions, dtype=bool)
+    if bbox is not None:
+        selected[arrays.positions_of(roads.spatial_index.in_bbox(*bbox))] = True
+    if around is not None:
+        selected[arrays.positions_of(list(around))] = True
+    selected = _expand_by_hops(arrays, selected, hops)
+
+    kept_positions = np.flatnonzero(selected)
+    if len(kept_positions) == 0:
+        raise ValueError('The subgraph is empty: no junction of the map is selected.')
+    new_position_of = np.full(arrays.nr_junctions + 1, -1, dtype=np.int64)  # the last entry maps the -1 position
+    new_position_of[kept_positions] = np.arange(len(kept_positions))
+    link_targets = new_position_of[arrays.target_positions]
+    links_mask = selected[arrays.source_positions] & (link_targets >= 0)
+
+    # The junctions that are not selected have no kept links, so the links of the selected ones stay contiguous.
+    kept_links = arrays.with_links_mask(links_mask)
+    sub_arrays = RoadsArrays.from_lists(
+        indices=np.arange(len(kept_positions)), lats=arrays.lats[kept_positions], lons=arrays.lons[kept_positions],
+        offsets=np.append(kept_links.offsets[kept_positions], kept_links.nr_links), targets=link_targets[links_mask],
+        distances=kept_links.distances, highway_types=kept_links.highway_types)
+    cos_frequencies, sin_frequencies = arrays.traffic_params
+    sub_arrays._traffic_params = (cos_frequencies[links_mask], sin_frequencies[links_mask])
+
+    if compact:
+        from .compact_graph import CompactRoads
+        subgraph = CompactRoads(sub_arrays)
+    else:
+        subgraph = _make_roads(sub_arrays, drop_dangling_links=False)
+    subgraph.id_translation = IdTranslation(arrays.indices[kept_positions])
+    return subgraph
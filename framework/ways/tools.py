@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from time import clock
+from time import perf_counter as clock
 import zlib
+import numpy as np
 from math import acos, radians, pi
 from numpy import ones, cos, array, sin
 from typing import Tuple, NamedTuple
@@ -17,6 +18,41 @@ def dhash(*data):
     return abs(zlib.adler32(bytes(str(data), 'UTF-8')) * 100) * SEED % 0xffffffff
 
 
+def dhash_many(values: np.ndarray) -> np.ndarray:
+    """
+    Vectorized version of `dhash` for a single integer argument.
+    Returns the same values as `[dhash(int(v)) for v in values]`.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    negative = (values < 0).astype(np.int64)
+    magnitudes = np.abs(values)
+    # `dhash(v)` hashes the string '(<v>,)'. Adler-32 of the n bytes d_0..d_{n-1} is
+    # a = 1 + sum(d_i) and b = n + sum((n - i) * d_i), both modulo 65521.
+    # The p-th digit from the right is always at distance 3 + p from the end of the string,
+    # so both sums can be accumulated digit by digit without building the strings.
+    nr_digits = np.ones(len(values), dtype=np.int64)
+    digits_sum = np.zeros(len(values), dtype=np.int64)
+    weighted_digits_sum = np.zeros(len(values), dtype=np.int64)
+    remainders = magnitudes.copy()
+    for p in range(19):
+        exists = (remainders > 0) | (p == 0)
+        digit_chars = np.where(exists, ord('0') + remainders % 10, 0)
+        digits_sum += digit_chars
+        weighted_digits_sum += (3 + p) * digit_chars
+        nr_digits += (p > 0) & exists
+        remainders //= 10
+        if not remainders.any():
+            break
+    n = nr_digits + 3 + negative
+    a = (1 + ord('(') + ord('-') * negative + digits_sum + ord(',') + ord(')')) % 65521
+    b = (n + ord('(') * n + ord('-') * negative * (n - 1) + weighted_digits_sum
+         + ord(',') * 2 + ord(')')) % 65521
+    adler = ((b << 16) | a).astype(np.uint64)
+    # Same as `abs(adler * 100) * SEED % 0xffffffff`, reduced modulo 0xffffffff first to stay in 64 bits.
+    modulo = np.uint64(0xffffffff)
+    return (adler * np.uint64(100)) % modulo * np.uint64(SEED % 0xffffffff) % modulo
+
+
 ## The move from python 2 to 3 caused some problems.
 
 
@@ -61,6 +97,56 @@ def compute_distance(pnt1: Tuple[float, float], pnt2: Tuple[float, float]) -> fl
     return max(0.0, arc * meter_units_factor * 1000)
 
 
+class GeodesicTerms(NamedTuple):
+    """
+    Per-point terms used by `compute_distances_between`. They depend only on a single point,
+    so they can be computed once per junction and reused by every distance computation.
+    """
+    lats: np.ndarray
+    lons: np.ndarray
+    sin_phis: np.ndarray
+    cos_phis: np.ndarray
+    lon_radians: np.ndarray
+
+    @staticmethod
+    def of(lats, lons) -> 'GeodesicTerms':
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        phis = np.radians(90 - lats)
+        return GeodesicTerms(lats, lons, np.sin(phis), np.cos(phis), np.radians(lons))
+
+    def take(self, positions) -> 'GeodesicTerms':
+        return GeodesicTerms(*(terms[positions] for terms in self))
+
+
+def compute_distances_between(terms1: GeodesicTerms, terms2: GeodesicTerms) -> np.ndarray:
+    """
+    Vectorized version of `compute_distance` (in Meters), broadcasting over the points of
+    `terms1` and `terms2`. It follows the exact same computation, including its special cases
+    (and a cosine rounded out of [-1, 1], for which `compute_distance` fails, is clipped).
+    The distances are within a relative difference of 4 ulps (~1e-15) from those of
+    `compute_distance`: `np.arccos` is vectorized, and might differ from `math.acos` in the
+    last bit (for ~0.1% of the points), which the multiplications below may round once more.
+    """
+    dot = terms1.sin_phis * terms2.sin_phis * cos(terms1.lon_radians - terms2.lon_radians) \
+        + terms1.cos_phis * terms2.cos_phis
+    meter_units_factor = 40000 / (2 * pi)
+    distances = np.maximum(0.0, np.arccos(np.clip(dot, -1.0, 1.0)) * meter_units_factor * 1000)
+    lat_diffs = np.abs(terms1.lats - terms2.lats)
+    lon_diffs = np.abs(terms1.lons - terms2.lons)
+    distances = np.where(np.maximum(lat_diffs, lon_diffs) < 0.00001, 0.001, distances)
+    return np.where((lat_diffs == 0) & (lon_diffs == 0), 0.0, distances)
+
+
+def compute_distances(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """
+    Vectorized version of `compute_distance` (in Meters), broadcasting over the given coordinates arrays.
+    Usage example (a distances matrix):
+    >>> compute_distances(lats[:, np.newaxis], lons[:, np.newaxis], lats[np.newaxis, :], lons[np.newaxis, :])
+    """
+    return compute_distances_between(GeodesicTerms.of(lats1, lons1), GeodesicTerms.of(lats2, lons2))
+
+
 def base_traffic_pattern():
     ''' Creates a base traffic pattern:
             we can go at max speed (divide by 1)
@@ -84,6 +170,18 @@ def generate_traffic_noise_params(seed1, seed2) -> Tuple[float, float]:
     return wavelength_cos, wavelength_sin
 
 
+def generate_traffic_noise_params_many(seeds1: np.ndarray, seeds2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized version of `generate_traffic_noise_params` over arrays of (seed1, seed2) pairs.
+    The returned values are identical to those of the scalar version.
+    """
+    seeds1 = np.asarray(seeds1, dtype=np.int64)
+    seeds2 = np.asarray(seeds2, dtype=np.int64)
+    wavelength_cos = 60 + 20 * (dhash_many(seeds1 + seeds2) / 0xffffffff) - 10
+    wavelength_sin = 60 + 20 * (dhash_many(seeds1 * seeds2) / 0xffffffff) - 10
+    return wavelength_cos, wavelength_sin
+
+
 def timed(f):
     '''decorator for printing the timing of functions
     usage: 
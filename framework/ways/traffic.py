@@ -0,0 +1,74 @@
+"""
+ Time-dependent traffic model of the links.
+ The travel time of a link at a given minute of the day is its free-flow time multiplied by
+ a traffic multiplier: the base traffic pattern (`tools.base_traffic_pattern`, peaks at ~8 and ~17)
+ times a per-link noise, driven by the link's `LinkTrafficParams` frequencies.
+ The multipliers are tabulated per link at the start of each time bucket (e.g. each hour), in
+ a single vectorized pass, so the search never evaluates cosines.
+ Every multiplier is at least 1, so the free-flow time is a lower bound of the travel time.
+
+ FIFO invariant: the travel times of the links are FIFO (first in, first out), i.e. the arrival
+ time `t + travel_time(t)` never decreases as the departure time `t` increases, so leaving later
+ never arrives earlier. This is what makes keeping only the earliest arrival at each junction
+ (as in `TimeDependentMapProblem`) optimal. A step function per bucket is not FIFO: a link that
+ is twice as slow at 9:00 as at 10:00 arrives later if leaving at 9:59 than if leaving at 10:00.
+ So, as in time-dependent Dijkstra, the travel time is interpolated linearly between the bucket
+ starts, and its samples are lowered where needed (see `fifo_travel_times()`) so that it never
+ decreases faster than one minute per minute.
+"""
+
+from . import tools
+
+import numpy as np
+from typing import Sequence
+
+__all__ = ['MINUTES_PER_DAY', 'TRAFFIC_NOISE_AMPLITUDE', 'DEFAULT_HIGHWAY_TYPE_SPEEDS',
+           'traffic_multipliers', 'free_flow_minutes', 'fifo_travel_times']
+
+MINUTES_PER_DAY = 60 * 24
+
+"""The maximal relative slowdown caused by the per-link noise."""
+TRAFFIC_NOISE_AMPLITUDE = 0.25
+
+"""Free-flow speeds (km/h), by highway type (from the fastest type, 0, to the slowest)."""
+DEFAULT_HIGHWAY_TYPE_SPEEDS = tuple(max(110.0 - 7.5 * highway_type, 20.0) for highway_type in range(20))
+
+
+def traffic_multipliers(cos_frequencies: np.ndarray, sin_frequencies: np.ndarray,
+                        bucket_minutes: int = 60) -> np.ndarray:
+    """
+    Returns a (nr_links, nr_buckets) float32 table of the traffic multipliers of the links,
+    sampled at the start of each time bucket of the day.
+    """
+    assert MINUTES_PER_DAY % bucket_minutes == 0
+    bucket_starts = np.arange(0, MINUTES_PER_DAY, bucket_minutes, dtype=np.float64)
+    base_traffic = np.asarray(tools.base_traffic_pattern())[bucket_starts.astype(np.int64)]
+    phases_cos = 2 * np.pi * bucket_starts[np.newaxis, :] / np.asarray(cos_frequencies)[:, np.newaxis]
+    phases_sin = 2 * np.pi * bucket_starts[np.newaxis, :] / np.asarray(sin_frequencies)[:, np.newaxis]
+    noise = (2 + np.cos(phases_cos) + np.sin(phases_sin)) / 4  # in [0, 1]
+    return (base_traffic[np.newaxis, :] * (1 + TRAFFIC_NOISE_AMPLITUDE * noise)).astype(np.float32)
+
+
+def free_flow_minutes(link_lengths: np.ndarray, highway_types: np.ndarray,
+                      highway_type_speeds: Sequence[float] = DEFAULT_HIGHWAY_TYPE_SPEEDS) -> np.ndarray:
+    """The travel time (in minutes) of each link with no traffic, given the link lengths in meters."""
+    meters_per_minute = np.asarray(highway_type_speeds, dtype=np.float64) * 1000 / 60
+    return np.asarray(link_lengths, dtype=np.float64) / meters_per_minute[highway_types]
+
+
+def fifo_travel_times(free_flow_times: np.ndarray, multipliers: np.ndarray, bucket_minutes: int = 60) -> np.ndarray:
+    """
+    Returns the (nr_links, nr_buckets) float64 table of the travel times (in minutes) of the links
+    at the start of each time bucket: the free-flow times times the `multipliers`, lowered where
+    needed so that the travel time never drops by more than `bucket_minutes` from the start of a
+    bucket to the start of the next one (cyclically: the day repeats). Interpolated linearly
+    between the bucket starts, these travel times are FIFO (see above), and are still at least the
+    free-flow times.
+    """
+    travel_times = np.asarray(free_flow_times, dtype=np.float64)[:, np.newaxis] * multipliers
+    nr_buckets = travel_times.shape[1]
+    for _ in range(2):  # the second pass carries the lowering across the end of the day
+        for bucket in reversed(range(nr_buckets)):
+            np.minimum(travel_times[:, bucket], travel_times[:, (bucket + 1) % nr_buckets] + bucket_minutes,
+                       out=travel_times[:, bucket])
+    return travel_times
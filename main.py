@@ -1,12 +1,11 @@
 from framework import *
 from deliveries import *
 
-from matplotlib import pyplot as plt
 import numpy as np
 from typing import List, Union
 
-# Load the map
-roads = load_map_from_csv(Consts.get_data_file_path("tlv.csv"))
+# The map is loaded on first use (`roads.get()`), so importing this module is fast.
+roads = LazyRoads(Consts.get_data_file_path("tlv.csv"))
 
 # Make `np.random` behave deterministic.
 Consts.set_seed()
@@ -26,6 +25,7 @@ def plot_distance_and_expanded_wrt_weight_figure(
     """
     assert len(weights) == len(total_distance) == len(total_expanded)
 
+    from matplotlib import pyplot as plt
     fig, ax1 = plt.subplots()
 
     # TODO: Plot the total distances with ax1. Use `ax1.plot(...)`.
@@ -85,7 +85,7 @@ def map_problem():
     print('Solve the map problem.')
 
     # Ex.8
-    map_prob = MapProblem(roads, 54, 549)
+    map_prob = MapProblem(roads.get(), 54, 549)
     uc = UniformCost()
     res = uc.solve_problem(map_prob)
     print(res)
@@ -129,7 +129,7 @@ def relaxed_deliveries_problem():
     print()
     print('Solve the relaxed deliveries problem.')
 
-    big_delivery = DeliveriesProblemInput.load_from_file('big_delivery.in', roads)
+    big_delivery = DeliveriesProblemInput.load_from_file('big_delivery.in', roads.get())
     big_deliveries_prob = RelaxedDeliveriesProblem(big_delivery)
 
     # Ex.16
@@ -192,6 +192,7 @@ def relaxed_deliveries_problem():
     greedy_best = AStar(MSTAirDistHeuristic, 1)
     cost_greedy = greedy_best.solve_problem(big_deliveries_prob).final_search_node.cost
 
+    from matplotlib import pyplot as plt
     plt.plot(range(K), costs_list, label="Greedy Stochasic")
     plt.plot(range(K), anytime_costs_list, label="Anytime Greedy Stochasic")
     plt.plot(range(K), [cost_astar] * K, label="A*")
@@ -209,9 +210,9 @@ def strict_deliveries_problem():
     print()
     print('Solve the strict deliveries problem.')
 
-    small_delivery = DeliveriesProblemInput.load_from_file('small_delivery.in', roads)
+    small_delivery = DeliveriesProblemInput.load_from_file('small_delivery.in', roads.get())
     small_deliveries_strict_problem = StrictDeliveriesProblem(
-        small_delivery, roads, inner_problem_solver=AStar(AirDistHeuristic))
+        small_delivery, roads.get(), inner_problem_solver=AStar(AirDistHeuristic))
 
     # Ex.26
     # TODO: Call here the function `run_astar_for_weights_in_range()`
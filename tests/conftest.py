@@ -0,0 +1,123 @@
+"""
+Shared setup of the tests. Run them from the repository root with:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import unittest
+from typing import Callable, Iterable, List, Tuple
+
+# The tests import the `framework` and `deliveries` packages of this repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from framework.graph_search import GraphProblem, GraphProblemSolver, GraphProblemState, HeuristicFunction, \
+    SearchResult, UniformCost
+from framework.ways import Junction, Link, Roads
+from framework.ways.graph import LinkTrafficParams
+from framework.ways import tools
+
+
+def make_random_roads(rng: np.random.RandomState, nr_junctions: int = 40, nr_links_per_junction: int = 3,
+                      max_distance: int = 5000, spread: float = 0.05) -> Roads:
+    """
+    A random map of `nr_junctions` junctions in a `spread` x `spread` degrees square near Tel Aviv.
+    Each junction has `nr_links_per_junction` links to other random junctions, of random lengths
+     in [50, `max_distance`) meters and random highway types.
+    """
+    junctions = {}
+    for source in range(nr_junctions):
+        targets = rng.choice([j for j in range(nr_junctions) if j != source], nr_links_per_junction, replace=False)
+        links = [Link(source, int(target), int(rng.randint(50, max_distance)), int(rng.randint(0, 12)),
+                      LinkTrafficParams(*tools.generate_traffic_noise_params(source, int(target))))
+                 for target in targets]
+        junctions[source] = Junction(source, 32.0 + spread * rng.rand(), 34.7 + spread * rng.rand(), links)
+    return Roads(junctions)
+
+
+def random_pairs(nr_junctions: int, nr_pairs: int, seed: int = 1) -> List[Tuple[int, int]]:
+    """`nr_pairs` random (source, target) pairs of the junctions of `make_random_roads()` (some may be equal)."""
+    return [(source, target) for source, target in
+            np.random.RandomState(seed).randint(nr_junctions, size=(nr_pairs, 2)).tolist()]
+
+
+class IndexState(GraphProblemState):
+    def __init__(self, index: int):
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, IndexState) and other.index == self.index
+
+    def __hash__(self):
+        return hash(self.index)
+
+    def __str__(self):
+        return str(self.index)
+
+
+class AdjacencyProblem(GraphProblem):
+    """A graph given by `adjacency[state] = [(successor, operator cost), ...]`, from state 0."""
+
+    name = 'Adjacency'
+
+    def __init__(self, adjacency, goal: int):
+        super(AdjacencyProblem, self).__init__(IndexState(0))
+        self.adjacency = adjacency
+        self.goal = goal
+
+    def expand_state_with_costs(self, state_to_expand):
+        for successor, operator_cost in self.adjacency[state_to_expand.index]:
+            yield IndexState(successor), operator_cost
+
+    def is_goal(self, state) -> bool:
+        return state.index == self.goal
+
+
+class TableHeuristic(HeuristicFunction):
+    """Estimates the `IndexState`s by the `estimates` table of the subclass (0 for the states not in it)."""
+
+    heuristic_name = 'Table'
+    estimates = {}
+
+    def estimate(self, state: IndexState) -> float:
+        return float(self.estimates.get(state.index, 0))
+
+
+def solution_cost(result: SearchResult):
+    """The cost of the solution found, or None if none was found."""
+    return None if result.final_search_node is None else result.final_search_node.cost
+
+
+def assert_valid_path(test_case: unittest.TestCase, problem: GraphProblem, result: SearchResult):
+    """Asserts that the path found goes from the initial state to a goal, by operators of the problem."""
+    path = list(result.final_search_node.traverse_back_to_root())[::-1]
+    test_case.assertEqual(path[0].state, problem.initial_state)
+    test_case.assertTrue(problem.is_goal(path[-1].state))
+    for node in path[1:]:
+        test_case.assertIn((node.state, node.operator_cost),
+                           list(problem.expand_state_with_costs(node.parent_search_node.state)))
+        test_case.assertAlmostEqual(node.cost, node.parent_search_node.cost + node.operator_cost)
+
+
+def assert_optimal_costs(test_case: unittest.TestCase, make_solvers: Iterable[Callable[[], GraphProblemSolver]],
+                         problems: Iterable[GraphProblem]):
+    """
+    Asserts that each solver (made by one of `make_solvers` for each problem) finds a path of each
+     problem (see `assert_valid_path()`) with the cost of the path found by `UniformCost`, or no path
+     if it finds none.
+    """
+    make_solvers = list(make_solvers)
+    for problem in problems:
+        expected_cost = solution_cost(UniformCost().solve_problem(problem))
+        for make_solver in make_solvers:
+            solver = make_solver()
+            with test_case.subTest(solver=solver.solver_name, problem=problem.name):
+                result = solver.solve_problem(problem)
+                if expected_cost is None:
+                    test_case.assertIsNone(result.final_search_node)
+                else:
+                    test_case.assertIsNotNone(result.final_search_node)
+                    test_case.assertAlmostEqual(result.final_search_node.cost, expected_cost)
+                    assert_valid_path(test_case, problem, result)
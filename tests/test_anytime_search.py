@@ -0,0 +1,122 @@
+"""
+Tests that each result of `ARAStar` is within its suboptimality bound, and that the last one is optimal,
+ and that the incumbents of `AnytimeGreedyStochastic` improve within its restarts and time budgets.
+"""
+
+import unittest
+
+import numpy as np
+
+from deliveries import *
+from framework.graph_search import *
+
+from conftest import IndexState, assert_valid_path, make_random_roads, random_pairs, solution_cost
+
+
+class TestARAStar(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0), nr_junctions=200)
+        self.pairs = random_pairs(200, 20)
+
+    def test_results_within_their_bounds(self):
+        nr_improved_solutions = 0
+        for source, target in self.pairs:
+            problem = MapProblem(self.roads, source, target)
+            optimal_result = AStar(AirDistHeuristic).solve_problem(problem)
+            anytime_results = list(ARAStar(AirDistHeuristic, heuristic_weights=(0.9, 0.75, 0.6, 0.5))
+                                   .solve_problem_anytime(problem))
+            if optimal_result.final_search_node is None:
+                self.assertEqual(len(anytime_results), 1)
+                self.assertIsNone(anytime_results[0].search_result.final_search_node)
+                continue
+            optimal_cost = optimal_result.final_search_node.cost
+            costs = [result.search_result.final_search_node.cost for result in anytime_results]
+            bounds = [result.suboptimality_bound for result in anytime_results]
+            for result, cost, bound in zip(anytime_results, costs, bounds):
+                w = result.heuristic_weight
+                self.assertGreaterEqual(bound, 1.0)
+                self.assertLessEqual(bound, max(1.0, w / (1 - w)) + 1e-12)
+                self.assertLessEqual(cost, bound * optimal_cost * (1 + 1e-9))
+            self.assertEqual(costs, sorted(costs, reverse=True))
+            self.assertEqual(bounds, sorted(bounds, reverse=True))
+            self.assertAlmostEqual(costs[-1], optimal_cost)
+            self.assertEqual(bounds[-1], 1.0)
+            nr_improved_solutions += costs[0] > costs[-1] + 1e-9
+        self.assertGreater(nr_improved_solutions, 0)
+
+    def test_bounds_of_weights_below_one_half(self):
+        for source, target in self.pairs:
+            problem = MapProblem(self.roads, source, target)
+            optimal_cost = solution_cost(UniformCost().solve_problem(problem))
+            if optimal_cost is None:
+                continue
+            for result in ARAStar(AirDistHeuristic, heuristic_weights=(0.45, 0.3)).solve_problem_anytime(problem):
+                self.assertEqual(result.suboptimality_bound, 1.0)
+                self.assertAlmostEqual(solution_cost(result.search_result), optimal_cost)
+            first_result = next(ARAStar(AirDistHeuristic, heuristic_weights=(0.6, 0.3)).solve_problem_anytime(problem))
+            self.assertGreaterEqual(first_result.suboptimality_bound, 1.0)
+
+    def test_bound_without_a_positive_lower_bound(self):
+        # The bound falls back to the inflation of the weight, which is below 1 for w < 0.5.
+        root = SearchNode(IndexState(0))
+        goal_node = SearchNode(IndexState(1), root, 5.0)
+        for w, expected_bound in ((0.3, 1.0), (0.5, 1.0), (0.75, 3.0)):
+            self.assertEqual(ARAStar._suboptimality_bound(w, goal_node, {root.state: root}, lambda state: 0.0,
+                                                          [root.state]), expected_bound)
+
+    def test_solve_problem_returns_the_last_result(self):
+        problem = MapProblem(self.roads, *self.pairs[0])
+        solver = ARAStar(AirDistHeuristic)
+        *_, last_result = solver.solve_problem_anytime(problem)
+        result = solver.solve_problem(problem)
+        self.assertEqual(result.final_search_node.cost, last_result.search_result.final_search_node.cost)
+        self.assertEqual(result.nr_expanded_states, last_result.search_result.nr_expanded_states)
+
+
+class TestAnytimeGreedyStochastic(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0), nr_junctions=200)
+        self.problems = [MapProblem(self.roads, source, target) for source, target in random_pairs(200, 10)
+                         if source != target]
+
+    def anytime_results(self, problem: GraphProblem, seed: int = 0, **kwargs):
+        np.random.seed(seed)
+        return list(AnytimeGreedyStochastic(AirDistHeuristic, **kwargs).solve_problem_anytime(problem))
+
+    def test_incumbents_improve(self):
+        nr_improved_solutions = 0
+        for problem in self.problems:
+            optimal_cost = solution_cost(UniformCost().solve_problem(problem))
+            anytime_results = self.anytime_results(problem, max_nr_restarts=10, bound_heuristic_type=AirDistHeuristic)
+            self.assertEqual(len(anytime_results), 10)
+            if optimal_cost is None:
+                self.assertTrue(all(result.search_result.final_search_node is None for result in anytime_results))
+                continue
+            costs = [solution_cost(result.search_result) for result in anytime_results]
+            self.assertEqual(costs, sorted(costs, reverse=True))
+            self.assertGreaterEqual(costs[-1], optimal_cost - 1e-9)
+            for result in anytime_results:
+                self.assertGreaterEqual(result.suboptimality_bound * optimal_cost, costs[-1] - 1e-9)
+            assert_valid_path(self, problem, anytime_results[-1].search_result)
+            nr_expanded_states = [result.search_result.nr_expanded_states for result in anytime_results]
+            self.assertEqual(nr_expanded_states, sorted(nr_expanded_states))
+            nr_improved_solutions += costs[0] > costs[-1] + 1e-9
+        self.assertGreater(nr_improved_solutions, 0)
+
+    def test_seeded_results_repeat(self):
+        problem = self.problems[0]
+        costs = [[solution_cost(result.search_result) for result in self.anytime_results(problem, max_nr_restarts=5)]
+                 for _ in range(2)]
+        self.assertEqual(costs[0], costs[1])
+
+    def test_time_limit(self):
+        time_limit = 0.2
+        problem = self.problems[0]
+        anytime_results = self.anytime_results(problem, max_nr_restarts=10 ** 6, time_limit=time_limit)
+        self.assertLess(len(anytime_results), 10 ** 6)
+        solving_time = anytime_results[-1].search_result.solving_time
+        self.assertGreaterEqual(solving_time, time_limit)
+        self.assertLess(solving_time, time_limit + 1.0)  # the restart running at the time limit is stopped
+        assert_valid_path(self, problem, anytime_results[-1].search_result)
+        self.assertEqual(solution_cost(anytime_results[-1].search_result),
+                         min(solution_cost(result.search_result) for result in anytime_results))
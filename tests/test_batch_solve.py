@@ -0,0 +1,62 @@
+"""
+Tests that the map problems can be pickled, and solved by `solve_matrix()` with spawned workers
+ (the default start method on macOS and Windows).
+"""
+
+import multiprocessing
+import pickle
+import unittest
+
+import numpy as np
+
+from deliveries import *
+from framework.graph_search import *
+from framework.ways import *
+
+from conftest import make_random_roads, solution_cost
+
+
+def expansions(problem: GraphProblem, state: GraphProblemState):
+    return [(str(successor), cost) for successor, cost in problem.expand_state_with_costs(state)]
+
+
+def costs(results):
+    return [[solution_cost(result) for result in row] for row in results]
+
+
+class TestPickledMapProblems(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0))
+        self.map_problems = [MapProblem(self.roads, 0, 7), MapProblem(self.roads, 3, 21, DISTANCE_COST).reversed()]
+        self.time_dependent_problems = [TimeDependentMapProblem(self.roads, 0, 7, departure_time=8.5 * 60)]
+
+    def test_pickle_round_trip(self):
+        for problem in self.map_problems + self.time_dependent_problems:
+            unpickled_problem = pickle.loads(pickle.dumps(problem))
+            self.assertEqual(unpickled_problem.name, problem.name)
+            self.assertEqual(expansions(unpickled_problem, problem.initial_state),
+                             expansions(problem, problem.initial_state))
+
+    def test_solve_matrix_with_spawned_workers(self):
+        batches = [([UniformCost(), AStar(AirDistHeuristic)], self.map_problems),
+                   ([UniformCost(), AStar(TimeDependentAirDistHeuristic)], self.time_dependent_problems)]
+        start_method = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method('spawn', force=True)
+        try:
+            spawned_results = [solve_matrix(solvers, problems, processes=2) for solvers, problems in batches]
+        finally:
+            multiprocessing.set_start_method(start_method, force=True)
+        for (solvers, problems), results in zip(batches, spawned_results):
+            self.assertEqual(costs(results), costs(solve_matrix(solvers, problems, processes=1)))
+
+    def test_solve_matrix_keeps_the_global_random_state(self):
+        solvers = [GreedyStochastic(AirDistHeuristic)]
+        np.random.seed(5)
+        expected_value = np.random.rand()
+        results = []
+        for processes in (1, 2):
+            np.random.seed(5)
+            results.append(solve_matrix(solvers, self.map_problems, processes=processes))
+            self.assertEqual(np.random.rand(), expected_value)
+        self.assertEqual(costs(results[0]), costs(results[1]))
+        self.assertEqual(costs(results[0]), costs(solve_matrix(solvers, self.map_problems)))
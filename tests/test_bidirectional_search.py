@@ -0,0 +1,47 @@
+"""
+Tests that the bidirectional solvers find the costs `UniformCost` finds on random maps.
+"""
+
+import unittest
+
+import numpy as np
+
+from deliveries import *
+from framework.graph_search import *
+from framework.ways import *
+
+from conftest import assert_optimal_costs, make_random_roads, random_pairs, solution_cost
+
+
+def with_parallel_links(roads: Roads) -> Roads:
+    """The map with a second link alongside each link, of half its length (so the second one is the shortest)."""
+    return Roads({junction.index: junction._replace(links=[parallel_link for link in junction.links for parallel_link
+                                                           in (link, link._replace(distance=link.distance // 2))])
+                  for junction in roads.values()})
+
+
+class TestBidirectionalSearch(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0), nr_junctions=60, nr_links_per_junction=2)
+        # Some of the targets cannot be reached, and one of the pairs has source == target.
+        self.pairs = random_pairs(60, 15)
+
+    def solvers(self, cost_model: str):
+        """The solvers with admissible heuristics (the random link lengths are not bounded by the air distance)."""
+        solvers = [BidirectionalUniformCost, lambda: BidirectionalAStar(LandmarkHeuristic)]
+        if cost_model == AIR_DISTANCE_COST:
+            solvers.append(lambda: BidirectionalAStar(AirDistHeuristic))
+        return solvers
+
+    def test_like_uniform_cost(self):
+        self.assertTrue(any(source == target for source, target in self.pairs))
+        for cost_model in (AIR_DISTANCE_COST, DISTANCE_COST):
+            problems = [MapProblem(self.roads, source, target, cost_model) for source, target in self.pairs]
+            self.assertTrue(any(solution_cost(UniformCost().solve_problem(problem)) is None for problem in problems))
+            assert_optimal_costs(self, self.solvers(cost_model), problems)
+
+    def test_parallel_links(self):
+        roads = with_parallel_links(self.roads)
+        self.assertEqual(len(roads.arrays.targets), 2 * len(self.roads.arrays.targets))
+        assert_optimal_costs(self, self.solvers(DISTANCE_COST),
+                             [MapProblem(roads, source, target, DISTANCE_COST) for source, target in self.pairs])
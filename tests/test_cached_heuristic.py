@@ -0,0 +1,74 @@
+"""
+Tests the hits, misses and LRU evictions of `CachedHeuristicFunction`, and searches with a `CachedHeuristic`.
+"""
+
+import unittest
+
+import numpy as np
+
+from deliveries import *
+from framework.graph_search import *
+
+from conftest import AdjacencyProblem, IndexState, make_random_roads, solution_cost
+
+
+class CountingHeuristic(HeuristicFunction):
+    """Estimates a state by its index, and records the states it was called with."""
+
+    heuristic_name = 'Counting'
+
+    def __init__(self, problem: GraphProblem):
+        super(CountingHeuristic, self).__init__(problem)
+        self.estimated_indices = []
+
+    def estimate(self, state: IndexState) -> float:
+        self.estimated_indices.append(state.index)
+        return float(state.index)
+
+
+class TestCachedHeuristic(unittest.TestCase):
+    def setUp(self):
+        self.problem = AdjacencyProblem([[(1, 1), (2, 1)], [(3, 1)], [(3, 5)], []], goal=3)
+
+    def estimate(self, heuristic: CachedHeuristicFunction, indices):
+        return [heuristic.estimate(IndexState(index)) for index in indices]
+
+    def test_hits_and_misses(self):
+        heuristic = CachedHeuristic(CountingHeuristic, max_entries=None)(self.problem)
+        self.assertEqual(self.estimate(heuristic, [0, 1, 0, 2, 1, 0]), [0.0, 1.0, 0.0, 2.0, 1.0, 0.0])
+        self.assertEqual(heuristic.estimated_indices, [0, 1, 2])  # forwarded to the wrapped heuristic
+        self.assertEqual(heuristic.cache_info(), HeuristicCacheInfo(hits=3, misses=3, evictions=0, size=3,
+                                                                    max_entries=None))
+        heuristic.cache_clear()
+        self.estimate(heuristic, [1])
+        self.assertEqual(heuristic.estimated_indices, [0, 1, 2, 1])
+        self.assertEqual(heuristic.cache_info(), HeuristicCacheInfo(hits=3, misses=4, evictions=0, size=1,
+                                                                    max_entries=None))
+
+    def test_least_recently_used_is_evicted(self):
+        heuristic = CachedHeuristic(CountingHeuristic, max_entries=2)(self.problem)
+        self.estimate(heuristic, [0, 1, 0])  # 1 is now the least recently used
+        self.estimate(heuristic, [2])  # evicts 1
+        self.assertEqual(heuristic.cache_info(), HeuristicCacheInfo(hits=1, misses=3, evictions=1, size=2,
+                                                                    max_entries=2))
+        self.estimate(heuristic, [0, 2])  # both cached
+        self.estimate(heuristic, [1])  # evicts 0
+        self.estimate(heuristic, [2, 0])  # 2 is cached, 0 is not (and evicts 1)
+        self.assertEqual(heuristic.estimated_indices, [0, 1, 2, 1, 0])
+        self.assertEqual(heuristic.cache_info(), HeuristicCacheInfo(hits=4, misses=5, evictions=3, size=2,
+                                                                    max_entries=2))
+
+    def test_search_with_a_cached_heuristic(self):
+        roads = make_random_roads(np.random.RandomState(0))
+        problem = MapProblem(roads, 0, 7)
+        result = AStar(AirDistHeuristic, collect_stats=True).solve_problem(problem)
+        for max_entries in (None, 5):
+            cached_result = AStar(CachedHeuristic(AirDistHeuristic, max_entries), collect_stats=True) \
+                .solve_problem(problem)
+            self.assertEqual(solution_cost(cached_result), solution_cost(result))
+            self.assertEqual(cached_result.nr_expanded_states, result.nr_expanded_states)
+            stats = cached_result.stats
+            self.assertEqual(stats.nr_heuristic_cache_hits + stats.nr_heuristic_cache_misses, stats.nr_heuristic_calls)
+            self.assertEqual(stats.nr_heuristic_calls, result.stats.nr_heuristic_calls)
+            self.assertGreater(stats.nr_heuristic_cache_hits, 0)
+            self.assertEqual(stats.nr_heuristic_cache_evictions > 0, max_entries is not None)
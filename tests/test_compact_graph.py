@@ -0,0 +1,70 @@
+"""
+Tests that the links of `CompactRoads` and `SnapshotRoads` can be used like the `Link`s of `Roads`.
+"""
+
+import os
+import tempfile
+import unittest
+
+from framework.ways import *
+from framework.ways.graph import LinkTrafficParams
+from framework.ways.snapshot import save_snapshot, load_snapshot
+from framework.ways import tools
+
+
+def make_roads() -> Roads:
+    edges = {0: [(1, 120, 2), (2, 300, 5)], 1: [(2, 80, 1)], 2: [(0, 310, 5)]}
+    coordinates = {0: (32.10, 34.80), 1: (32.11, 34.80), 2: (32.10, 34.81)}
+    return Roads({source: Junction(source, lat, lon,
+                                   [Link(source, target, distance, highway_type,
+                                         LinkTrafficParams(*tools.generate_traffic_noise_params(source, target)))
+                                    for target, distance, highway_type in edges[source]])
+                  for source, (lat, lon) in coordinates.items()})
+
+
+class TestLinkViews(unittest.TestCase):
+    def assert_links_like_roads(self, roads: Roads, other_roads):
+        for junction_id, junction in roads.items():
+            for link, other_link in zip(junction.links, other_roads[junction_id].links):
+                self.assertEqual(len(other_link), len(link))
+                self.assertEqual(tuple(other_link), tuple(link))
+                self.assertEqual(other_link[:4], link[:4])
+                self.assertEqual(other_link[-1], link.link_params)
+                source, target, distance, highway_type, *_ = other_link
+                self.assertEqual((source, target, distance, highway_type), tuple(link[:4]))
+                self.assertEqual(other_link, link)
+
+    def test_compact_roads(self):
+        roads = make_roads()
+        self.assert_links_like_roads(roads, CompactRoads.from_roads(roads))
+
+    def test_snapshot_roads(self):
+        roads = make_roads()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'roads.snapshot')
+            save_snapshot(roads, filename)
+            for compact in (False, True):
+                self.assert_links_like_roads(roads, load_snapshot(filename, compact=compact))
+
+
+class TestCompactRoadsAsDict(unittest.TestCase):
+    def test_len_and_bool(self):
+        roads = CompactRoads.from_roads(make_roads())
+        self.assertEqual(len(roads), 3)
+        self.assertTrue(roads)
+
+    def test_equality(self):
+        roads = make_roads()
+        compact_roads = CompactRoads.from_roads(roads)
+        self.assertEqual(compact_roads, CompactRoads.from_roads(make_roads()))
+        self.assertEqual(compact_roads, roads)
+        self.assertEqual(roads, compact_roads)
+        self.assertFalse(compact_roads != roads)
+        other_roads = make_roads()
+        del other_roads[2]
+        self.assertNotEqual(compact_roads, CompactRoads.from_roads(other_roads))
+        self.assertNotEqual(compact_roads, {})
+        self.assertNotEqual(compact_roads, other_roads)
+
+    def test_repr(self):
+        self.assertEqual(repr(CompactRoads.from_roads(make_roads())), 'CompactRoads(nr_junctions=3, nr_links=4)')
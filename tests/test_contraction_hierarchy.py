@@ -0,0 +1,93 @@
+"""
+Tests that the queries of `ContractionHierarchy` find the costs of the shortest paths, that a
+ hierarchy can be saved and loaded back, and that it is imported on first use.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+from deliveries import *
+from framework.graph_search import *
+from framework.ways import *
+from framework.ways import ContractionHierarchy
+
+from conftest import assert_optimal_costs, make_random_roads, random_pairs, solution_cost
+
+
+class TestContractionHierarchy(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0), nr_junctions=60, nr_links_per_junction=2)
+        self.pairs = random_pairs(60, 40)
+
+    def other_maps(self):
+        """Maps with the same numbers of junctions and links: with other links, and with other air distance costs."""
+        other_links_roads = make_random_roads(np.random.RandomState(2), nr_junctions=60, nr_links_per_junction=2)
+        other_coordinates_roads = make_random_roads(np.random.RandomState(0), nr_junctions=60, nr_links_per_junction=2,
+                                                    spread=0.06)
+        np.testing.assert_array_equal(other_coordinates_roads.arrays.targets, self.roads.arrays.targets)
+        return [other_links_roads, other_coordinates_roads]
+
+    def assert_costs_like_uniform_cost(self, hierarchy: ContractionHierarchy, cost_model: str):
+        problems = [MapProblem(self.roads, source, target, cost_model, reverse_links=reverse_links)
+                    for source, target in self.pairs for reverse_links in (False, True)]
+        assert_optimal_costs(self, [lambda: ContractionHierarchySolver(hierarchy)], problems)
+
+    def test_query_costs_are_the_shortest(self):
+        for cost_model in (AIR_DISTANCE_COST, DISTANCE_COST):
+            for max_degree in (32, 4):  # with a core, and without one
+                hierarchy = ContractionHierarchy.build(self.roads, cost_model=cost_model, max_degree=max_degree)
+                self.assertEqual(hierarchy.nr_contracted == hierarchy.nr_junctions, max_degree == 32)
+                self.assert_costs_like_uniform_cost(hierarchy, cost_model)
+
+    def test_astar_costs(self):
+        hierarchy = ContractionHierarchy.build(self.roads)
+        for source, target in self.pairs:
+            problem = MapProblem(self.roads, source, target)
+            path = hierarchy.shortest_path(source, target)
+            expected_cost = solution_cost(AStar(AirDistHeuristic).solve_problem(problem))
+            if expected_cost is None:
+                self.assertIsNone(path)
+            else:
+                self.assertAlmostEqual(path[0], expected_cost)
+                self.assertEqual((path[1][0], path[1][-1]), (source, target))
+
+    def test_save_and_load(self):
+        hierarchy = ContractionHierarchy.build(self.roads, max_degree=4)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'roads.ch')  # without the `.npz` suffix
+            hierarchy.save(filename)
+            self.assertEqual(os.listdir(directory), ['roads.ch'])
+            loaded_hierarchy = ContractionHierarchy.load(filename, self.roads)
+            for other_roads in self.other_maps():
+                with self.assertRaises(ValueError):
+                    ContractionHierarchy.load(filename, other_roads)
+        self.assertEqual(loaded_hierarchy.cost_model, AIR_DISTANCE_COST)
+        self.assertEqual(loaded_hierarchy.nr_contracted, hierarchy.nr_contracted)
+        for name in ContractionHierarchy.ARRAY_NAMES:
+            np.testing.assert_array_equal(getattr(loaded_hierarchy, name), getattr(hierarchy, name))
+        self.assert_costs_like_uniform_cost(loaded_hierarchy, AIR_DISTANCE_COST)
+
+    def test_hierarchy_of_another_map_is_rejected(self):
+        hierarchy = ContractionHierarchy.build(self.roads)
+        solver = ContractionHierarchySolver(hierarchy)
+        self.assertTrue(hierarchy.was_built_for(make_random_roads(np.random.RandomState(0), nr_junctions=60,
+                                                                  nr_links_per_junction=2)))
+        for other_roads in self.other_maps():
+            self.assertFalse(hierarchy.was_built_for(other_roads))
+            with self.assertRaises(ValueError):
+                solver.solve_problem(MapProblem(other_roads, 0, 1))
+        with self.assertRaises(ValueError):
+            solver.solve_problem(MapProblem(self.roads, 0, 1, DISTANCE_COST))
+
+    def test_imported_on_first_use(self):
+        code = ('import sys, deliveries; from framework.ways import *; '
+                'print("framework.ways.contraction_hierarchy" in sys.modules)')
+        repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, '-c', code], cwd=repository_root, check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+        self.assertEqual(output.strip(), 'False')
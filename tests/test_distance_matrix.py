@@ -0,0 +1,61 @@
+"""
+Tests that the distance matrices of both backends of `compute_distance_matrix()` hold the costs found by `UniformCost`.
+"""
+
+import importlib.util
+import unittest
+from math import inf
+
+import numpy as np
+
+from deliveries import *
+from deliveries.distance_matrix import DISTANCE_MATRIX_BACKENDS, SCIPY_BACKEND
+from framework.graph_search import *
+from framework.ways import *
+
+from conftest import make_random_roads
+
+
+class TestDistanceMatrix(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0), nr_junctions=50, nr_links_per_junction=2)
+        self.source_ids = [0, 7, 13, 13, 42]
+        self.target_ids = [3, 7, 21, 30, 49, 0]
+
+    def backends(self):
+        return [backend for backend in DISTANCE_MATRIX_BACKENDS
+                if backend != SCIPY_BACKEND or importlib.util.find_spec('scipy') is not None]
+
+    def expected_matrix(self, cost_model: str, max_cost: float = inf) -> np.ndarray:
+        expected = np.full((len(self.source_ids), len(self.target_ids)), inf)
+        for i, source_id in enumerate(self.source_ids):
+            for j, target_id in enumerate(self.target_ids):
+                result = UniformCost().solve_problem(MapProblem(self.roads, source_id, target_id, cost_model))
+                if result.final_search_node is not None and result.final_search_node.cost <= max_cost:
+                    expected[i, j] = result.final_search_node.cost
+        return expected
+
+    def test_like_uniform_cost(self):
+        for cost_model in (AIR_DISTANCE_COST, DISTANCE_COST):
+            expected = self.expected_matrix(cost_model)
+            for backend in self.backends():
+                for processes in (1, 2):
+                    distances = compute_distance_matrix(self.roads, self.source_ids, self.target_ids, cost_model,
+                                                        backend=backend, processes=processes)
+                    np.testing.assert_allclose(distances, expected, rtol=1e-12)
+
+    def test_max_cost(self):
+        all_distances = self.expected_matrix(DISTANCE_COST)
+        finite_distances = np.sort(all_distances[np.isfinite(all_distances)])
+        # Between two distances, so that the pairs farther than it are well defined under rounding.
+        max_cost = (finite_distances[len(finite_distances) // 2] + finite_distances[len(finite_distances) // 2 + 1]) / 2
+        expected = self.expected_matrix(DISTANCE_COST, max_cost)
+        self.assertTrue(np.isfinite(expected).any() and np.isinf(expected[np.isfinite(all_distances)]).any())
+        for backend in self.backends():
+            distances = compute_distance_matrix(self.roads, self.source_ids, self.target_ids, DISTANCE_COST,
+                                                max_cost=max_cost, backend=backend)
+            np.testing.assert_allclose(distances, expected, rtol=1e-12)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            compute_distance_matrix(self.roads, self.source_ids, backend='networkx')
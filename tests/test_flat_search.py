@@ -0,0 +1,116 @@
+"""
+Tests that the flat (array based) solvers give the results of the respective `BestFirstSearch`
+ solvers on random maps, and tests on a small `FlatGraphProblem` that cannot be reversed.
+"""
+
+import unittest
+
+import numpy as np
+
+from deliveries import *
+from framework.graph_search import *
+
+from conftest import make_random_roads, random_pairs, solution_cost
+
+
+class PositionState(GraphProblemState):
+    def __init__(self, position: int):
+        self.position = position
+
+    def __eq__(self, other):
+        return isinstance(other, PositionState) and other.position == self.position
+
+    def __hash__(self):
+        return hash(self.position)
+
+    def __str__(self):
+        return str(self.position)
+
+
+class StateAirDistHeuristic(HeuristicFunction):
+    """`AirDistHeuristic` without `estimate_position()`, so `FlatAStar` calls `estimate()` with the states."""
+
+    heuristic_name = 'StateAirDist'
+
+    def __init__(self, problem: GraphProblem):
+        super(StateAirDistHeuristic, self).__init__(problem)
+        self._air_dist_heuristic = AirDistHeuristic(problem)
+
+    def estimate(self, state: GraphProblemState) -> float:
+        return self._air_dist_heuristic.estimate(state)
+
+
+class CsrProblem(GraphProblem, FlatGraphProblem):
+    """A graph given in CSR form, from position 0 to any of `goals` (so it does not implement the reversal)."""
+
+    name = 'Csr'
+
+    def __init__(self, offsets, targets, costs, goals):
+        super(CsrProblem, self).__init__(PositionState(0))
+        self.adjacency = FlatAdjacency(offsets, targets, costs)
+        self.goals = goals
+
+    def expand_state_with_costs(self, state_to_expand):
+        for i in range(self.adjacency.offsets[state_to_expand.position],
+                       self.adjacency.offsets[state_to_expand.position + 1]):
+            yield PositionState(self.adjacency.targets[i]), self.adjacency.costs[i]
+
+    def is_goal(self, state) -> bool:
+        return state.position in self.goals
+
+    def flat_adjacency(self) -> FlatAdjacency:
+        return self.adjacency
+
+    def flat_nr_states(self) -> int:
+        return len(self.adjacency.offsets) - 1
+
+    def flat_initial_position(self) -> int:
+        return 0
+
+    def flat_goal_positions(self):
+        return self.goals
+
+    def state_of_position(self, position: int) -> GraphProblemState:
+        return PositionState(position)
+
+
+class TestFlatSearch(unittest.TestCase):
+    def setUp(self):
+        # 0 -> 1 (1), 0 -> 2 (5), 1 -> 2 (1), 1 -> 3 (7), 2 -> 3 (2)
+        self.problem = CsrProblem([0, 2, 4, 5, 5], [1, 2, 2, 3, 3], [1.0, 5.0, 1.0, 7.0, 2.0], goals=(3,))
+
+    def test_flat_uniform_cost(self):
+        result = FlatUniformCost().solve_problem(self.problem)
+        self.assertEqual(result.final_search_node.cost, 4.0)
+        self.assertEqual(result.final_search_node.cost, UniformCost().solve_problem(self.problem).final_search_node.cost)
+
+    def test_bidirectional_search_rejects_a_problem_that_cannot_be_reversed(self):
+        self.assertIsNone(self.problem.flat_reversed_problem())
+        with self.assertRaises(ValueError):
+            BidirectionalUniformCost().solve_problem(self.problem)
+
+
+class TestFlatSearchOnMaps(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0), nr_junctions=200)
+        self.problems = [MapProblem(self.roads, source, target) for source, target in random_pairs(200, 10)]
+
+    def assert_same_results(self, solver: GraphProblemSolver, flat_solver: GraphProblemSolver):
+        for problem in self.problems:
+            with self.subTest(solver=flat_solver.solver_name, problem=problem.name):
+                result, flat_result = solver.solve_problem(problem), flat_solver.solve_problem(problem)
+                if solution_cost(result) is None:
+                    self.assertIsNone(flat_result.final_search_node)
+                else:
+                    self.assertAlmostEqual(solution_cost(flat_result), solution_cost(result))
+                self.assertEqual(flat_result.nr_expanded_states, result.nr_expanded_states)
+
+    def test_flat_uniform_cost(self):
+        self.assert_same_results(UniformCost(), FlatUniformCost())
+
+    def test_flat_astar(self):
+        self.assertFalse(hasattr(StateAirDistHeuristic, 'estimate_position'))
+        for heuristic_type in (AirDistHeuristic, StateAirDistHeuristic):
+            for heuristic_weight in (0.5, 0.7, 1.0):
+                self.assert_same_results(AStar(heuristic_type, heuristic_weight),
+                                         FlatAStar(heuristic_type, heuristic_weight))
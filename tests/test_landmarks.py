@@ -0,0 +1,75 @@
+"""
+Tests of `LandmarkHeuristic` with given landmark tables, and of saving and loading the tables.
+"""
+
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from deliveries import *
+from framework.graph_search import *
+from framework.ways import *
+from framework.ways.graph import LinkTrafficParams
+from framework.ways import tools
+
+from conftest import assert_optimal_costs
+
+
+def make_grid_roads(size: int, first_index: int = 0) -> Roads:
+    """A `size` x `size` grid of junctions, with links in both directions between neighbours."""
+    def index(row, column):
+        return first_index + row * size + column
+
+    junctions = {}
+    for row in range(size):
+        for column in range(size):
+            neighbours = [(row + dr, column + dc) for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                          if 0 <= row + dr < size and 0 <= column + dc < size]
+            links = [Link(index(row, column), index(*neighbour), 100 + 10 * (row + column), 0,
+                          LinkTrafficParams(*tools.generate_traffic_noise_params(index(row, column), index(*neighbour))))
+                     for neighbour in neighbours]
+            junctions[index(row, column)] = Junction(index(row, column), 32.0 + 0.001 * row, 34.7 + 0.001 * column, links)
+    return Roads(junctions)
+
+
+class TestLandmarkHeuristic(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_grid_roads(6)
+        self.tables = LandmarkTables.build(self.roads, nr_landmarks=3)
+
+    def test_with_tables(self):
+        heuristic_type = LandmarkHeuristic.with_tables(self.tables)
+        self.assertEqual(heuristic_type.heuristic_name, LandmarkHeuristic.heuristic_name)
+        unpickled_heuristic_type = pickle.loads(pickle.dumps(heuristic_type))
+        assert_optimal_costs(self, [lambda: AStar(heuristic_type), lambda: AStar(unpickled_heuristic_type)],
+                             [MapProblem(self.roads, source, target) for source, target in ((0, 35), (7, 30), (33, 2))])
+
+    def test_tables_of_another_map_are_rejected(self):
+        self.assertTrue(self.tables.were_built_for(self.roads))
+        for other_roads in (make_grid_roads(6, first_index=100), make_grid_roads(7)):
+            problem = MapProblem(other_roads, other_roads.arrays.indices[0], other_roads.arrays.indices[-1])
+            self.assertFalse(self.tables.were_built_for(other_roads))
+            with self.assertRaises(AssertionError):
+                LandmarkHeuristic(problem, self.tables)
+            with self.assertRaises(AssertionError):
+                LandmarkHeuristic.with_tables(self.tables)(problem)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'roads.landmarks')  # without the `.npz` suffix
+            self.tables.save(filename)
+            self.assertEqual(os.listdir(directory), ['roads.landmarks'])
+            loaded_tables = LandmarkTables.load(filename, self.roads)
+            with self.assertRaises(ValueError):
+                LandmarkTables.load(filename, make_grid_roads(6, first_index=100))
+        self.assertTrue(loaded_tables.were_built_for(self.roads))
+        self.assertEqual(loaded_tables.cost_model, self.tables.cost_model)
+        self.assertEqual(loaded_tables.tolerance, self.tables.tolerance)
+        for name in ('landmark_positions', 'from_landmarks', 'to_landmarks'):
+            np.testing.assert_array_equal(getattr(loaded_tables, name), getattr(self.tables, name))
+        problem = MapProblem(self.roads, 0, 35)
+        result = AStar(LandmarkHeuristic.with_tables(loaded_tables)).solve_problem(problem)
+        self.assertAlmostEqual(result.final_search_node.cost, UniformCost().solve_problem(problem).final_search_node.cost)
@@ -0,0 +1,77 @@
+"""
+Tests that the compressed map files and `load_map_from_csv_parallel()` give the same map as `load_map_from_csv()`
+ on a plain map file.
+"""
+
+import gzip
+import importlib.util
+import lzma
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from framework.ways import *
+
+from conftest import make_random_roads
+
+
+def write_map_file(roads: Roads, filename: str):
+    """Writes the map in the format of the map files: `index,lat,lon,target@distance@highway_type,...`."""
+    lines = [','.join([str(junction.index), repr(junction.lat), repr(junction.lon)] +
+                      ['{}@{}@{}'.format(link.target, link.distance, link.highway_type) for link in junction.links])
+             for junction in roads.values()]
+    with open(filename, 'w') as file:
+        file.write('\n'.join(lines) + '\n')
+
+
+class TestMapLoading(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'roads.csv')
+        write_map_file(make_random_roads(np.random.RandomState(0), nr_junctions=200), self.filename)
+        with open(self.filename, 'rb') as file:
+            self.content = file.read()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def compressed_files(self):
+        compressed_files = []
+        for extension, open_function in (('.gz', gzip.open), ('.xz', lzma.open), ('.lzma', lzma.open)):
+            compressed_files.append(self.filename + extension)
+            with open_function(compressed_files[-1], 'wb') as file:
+                file.write(self.content)
+        if importlib.util.find_spec('zstandard') is not None:
+            import zstandard
+            compressed_files.append(self.filename + '.zst')
+            with open(compressed_files[-1], 'wb') as file:
+                file.write(zstandard.ZstdCompressor().compress(self.content))
+        return compressed_files
+
+    def assert_same_roads(self, roads: Roads, expected_roads: Roads):
+        for name in RoadsArrays.ARRAY_NAMES:
+            np.testing.assert_array_equal(getattr(roads.arrays, name), getattr(expected_roads.arrays, name))
+        self.assertEqual(list(roads.keys()), list(expected_roads.keys()))
+        for junction_id, junction in expected_roads.items():
+            self.assertEqual(roads[junction_id], junction)
+            self.assertEqual(roads[junction_id].links, junction.links)
+
+    def test_compressed_files(self):
+        expected_roads = load_map_from_csv(self.filename)
+        for filename in self.compressed_files():
+            self.assert_same_roads(load_map_from_csv(filename), expected_roads)
+            self.assert_same_roads(load_map_from_csv(filename, start=30, count=50),
+                                   load_map_from_csv(self.filename, start=30, count=50))
+
+    def test_parallel(self):
+        expected_roads = load_map_from_csv(self.filename)
+        expected_sliced_roads = load_map_from_csv(self.filename, start=30, count=50)
+        for processes in (1, 3):
+            self.assert_same_roads(load_map_from_csv_parallel(self.filename, processes=processes), expected_roads)
+            self.assert_same_roads(load_map_from_csv_parallel(self.filename, start=30, count=50, processes=processes,
+                                                              lines_per_chunk=7), expected_sliced_roads)
+            for filename in self.compressed_files():
+                self.assert_same_roads(load_map_from_csv_parallel(filename, processes=processes, lines_per_chunk=7),
+                                       expected_roads)
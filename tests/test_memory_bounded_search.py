@@ -0,0 +1,62 @@
+"""
+Tests that `IDAStar` and `SMAStar` find the costs `UniformCost` finds on random maps, and regression
+ tests of `SMAStar` on small explicit graphs.
+"""
+
+import multiprocessing
+import unittest
+
+import numpy as np
+
+from deliveries import *
+from framework.graph_search import *
+
+from conftest import AdjacencyProblem, assert_optimal_costs, make_random_roads, random_pairs, solution_cost
+
+
+def sma_star_solution_cost(problem: GraphProblem, max_nr_nodes: int):
+    return solution_cost(SMAStar(AirDistHeuristic, max_nr_nodes=max_nr_nodes).solve_problem(problem))
+
+
+class TestMemoryBoundedSearchOnMaps(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0), nr_junctions=60, nr_links_per_junction=2)
+        self.problems = [MapProblem(self.roads, source, target) for source, target in random_pairs(60, 8)]
+        # A target that cannot be reached.
+        self.unsolvable_problem = MapProblem(self.roads, 41, 40)
+        self.assertIsNone(solution_cost(UniformCost().solve_problem(self.unsolvable_problem)))
+
+    def test_ida_star(self):
+        solvers = [lambda: IDAStar(AirDistHeuristic), lambda: IDAStar(AirDistHeuristic, max_nr_nodes=30)]
+        assert_optimal_costs(self, solvers, self.problems + [self.unsolvable_problem])
+
+    def test_sma_star(self):
+        # The optimal paths have at most 8 junctions, so they fit in the memory.
+        solvers = [lambda: SMAStar(AirDistHeuristic), lambda: SMAStar(AirDistHeuristic, max_nr_nodes=10)]
+        assert_optimal_costs(self, solvers, self.problems)
+
+    def test_sma_star_fails_in_time_on_an_unsolvable_problem(self):
+        # In a worker process, so that the test fails rather than hangs.
+        with multiprocessing.Pool(1) as pool:
+            for max_nr_nodes in (10, 100, 1000000):
+                cost = pool.apply_async(sma_star_solution_cost, (self.unsolvable_problem, max_nr_nodes)).get(timeout=60)
+                self.assertIsNone(cost)
+
+
+class TestSMAStarOnSmallGraphs(unittest.TestCase):
+    def test_parallel_operators_use_the_cheapest(self):
+        problem = AdjacencyProblem([[(4, 4), (0, 6), (4, 3)], [(2, 8)], [], [(4, 4)], [(1, 7), (0, 8)]], goal=2)
+        self.assertEqual(solution_cost(UniformCost().solve_problem(problem)), 18)
+        self.assertEqual(solution_cost(SMAStar(NullHeuristic, max_nr_nodes=50).solve_problem(problem)), 18)
+        # The path of 4 states does not fit in 3 nodes.
+        self.assertIsNone(solution_cost(SMAStar(NullHeuristic, max_nr_nodes=3).solve_problem(problem)))
+
+    def test_terminates_under_a_tight_memory_cap(self):
+        adjacency = [[(5, 4), (0, 5), (1, 9)], [], [(3, 6), (2, 7)], [], [], [(3, 6), (2, 2), (3, 2)]]
+        for goal, expected_cost in ((4, None), (3, 6)):
+            problem = AdjacencyProblem(adjacency, goal)
+            for max_nr_nodes in (2, 3, 4, 6, 50):
+                result = SMAStar(NullHeuristic, max_nr_nodes=max_nr_nodes).solve_problem(problem)
+                self.assertLess(result.nr_expanded_states, 100)
+                if max_nr_nodes >= 3:
+                    self.assertEqual(solution_cost(result), expected_cost)
@@ -0,0 +1,119 @@
+"""
+Tests of the open list strategies of `BestFirstSearch` (see `framework/graph_search/utils/open_lists.py`).
+"""
+
+import random
+import unittest
+from math import inf
+
+from framework.graph_search import IndexedHeap, LazyDeletionHeap, RadixHeap
+
+
+def pop_all(open_list):
+    popped = []
+    while not open_list.is_empty():
+        popped.append(open_list.pop())
+    return popped
+
+
+class TestOpenLists(unittest.TestCase):
+    open_list_types = (IndexedHeap, LazyDeletionHeap, RadixHeap)
+
+    def test_pop_order_and_remove(self):
+        rng = random.Random(0)
+        for open_list_type in self.open_list_types:
+            open_list = open_list_type()
+            priorities = {item: rng.randint(0, 1000) for item in range(500)}
+            for item, priority in priorities.items():
+                open_list.push(item, priority)
+            for item in range(0, 500, 3):
+                self.assertEqual(open_list.remove(item), priorities.pop(item))
+            with self.assertRaises(KeyError):
+                open_list.remove(0)
+            self.assertEqual(len(open_list), len(priorities))
+            popped = pop_all(open_list)
+            self.assertEqual(sorted(popped), sorted(priorities.items()))
+            self.assertEqual([priority for _, priority in popped], sorted(priorities.values()))
+            with self.assertRaises(IndexError):
+                open_list.pop()
+
+    def test_monotone_pushes_between_pops(self):
+        rng = random.Random(1)
+        for open_list_type in self.open_list_types:
+            open_list = open_list_type()
+            last_priority, popped_priorities, next_item = 0, [], 0
+            for _ in range(2000):
+                if open_list.is_empty() or rng.random() < 0.6:
+                    open_list.push(next_item, last_priority + rng.randint(0, 50))
+                    next_item += 1
+                else:
+                    _, last_priority = open_list.pop()
+                    popped_priorities.append(last_priority)
+            popped_priorities.extend(priority for _, priority in pop_all(open_list))
+            self.assertEqual(popped_priorities, sorted(popped_priorities))
+
+    def test_peek_n_best(self):
+        rng = random.Random(2)
+        for open_list_type in self.open_list_types:
+            open_list = open_list_type()
+            for item in range(300):
+                open_list.push(item, rng.randint(0, 100000))
+            for item in range(0, 300, 4):
+                open_list.remove(item)
+            for _ in range(50):  # moves entries between the buckets of the radix heap
+                open_list.pop()
+            best = open_list.peek_n_best(20)
+            self.assertEqual(len(open_list), 300 - 75 - 50)
+            self.assertEqual(best, pop_all(open_list)[:20])
+
+    def test_infinite_priorities(self):
+        for open_list_type in self.open_list_types:
+            open_list = open_list_type()
+            open_list.push('dead end', inf)
+            open_list.push('b', 7)
+            open_list.push('a', 3)
+            open_list.push('removed dead end', inf)
+            open_list.remove('removed dead end')
+            self.assertEqual(open_list.peek_n_best(5), [('a', 3), ('b', 7), ('dead end', inf)])
+            self.assertEqual(open_list.pop(), ('a', 3))
+            open_list.push('c', 5)
+            self.assertEqual(pop_all(open_list), [('c', 5), ('b', 7), ('dead end', inf)])
+
+
+class TestRadixHeap(unittest.TestCase):
+    def test_non_monotone_push_raises(self):
+        open_list = RadixHeap()
+        open_list.push('a', 5)
+        self.assertEqual(open_list.pop(), ('a', 5))
+        with self.assertRaises(ValueError):
+            open_list.push('b', 3.0)
+        open_list.push('c', 5.5)  # the same key as the last popped priority
+        open_list.push('d', 6)
+        self.assertEqual(pop_all(open_list), [('c', 5.5), ('d', 6)])
+        with self.assertRaises(ValueError):
+            RadixHeap().push('negative', -1)
+
+    def test_tolerance(self):
+        open_list = RadixHeap(resolution=1000.0, tolerance=0.001)
+        open_list.push('a', 5)
+        self.assertEqual(open_list.pop(), ('a', 5))
+        open_list.push('b', 5 - 0.0005)  # treated as 5
+        with self.assertRaises(ValueError):
+            open_list.push('c', 5 - 0.002)
+        open_list.push('d', 5.5)
+        self.assertEqual(pop_all(open_list), [('b', 5 - 0.0005), ('d', 5.5)])
+
+    def test_only_infinite_priorities_after_popping_one(self):
+        open_list = RadixHeap()
+        open_list.push('dead end', inf)
+        self.assertEqual(open_list.pop(), ('dead end', inf))
+        with self.assertRaises(ValueError):
+            open_list.push('a', 1)
+        open_list.push('another dead end', inf)
+        self.assertEqual(open_list.pop(), ('another dead end', inf))
+
+    def test_huge_priorities(self):
+        open_list = RadixHeap(resolution=1000.0)
+        for item, priority in enumerate((1e30, 2 ** 70, 1e300, 12.5, 1e30 + 1e15)):
+            open_list.push(item, priority)
+        self.assertEqual([priority for _, priority in pop_all(open_list)], [12.5, 2 ** 70, 1e30, 1e30 + 1e15, 1e300])
@@ -0,0 +1,84 @@
+"""
+Tests that the searches with `use_node_arena` give the same results as with the default `SearchNode` objects.
+"""
+
+import unittest
+
+import numpy as np
+
+from deliveries import *
+from framework.graph_search import *
+
+from conftest import AdjacencyProblem, TableHeuristic, make_random_roads, random_pairs
+
+
+class InconsistentHeuristic(TableHeuristic):
+    """Admissible but not consistent on the graph of `test_reopened_nodes`, so A* re-opens closed nodes."""
+
+    estimates = {2: 8}
+
+
+class ArenaSizeAStar(AStar):
+    """Records the number of nodes in the arena before each expansion."""
+
+    def _init_solver(self, problem: GraphProblem):
+        super(ArenaSizeAStar, self)._init_solver(problem)
+        self.arena_sizes = []
+
+    def _extract_next_search_node_to_expand(self):
+        self.arena_sizes.append(len(self._nodes_arena))
+        return super(ArenaSizeAStar, self)._extract_next_search_node_to_expand()
+
+
+def path_of(result: SearchResult):
+    if result.final_search_node is None:
+        return None
+    return [(str(node.state), node.operator_cost, node.cost, node.expanding_priority)
+            for node in result.final_search_node.traverse_back_to_root()]
+
+
+class TestSearchNodeArena(unittest.TestCase):
+    def assert_same_results(self, make_solver, problem: GraphProblem, seed: int = 0):
+        results = []
+        for use_node_arena in (False, True):
+            np.random.seed(seed)  # for `GreedyStochastic`
+            results.append(make_solver(use_node_arena).solve_problem(problem))
+        result, arena_result = results
+        self.assertEqual(path_of(arena_result), path_of(result))
+        self.assertEqual(arena_result.nr_expanded_states, result.nr_expanded_states)
+        if arena_result.final_search_node is not None:
+            # The path is copied out of the arena, which is freed after the search.
+            for node in arena_result.final_search_node.traverse_back_to_root():
+                self.assertIs(type(node), SearchNode)
+
+    def test_map_problems(self):
+        roads = make_random_roads(np.random.RandomState(0), nr_junctions=200)
+        solvers = [lambda use_node_arena: UniformCost(use_node_arena=use_node_arena),
+                   lambda use_node_arena: AStar(AirDistHeuristic, use_node_arena=use_node_arena),
+                   lambda use_node_arena: AStar(AirDistHeuristic, 0.8, use_node_arena=use_node_arena),
+                   lambda use_node_arena: GreedyStochastic(AirDistHeuristic, use_node_arena=use_node_arena)]
+        for source, target in random_pairs(200, 10):
+            for make_solver in solvers:
+                self.assert_same_results(make_solver, MapProblem(roads, source, target))
+
+    def test_only_opened_nodes_take_slots(self):
+        roads = make_random_roads(np.random.RandomState(0), nr_junctions=200)
+        for source, target in random_pairs(200, 5):
+            solver = ArenaSizeAStar(AirDistHeuristic, use_node_arena=True, collect_stats=True)
+            result = solver.solve_problem(MapProblem(roads, source, target))
+            self.assertEqual(solver.arena_sizes[-1], result.stats.nr_queue_pushes)
+            self.assertLess(result.stats.nr_queue_pushes, result.stats.nr_generated_nodes)
+
+    def test_reopened_nodes(self):
+        problem = AdjacencyProblem([[(1, 1), (2, 2)], [(3, 5)], [(3, 1)], [(4, 10)], []], goal=4)
+        result = AStar(InconsistentHeuristic, use_node_arena=True, collect_stats=True).solve_problem(problem)
+        self.assertEqual(result.final_search_node.cost, 13)
+        self.assertGreater(result.stats.nr_reopened_nodes, 0)
+        self.assert_same_results(lambda use_node_arena: AStar(InconsistentHeuristic, use_node_arena=use_node_arena),
+                                 problem)
+
+    def test_no_solution(self):
+        problem = AdjacencyProblem([[(1, 1)], [(0, 1)], []], goal=2)
+        for make_solver in (lambda use_node_arena: UniformCost(use_node_arena=use_node_arena),
+                            lambda use_node_arena: AStar(NullHeuristic, use_node_arena=use_node_arena)):
+            self.assert_same_results(make_solver, problem)
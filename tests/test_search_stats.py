@@ -0,0 +1,50 @@
+"""
+Tests the counters of `SearchStats` on small searches that are traced by hand.
+"""
+
+import unittest
+
+from framework.graph_search import *
+
+from conftest import AdjacencyProblem, TableHeuristic
+
+
+def counters(stats: SearchStats) -> dict:
+    return {name: getattr(stats, name) for name in SearchStats.__slots__ if name.startswith(('nr_', 'max_'))}
+
+
+class ReopeningHeuristic(TableHeuristic):
+    """Admissible but not consistent: state 2 looks far, so state 3 is first closed through the longer path."""
+
+    estimates = {2: 8}
+
+
+class TestSearchStats(unittest.TestCase):
+    def test_uniform_cost(self):
+        # 0 -> 1 -> 2 -> 3 (cost 3). The node of 2 through 0 (cost 4) is replaced in `open` by the one through 1,
+        #  and the operator 1 -> 0 leads to a closed state.
+        problem = AdjacencyProblem([[(1, 1), (2, 4)], [(2, 1), (0, 1)], [(3, 1)], []], goal=3)
+        result = UniformCost(collect_stats=True).solve_problem(problem)
+        self.assertEqual((result.final_search_node.cost, result.nr_expanded_states), (3, 4))
+        self.assertEqual(counters(result.stats), dict(
+            nr_generated_nodes=5, nr_duplicates_rejected=1, nr_reopened_nodes=0, max_open_size=2, max_close_size=4,
+            nr_queue_pushes=5, nr_queue_pops=4, nr_queue_removals=1, nr_heuristic_calls=0,
+            nr_heuristic_cache_hits=0, nr_heuristic_cache_misses=0, nr_heuristic_cache_evictions=0))
+
+    def test_astar_reopens_a_closed_node(self):
+        # The expansions (by f = (g + h) / 2): 0, 1, 3 (g=6), 2, 3 again (g=3, re-opened), 4 (g=13).
+        #  The node of 4 through the first node of 3 (g=16) is replaced in `open`.
+        problem = AdjacencyProblem([[(1, 1), (2, 2)], [(3, 5)], [(3, 1)], [(4, 10)], []], goal=4)
+        result = AStar(ReopeningHeuristic, collect_stats=True).solve_problem(problem)
+        self.assertEqual((result.final_search_node.cost, result.nr_expanded_states), (13, 6))
+        self.assertEqual(counters(result.stats), dict(
+            nr_generated_nodes=6, nr_duplicates_rejected=0, nr_reopened_nodes=1, max_open_size=2, max_close_size=5,
+            nr_queue_pushes=7, nr_queue_pops=6, nr_queue_removals=1, nr_heuristic_calls=7,
+            nr_heuristic_cache_hits=0, nr_heuristic_cache_misses=0, nr_heuristic_cache_evictions=0))
+        self.assertGreaterEqual(result.stats.heuristic_time, 0)
+        self.assertGreaterEqual(result.stats.queue_time, 0)
+        self.assertGreaterEqual(result.stats.expansion_time, 0)
+
+    def test_no_stats_by_default(self):
+        problem = AdjacencyProblem([[(1, 1)], []], goal=1)
+        self.assertIsNone(UniformCost().solve_problem(problem).stats)
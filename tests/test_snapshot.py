@@ -0,0 +1,49 @@
+"""
+Tests that a map saved by `save_snapshot()` is loaded back by `load_snapshot()` with the same junctions and links.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from framework.ways import *
+from framework.ways.snapshot import save_snapshot, load_snapshot, SnapshotRoads
+
+from conftest import make_random_roads
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0))
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'roads.snapshot')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        save_snapshot(self.roads, self.filename)
+        for compact, roads_type in ((False, SnapshotRoads), (True, CompactRoads)):
+            loaded_roads = load_snapshot(self.filename, compact=compact)
+            self.assertIs(type(loaded_roads), roads_type)
+            for name in RoadsArrays.ARRAY_NAMES:
+                loaded_array = getattr(loaded_roads.arrays, name)
+                np.testing.assert_array_equal(loaded_array, getattr(self.roads.arrays, name))
+                self.assertEqual(loaded_array.dtype, RoadsArrays.DTYPES[name])
+                self.assertFalse(loaded_array.flags.writeable)
+            self.assertEqual(list(loaded_roads.keys()), list(self.roads.keys()))
+            for junction_id, junction in self.roads.items():
+                loaded_junction = loaded_roads[junction_id]
+                self.assertEqual((loaded_junction.index, loaded_junction.lat, loaded_junction.lon),
+                                 (junction.index, junction.lat, junction.lon))
+                self.assertEqual([tuple(link) for link in loaded_junction.links], [tuple(link) for link in junction.links])
+            for loaded_mean, mean in zip(loaded_roads.mean_lat_lon, self.roads.mean_lat_lon):
+                self.assertAlmostEqual(loaded_mean, mean)
+
+    def test_other_files_are_rejected(self):
+        with open(self.filename, 'wb') as file:
+            file.write(b'not a snapshot' * 10)
+        with self.assertRaises(ValueError):
+            load_snapshot(self.filename)
@@ -0,0 +1,62 @@
+"""
+Tests the nearest-junction, radius and bounding-box queries of `SpatialIndex` against a scan of all the junctions.
+"""
+
+import unittest
+
+import numpy as np
+
+from framework.ways import *
+from framework.ways import tools
+
+from conftest import make_random_roads
+
+
+class TestSpatialIndex(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0), nr_junctions=300)
+        self.junctions = list(self.roads.values())
+        rng = np.random.RandomState(1)
+        # Points over the map, and around it.
+        self.points = [(32.0 + 0.07 * rng.rand() - 0.01, 34.7 + 0.07 * rng.rand() - 0.01) for _ in range(30)]
+        self.points += [(31.5, 34.2), (self.junctions[7].lat, self.junctions[7].lon)]
+
+    def scan(self, lat: float, lon: float):
+        """
+        The (distance, position, junction id) of all the junctions, from the nearest to (lat, lon).
+        The distances are computed by `compute_distances()`, as by the index (they might differ from
+         those of `compute_distance()` in the last bits).
+        """
+        distances = tools.compute_distances(lat, lon, [junction.lat for junction in self.junctions],
+                                            [junction.lon for junction in self.junctions])
+        return sorted((distance, position, junction.index)
+                      for position, (distance, junction) in enumerate(zip(distances.tolist(), self.junctions)))
+
+    def test_nearest(self):
+        for lat, lon in self.points:
+            scanned = self.scan(lat, lon)
+            for k in (1, 5, 40, len(self.junctions) + 10):
+                ids, distances = self.roads.spatial_index.nearest(lat, lon, k=k)
+                self.assertEqual(ids.tolist(), [junction_id for _, _, junction_id in scanned[:k]])
+                self.assertEqual(distances.tolist(), [distance for distance, _, _ in scanned[:k]])
+
+    def test_within_radius(self):
+        for lat, lon in self.points:
+            scanned = self.scan(lat, lon)
+            for radius in (0.0, 300.0, 1500.0, 50000.0):
+                ids, distances = self.roads.spatial_index.within_radius(lat, lon, radius)
+                expected = [(distance, junction_id) for distance, _, junction_id in scanned if distance <= radius]
+                self.assertEqual(list(zip(distances.tolist(), ids.tolist())), expected)
+
+    def test_in_bbox(self):
+        rng = np.random.RandomState(2)
+        bboxes = [(32.0, 34.7, 32.05, 34.75), (31.0, 34.0, 31.1, 34.1), (32.03, 34.72, 32.01, 34.74)]
+        for _ in range(30):
+            min_lat, max_lat = np.sort(32.0 + 0.06 * rng.rand(2))
+            min_lon, max_lon = np.sort(34.7 + 0.06 * rng.rand(2))
+            bboxes.append((min_lat, min_lon, max_lat, max_lon))
+        for min_lat, min_lon, max_lat, max_lon in bboxes:
+            expected_ids = [junction.index for junction in self.junctions
+                            if min_lat <= junction.lat <= max_lat and min_lon <= junction.lon <= max_lon]
+            self.assertEqual(self.roads.spatial_index.in_bbox(min_lat, min_lon, max_lat, max_lon).tolist(),
+                             expected_ids)
@@ -0,0 +1,52 @@
+"""
+Tests of `Roads.subgraph()` against a selection of the junctions and links done one by one.
+"""
+
+import unittest
+
+import numpy as np
+
+from framework.ways import *
+
+from conftest import make_random_roads
+
+
+def brute_force_selection(roads: Roads, bbox, around, hops: int):
+    min_lat, min_lon, max_lat, max_lon = bbox if bbox is not None else (np.inf, np.inf, -np.inf, -np.inf)
+    selected = {junction.index for junction in roads.values()
+                if min_lat <= junction.lat <= max_lat and min_lon <= junction.lon <= max_lon}
+    selected |= set(around or ())
+    neighbors = {junction_id: set() for junction_id in roads}
+    for link in roads.iterlinks():
+        neighbors[link.source].add(link.target)
+        neighbors[link.target].add(link.source)
+    for _ in range(hops):
+        selected |= {neighbor for junction_id in selected for neighbor in neighbors[junction_id]}
+    return selected
+
+
+class TestSubgraph(unittest.TestCase):
+    def setUp(self):
+        self.roads = make_random_roads(np.random.RandomState(0), nr_junctions=60, nr_links_per_junction=2)
+
+    def test_like_brute_force(self):
+        for bbox, around, hops in (((32.0, 34.7, 32.02, 34.72), None, 0), ((32.0, 34.7, 32.02, 34.72), [5], 1),
+                                   (None, [3, 17], 2), (None, [3], 0)):
+            selected = brute_force_selection(self.roads, bbox, around, hops)
+            for compact in (False, True):
+                region = self.roads.subgraph(bbox=bbox, around=around, hops=hops, compact=compact)
+                original_ids = [region.id_translation.to_original(junction_id) for junction_id in range(len(region))]
+                self.assertEqual(original_ids, [junction_id for junction_id in self.roads if junction_id in selected])
+                for junction_id, original_id in enumerate(original_ids):
+                    junction, original_junction = region[junction_id], self.roads[original_id]
+                    self.assertEqual((junction.lat, junction.lon), (original_junction.lat, original_junction.lon))
+                    links = [(original_ids[link.target], link.distance, link.highway_type, link.link_params)
+                             for link in junction.links]
+                    self.assertEqual(links, [(link.target, link.distance, link.highway_type, link.link_params)
+                                             for link in original_junction.links if link.target in selected])
+
+    def test_empty_selection_is_rejected(self):
+        for bbox, around, hops in (((31.0, 34.0, 31.1, 34.1), None, 3), (None, [], 3), (None, None, 0)):
+            for compact in (False, True):
+                with self.assertRaises(ValueError):
+                    self.roads.subgraph(bbox=bbox, around=around, hops=hops, compact=compact)
@@ -0,0 +1,55 @@
+"""
+Tests that the links of `TimeDependentMapProblem` are FIFO: leaving later never arrives earlier.
+"""
+
+import unittest
+
+import numpy as np
+
+from deliveries import TimeDependentMapProblem, TimeDependentMapState
+from framework.ways import *
+from framework.ways.graph import LinkTrafficParams
+from framework.ways.traffic import MINUTES_PER_DAY
+from framework.ways import tools
+
+from conftest import make_random_roads
+
+
+def arrival_times(problem: TimeDependentMapProblem, junction_id: int, time: float):
+    return [state.time for state, _ in problem.expand_state_with_costs(TimeDependentMapState(junction_id, time))]
+
+
+class TestTimeDependentMapProblem(unittest.TestCase):
+    def assert_fifo(self, problem: TimeDependentMapProblem, junction_ids, times):
+        for junction_id in junction_ids:
+            arrivals = np.array([arrival_times(problem, junction_id, time) for time in times])
+            self.assertTrue(np.all(np.diff(arrivals, axis=0) >= -1e-9),
+                            'a link of junction {} is not FIFO'.format(junction_id))
+
+    def test_random_links_are_fifo_over_bucket_boundaries(self):
+        roads = make_random_roads(np.random.RandomState(0), nr_junctions=30, max_distance=40000, spread=0.1)
+        for bucket_minutes in (60, 15):
+            problem = TimeDependentMapProblem(roads, 0, 1, bucket_minutes=bucket_minutes, cost_model=DISTANCE_COST)
+            boundaries = np.arange(0, 2 * MINUTES_PER_DAY + 1, bucket_minutes, dtype=np.float64)
+            times = np.sort(np.concatenate([boundaries - 1e-3, boundaries, boundaries + 1e-3,
+                                            boundaries + bucket_minutes / 2])[1:])
+            self.assert_fifo(problem, roads.keys(), times)
+
+    def test_steep_traffic_drop_is_fifo(self):
+        # A long link (~109 minutes at free flow) whose multiplier drops from 2 at 9:00 to 1 at 10:00.
+        roads = Roads({0: Junction(0, 32.0, 34.7, [Link(0, 1, 200000, 0, LinkTrafficParams(
+                          *tools.generate_traffic_noise_params(0, 1)))]),
+                       1: Junction(1, 32.1, 34.8, [])})
+        multipliers = np.ones((1, MINUTES_PER_DAY // 60), dtype=np.float32)
+        multipliers[0, 9] = 2
+        roads.arrays._traffic_multipliers[60] = multipliers
+        problem = TimeDependentMapProblem(roads, 0, 1, cost_model=DISTANCE_COST)
+        [arrival_at_9_59] = arrival_times(problem, 0, 9 * 60 + 59)
+        [arrival_at_10_00] = arrival_times(problem, 0, 10 * 60)
+        self.assertLessEqual(arrival_at_9_59, arrival_at_10_00)
+        self.assert_fifo(problem, [0], np.linspace(8 * 60, 11 * 60, 721))
+        # The traffic only slows the link down.
+        free_flow_time = 200000 / (110 * 1000 / 60)
+        for time in np.linspace(0, MINUTES_PER_DAY, 97):
+            [arrival] = arrival_times(problem, 0, time)
+            self.assertGreaterEqual(arrival - time, free_flow_time - 1e-9)
@@ -0,0 +1,64 @@
+"""
+Tests that the vectorized versions of the map tools (`framework/ways/tools.py`) give the same values
+ as the original scalar ones (the distances, up to the last bits).
+"""
+
+import unittest
+
+import numpy as np
+
+from framework.ways import tools
+
+
+# The relative difference of `compute_distances` from `compute_distance` (see `compute_distances_between`).
+DISTANCES_RTOL = 4 * np.finfo(np.float64).eps
+
+
+class TestComputeDistances(unittest.TestCase):
+    def test_close_to_compute_distance(self):
+        rng = np.random.RandomState(0)
+        nr_pairs = 20000
+        lats1, lons1 = 32 + 0.2 * rng.rand(nr_pairs), 34.7 + 0.2 * rng.rand(nr_pairs)
+        lats2, lons2 = lats1 + 0.01 * rng.randn(nr_pairs), lons1 + 0.01 * rng.randn(nr_pairs)
+        # The special cases: the same point, and points closer than 0.00001 degrees.
+        lats2[:100], lons2[:100] = lats1[:100], lons1[:100]
+        lats2[100:200], lons2[100:200] = lats1[100:200] + 0.000004, lons1[100:200] - 0.000007
+        expected = [tools.compute_distance((lat1, lon1), (lat2, lon2))
+                    for lat1, lon1, lat2, lon2 in zip(lats1.tolist(), lons1.tolist(), lats2.tolist(), lons2.tolist())]
+        distances = tools.compute_distances(lats1, lons1, lats2, lons2)
+        np.testing.assert_allclose(distances, expected, rtol=DISTANCES_RTOL, atol=0)
+        self.assertEqual(distances[:200].tolist(), expected[:200])
+
+    def test_broadcasting(self):
+        rng = np.random.RandomState(1)
+        lats, lons = 32 + 0.2 * rng.rand(30), 34.7 + 0.2 * rng.rand(30)
+        matrix = tools.compute_distances(lats[:, np.newaxis], lons[:, np.newaxis], lats[np.newaxis, :], lons[np.newaxis, :])
+        self.assertEqual(matrix.shape, (30, 30))
+        np.testing.assert_allclose(matrix, [[tools.compute_distance((lat1, lon1), (lat2, lon2))
+                                             for lat2, lon2 in zip(lats.tolist(), lons.tolist())]
+                                            for lat1, lon1 in zip(lats.tolist(), lons.tolist())],
+                                   rtol=DISTANCES_RTOL, atol=0)
+
+
+class TestDhashMany(unittest.TestCase):
+    def test_same_as_dhash(self):
+        rng = np.random.RandomState(0)
+        edge_cases = [0, 1, -1, 9, 10, -10, 99, 100, 65520, 65521, 2 ** 31 - 1, -2 ** 31, 2 ** 32,
+                      2 ** 62, -2 ** 62, 2 ** 63 - 1, -2 ** 63 + 1]
+        values = np.concatenate([np.array(edge_cases, dtype=np.int64),
+                                 rng.randint(-1000, 1000, 2000),
+                                 rng.randint(-2 ** 62, 2 ** 62, 20000, dtype=np.int64),
+                                 (rng.randint(0, 2 ** 62, 2000, dtype=np.int64) >> rng.randint(0, 62, 2000))])
+        expected = [tools.dhash(int(value)) for value in values]
+        self.assertEqual(tools.dhash_many(values).tolist(), expected)
+
+    def test_empty_values(self):
+        self.assertEqual(len(tools.dhash_many(np.array([], dtype=np.int64))), 0)
+
+    def test_generate_traffic_noise_params_many(self):
+        rng = np.random.RandomState(1)
+        seeds1, seeds2 = rng.randint(0, 10 ** 6, 3000), rng.randint(0, 10 ** 6, 3000)
+        wavelengths_cos, wavelengths_sin = tools.generate_traffic_noise_params_many(seeds1, seeds2)
+        self.assertEqual(list(zip(wavelengths_cos.tolist(), wavelengths_sin.tolist())),
+                         [tools.generate_traffic_noise_params(int(seed1), int(seed2))
+                          for seed1, seed2 in zip(seeds1, seeds2)])